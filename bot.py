@@ -1,16 +1,31 @@
+import time
+_process_started = time.perf_counter()
+
 import os
+import sys
+import importlib.abc
+import importlib.machinery
 import discord
 from discord.ext import commands
 from discord import app_commands
-from config.config import DEBUG
+from config.config import DEBUG, MEMBER_CHUNK_GUILD_IDS
 from web.server import start_server
 from utils.logging import log_debug
-from commands.admin_utils import update_discord_usernames
+from commands.admin_utils import refresh_discord_usernames
+from utils.discord_resolver import start_member_warmup
+from utils.command_sync import sync_command_tree
+from utils.http import close_http_sessions
+from utils.birdsong_audio import flush_disk_index
+import data.storage as db
 import asyncio
 
 # Custom CommandTree that blocks commands for users in an active flock (pomobirdo)
 class FlockAwareTree(app_commands.CommandTree):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Each interaction runs in its own invoker task, so this memo lives exactly as
+        # long as the command and lets repeated player/bird/daily-action reads share one query
+        db.begin_unit_of_work()
+
         # Allow flock commands through
         if interaction.command and interaction.command.name in ('start_flock', 'join_flock'):
             return True
@@ -25,7 +40,14 @@ class FlockAwareTree(app_commands.CommandTree):
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None, tree_cls=FlockAwareTree)
+# Chunking member lists needs the privileged Server Members intent, so only ask for it when configured
+intents.members = bool(MEMBER_CHUNK_GUILD_IDS)
+# ...but never let discord.py chunk every guild before on_ready; start_member_warmup
+# chunks just the configured ones in the background
+bot = commands.Bot(
+    command_prefix='!', intents=intents, help_command=None, tree_cls=FlockAwareTree,
+    chunk_guilds_at_startup=False,
+)
 
 # Error handling
 @bot.tree.error
@@ -49,12 +71,19 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
 async def on_ready():
     print(f'Bot is ready. Logged in as {bot.user.name}')
     print(f'Debug mode: {"ON" if DEBUG else "OFF"}')
+    print(f"Startup: ready {time.perf_counter() - _process_started:.2f}s after process start")
 
-    # Sync slash commands
+    # Load configured guilds' members in the background; commands work meanwhile via REST
+    if start_member_warmup(bot, MEMBER_CHUNK_GUILD_IDS):
+        print(f"Warming member cache for {len(MEMBER_CHUNK_GUILD_IDS)} guild(s) in the background")
+
+    # Sync slash commands, only when their schema changed since the last sync
     try:
-        print("Syncing slash commands...")
-        await bot.tree.sync()
-        print("Slash commands synced successfully!")
+        synced, count = await sync_command_tree(bot.tree)
+        if synced:
+            print(f"Slash commands synced successfully! ({count} commands)")
+        else:
+            print("Slash commands unchanged, skipping sync")
     except Exception as e:
         print(f"Failed to sync slash commands: {e}")
 
@@ -76,18 +105,73 @@ async def on_ready():
     except Exception as e:
         print(f"Supabase connection error: {e}")
 
-    # Update Discord usernames (skip in debug/local mode)
+    # Update Discord usernames in the background (skip in debug/local mode)
     if DEBUG:
         print("Skipping Discord username update (DEBUG mode)")
     else:
+        print("Updating Discord usernames in the background...")
+        asyncio.create_task(refresh_discord_usernames(bot))
+
+class _CogImportTimer(importlib.abc.MetaPathFinder):
+    """Times the execution of a cog's own module while load_extension imports it.
+
+    load_extension finds the module's spec, executes it, then awaits its setup(). The
+    timer hands out (or, for a module already in sys.modules, reuses) that spec with
+    its loader's exec_module wrapped, so the import is measured without importing
+    anything a second time.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.import_ms = 0.0
+        self._loader = None
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != self.name:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None:
+            self._wrap(spec.loader)
+        return spec
+
+    def _wrap(self, loader):
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                self.import_ms = (time.perf_counter() - start) * 1000
+
+        loader.exec_module = timed_exec_module
+        self._loader = loader
+
+    def __enter__(self):
+        existing = sys.modules.get(self.name)
+        if existing is not None and getattr(existing, "__spec__", None) is not None:
+            self._wrap(existing.__spec__.loader)
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc):
+        sys.meta_path.remove(self)
+        if self._loader is not None:
+            del self._loader.exec_module
+
+
+async def _load_cog(bot, name):
+    """Load one cog and time it. Returns (name, import_ms, setup_ms, error)."""
+    start = time.perf_counter()
+    with _CogImportTimer(name) as timer:
         try:
-            print("Updating Discord usernames...")
-            updated, errors, not_found = await update_discord_usernames(bot)
-            print(f"Username update complete: {updated} updated, {errors} errors")
-            if not_found:
-                print(f"IDs not found: {', '.join(not_found)}")
+            await bot.load_extension(name)
+            error = None
         except Exception as e:
-            print(f"Error during username update: {e}")
+            error = e
+    total_ms = (time.perf_counter() - start) * 1000
+    return name, timer.import_ms, total_ms - timer.import_ms, error
+
 
 # Move cog loading into a function
 async def load_cogs(bot):
@@ -117,16 +201,23 @@ async def load_cogs(bot):
 
     COGS = [c for c in COGS if c is not None]
 
-    for cog in COGS:
-        try:
-            await bot.load_extension(cog)
-            print(f"Loaded {cog}")
-        except Exception as e:
-            print(f"Error loading {cog}: {str(e)}")
+    # Cogs load one at a time. Importing runs synchronously on the event loop, so
+    # overlapping loads would only interleave the setups and blur the timings;
+    # importing in threads instead executed each cog module twice.
+    start = time.perf_counter()
+    results = [await _load_cog(bot, cog) for cog in COGS]
+    total_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\nCog startup report ({len(COGS)} cogs in {total_ms:.0f}ms):")
+    for name, import_ms, setup_ms, error in sorted(results, key=lambda r: r[1] + r[2], reverse=True):
+        status = f"ERROR: {error}" if error else "ok"
+        print(f"  {name:<26} import {import_ms:6.1f}ms  setup {setup_ms:6.1f}ms  {status}")
+    return results
 
 async def main():
     # Load cogs
     await load_cogs(bot)
+    print(f"Startup: {time.perf_counter() - _process_started:.2f}s from process start to cogs loaded")
 
     # Start web server
     server_thread = start_server()
@@ -135,8 +226,9 @@ async def main():
     try:
         await bot.start(os.getenv('DISCORD_TOKEN'))
     finally:
-        # Cleanup if needed
         print("Bot shutting down...")
+        await close_http_sessions()
+        flush_disk_index(force=True)
 
 if __name__ == "__main__":
     asyncio.run(main())
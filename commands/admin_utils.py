@@ -1,57 +1,82 @@
 import discord
 from discord.ext import commands
+from discord import app_commands
 import data.storage as db
 from utils.logging import log_debug
+from utils.command_sync import sync_command_tree
+from utils.discord_resolver import resolve_users, parse_user_id, wait_for_member_warmup
 
 # Standalone function for updating usernames
 async def update_discord_usernames(bot):
-    """Updates the discord_username field for all users in the database."""
+    """Refresh discord_username for players whose Discord name changed.
+
+    Names come from the shared resolver (gateway and member caches first, bounded REST
+    lookups for the rest). Only changed rows are written, in one bulk update.
+    Returns (updated_count, error_count, not_found_ids).
+    """
     try:
-        players = await db.load_all_players()
+        players = [row async for row in db.iter_all_players("user_id, discord_username")]
         if not players:
             log_debug("No players found in database")
             return 0, 0, []
 
-        updated_count = 0
         error_count = 0
         not_found_ids = []
+        changed = {}
+
+        await wait_for_member_warmup()
+        users_by_id = await resolve_users(bot, [str(player["user_id"]) for player in players])
 
         for player in players:
-            user_id_str = str(player.get("user_id", ""))
-            try:
-                user_id = int(user_id_str)
-                user = await bot.fetch_user(user_id)
-                if user:
-                    username = user.name  # Using user.name
-                    await db.update_player(user_id_str, discord_username=username)
-                    updated_count += 1
-                    log_debug(f"Updated username for {user_id_str}: {username}")
+            user_id_str = str(player["user_id"])
+            user = users_by_id.get(user_id_str)
+            if user is None:
+                if parse_user_id(user_id_str) is None:
+                    log_debug(f"Invalid user ID format found: {user_id_str}")
                 else:
-                    log_debug(f"Could not find user for ID: {user_id_str}")
+                    log_debug(f"Discord user not found for ID: {user_id_str}")
                     not_found_ids.append(user_id_str)
-                    error_count += 1
-            except discord.NotFound:
-                log_debug(f"Discord user not found for ID: {user_id_str}")
-                not_found_ids.append(user_id_str)
-                error_count += 1
-            except ValueError:
-                log_debug(f"Invalid user ID format found: {user_id_str}")
-                error_count += 1
-            except Exception as e:
-                log_debug(f"Error fetching user {user_id_str}: {e}")
                 error_count += 1
+                continue
+            if user.name != player.get("discord_username"):
+                changed[user_id_str] = user.name
 
-        log_debug(f"Username update complete. Updated: {updated_count}, Errors: {error_count}")
+        updated_count = await db.set_discord_usernames(changed)
+        log_debug(f"Username update complete. Checked: {len(players)}, Updated: {updated_count}, Errors: {error_count}")
         return updated_count, error_count, not_found_ids
 
     except Exception as e:
         log_debug(f"Error in update_discord_usernames: {e}")
         return 0, 0, []
 
+
+async def refresh_discord_usernames(bot):
+    """Background wrapper for update_discord_usernames that reports the outcome."""
+    try:
+        updated, errors, not_found = await update_discord_usernames(bot)
+        print(f"Username update complete: {updated} updated, {errors} errors")
+        if not_found:
+            print(f"IDs not found: {', '.join(not_found)}")
+    except Exception as e:
+        print(f"Error during username update: {e}")
+
 class AdminUtils(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @app_commands.command(name='sync_commands', description='Force a global sync of the slash commands')
+    @app_commands.checks.has_permissions(administrator=True)
+    async def sync_commands(self, interaction: discord.Interaction):
+        """Sync the command tree even if its schema hash is unchanged"""
+        await interaction.response.defer(ephemeral=True)
+        log_debug(f"sync_commands called by {interaction.user.id}")
+        try:
+            _, count = await sync_command_tree(self.bot.tree, force=True)
+            await interaction.followup.send(f"✅ Synced {count} slash commands.", ephemeral=True)
+        except Exception as e:
+            log_debug(f"Forced command sync failed: {e}")
+            await interaction.followup.send(f"❌ Failed to sync slash commands: {e}", ephemeral=True)
+
 # The setup function should be defined only once at the end of the file
 async def setup(bot):
     await bot.add_cog(AdminUtils(bot))
@@ -3,7 +3,7 @@ from discord import app_commands
 import discord
 
 import data.storage as db
-from data.models import get_remaining_actions, record_actions, get_nest_building_bonus
+from data.models import get_remaining_actions, consume_actions, get_nest_building_bonus
 from utils.logging import log_debug
 from utils.time_utils import get_time_until_reset
 
@@ -33,11 +33,15 @@ class BuildCommands(commands.Cog):
         bonus_twigs = await get_nest_building_bonus(user_id, birds)
         total_twigs = amount + bonus_twigs
 
+        # Spend the actions before granting twigs so concurrent commands can't overdraw
+        consumed, remaining = await consume_actions(user_id, amount, "build")
+        if not consumed:
+            await interaction.followup.send(f"You've used all your actions for today! Come back in {get_time_until_reset()}! 🌙")
+            return
+
         await db.increment_player_field(user_id, "twigs", total_twigs)
-        await record_actions(user_id, amount, "build")
 
         player = await db.load_player(user_id)
-        remaining = await get_remaining_actions(user_id)
 
         message = f"Added {amount} {'twig' if amount == 1 else 'twigs'} to your nest!"
         if bonus_twigs:
@@ -70,11 +74,15 @@ class BuildCommands(commands.Cog):
         bonus_twigs = await get_nest_building_bonus(user_id, birds)
         total_twigs = amount + bonus_twigs
 
+        # Spend the actions before granting twigs so concurrent commands can't overdraw
+        consumed, remaining = await consume_actions(user_id, amount, "build_common")
+        if not consumed:
+            await interaction.followup.send(f"You've used all your actions for today! Come back in {get_time_until_reset()}! 🌙")
+            return
+
         await db.increment_common_nest("twigs", total_twigs)
-        await record_actions(user_id, amount, "build_common")
 
         common_nest = await db.load_common_nest()
-        remaining = await get_remaining_actions(user_id)
 
         message = f"Added {amount} {'twig' if amount == 1 else 'twigs'} to the common nest!"
         if bonus_twigs:
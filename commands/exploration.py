@@ -2,10 +2,10 @@ from discord.ext import commands
 from discord import app_commands
 import discord
 import data.storage as db
-from data.models import get_remaining_actions, record_actions
+from data.models import get_remaining_actions, consume_actions
 from utils.logging import log_debug
 from utils.time_utils import get_time_until_reset
-import aiohttp
+from utils.http import get_http_session
 import random
 
 VALID_REGIONS = ['oceania']
@@ -158,45 +158,45 @@ class ExplorationCommands(commands.Cog):
             "User-Agent": "BirdRPGBot/1.0 (https://github.com/bird-rpg; bird-rpg-bot@example.com)",
             "Accept": "application/json",
         }
-        async with aiohttp.ClientSession(headers=headers) as session:
-            category = random.choice(categories)
-            log_debug(f"Category: {category}")
+        session = get_http_session("wikipedia", headers=headers)
+        category = random.choice(categories)
+        log_debug(f"Category: {category}")
 
-            url = "https://en.wikipedia.org/w/api.php"
-            params = {
-                "action": "query",
-                "list": "categorymembers",
-                "cmtitle": category,
-                "cmtype": "page",
-                "cmlimit": "500",
-                "format": "json"
-            }
-            log_debug(f"Requesting categorymembers URL: {url}, params: {params}")
+        url = "https://en.wikipedia.org/w/api.php"
+        params = {
+            "action": "query",
+            "list": "categorymembers",
+            "cmtitle": category,
+            "cmtype": "page",
+            "cmlimit": "500",
+            "format": "json"
+        }
+        log_debug(f"Requesting categorymembers URL: {url}, params: {params}")
 
-            async with session.get(url, params=params) as response:
-                log_debug(f"Categorymembers response status: {response.status}")
-                if response.status != 200:
-                    body = await response.text()
-                    log_debug(f"Non-200 status code from categorymembers request. Body: {body[:500]}")
-                    return None
+        async with session.get(url, params=params) as response:
+            log_debug(f"Categorymembers response status: {response.status}")
+            if response.status != 200:
+                body = await response.text()
+                log_debug(f"Non-200 status code from categorymembers request. Body: {body[:500]}")
+                return None
 
-                data = await response.json()
-                log_debug(f"Categorymembers data received: {data}")
+            data = await response.json()
+            log_debug(f"Categorymembers data received: {data}")
 
-                if not data.get("query", {}).get("categorymembers"):
-                    log_debug("No categorymembers found, returning None.")
-                    return None
+            if not data.get("query", {}).get("categorymembers"):
+                log_debug("No categorymembers found, returning None.")
+                return None
 
-                page = random.choice(data["query"]["categorymembers"])
-                log_debug(f"Selected page: {page}")
+            page = random.choice(data["query"]["categorymembers"])
+            log_debug(f"Selected page: {page}")
 
-                # Return just the page title and a link to the Wikipedia page
-                return {
-                    "title": f"You visited: {page['title']}!",
-                    "description": "View the Wikipedia page to learn more!",
-                    "url": f"https://en.wikipedia.org/wiki/{page['title'].replace(' ', '_')}",
-                    "image": None
-                }
+            # Return just the page title and a link to the Wikipedia page
+            return {
+                "title": f"You visited: {page['title']}!",
+                "description": "View the Wikipedia page to learn more!",
+                "url": f"https://en.wikipedia.org/wiki/{page['title'].replace(' ', '_')}",
+                "image": None
+            }
 
     @app_commands.command(name='explore', description='Explore a region to find locations')
     @app_commands.describe(
@@ -224,11 +224,13 @@ class ExplorationCommands(commands.Cog):
             # Limit amount to remaining actions
             amount = min(amount, remaining_actions)
 
-            # Add exploration points and record actions
-            new_total = await db.increment_exploration(region_value, amount)
-            await record_actions(interaction.user.id, amount, "explore")
+            # Spend the actions before adding points so concurrent commands can't overdraw
+            consumed, remaining = await consume_actions(interaction.user.id, amount, "explore")
+            if not consumed:
+                await interaction.followup.send(f"You've used all your actions for today! Come back in {get_time_until_reset()}! 🌙")
+                return
 
-            remaining = await get_remaining_actions(interaction.user.id)
+            new_total = await db.increment_exploration(region_value, amount)
 
             # Get a random location and create an embed
             location = await self.get_random_oceania_location()
@@ -8,7 +8,7 @@ import math
 import os
 
 import data.storage as db
-from data.models import get_remaining_actions, record_actions, add_bonus_actions
+from data.models import get_remaining_actions, consume_actions, add_bonus_actions
 from utils.logging import log_debug
 
 def load_treasures():
@@ -60,8 +60,14 @@ class ForagingCommands(commands.Cog):
 
             location = select.values[0]
 
-            # Record actions used
-            await record_actions(user_id, actions, "forage")
+            # Spend the actions before starting so concurrent commands can't overdraw
+            consumed, remaining = await consume_actions(user_id, actions, "forage")
+            if not consumed:
+                await select_interaction.response.edit_message(
+                    content=f"You don't have enough actions! You need {actions} but only have {remaining} remaining. 🌙",
+                    view=None
+                )
+                return
 
             # Calculate foraging time
             b = math.log(3600) / 470
@@ -1,7 +1,6 @@
 from discord.ext import commands
 from discord import app_commands
 import discord
-import asyncio
 from datetime import datetime
 import aiohttp
 import random
@@ -9,101 +8,40 @@ import urllib.parse
 import os
 
 from config.config import MAX_BIRDS_PER_NEST, SPECIES_IMAGES_DIR
+from constants import BASE_DAILY_ACTIONS
 import data.storage as db
 from data.models import (
-    get_remaining_actions, record_actions,
-    get_egg_cost, select_random_bird_species, load_bird_species,
+    get_remaining_actions, consume_actions,
+    get_egg_cost, select_random_bird_species, get_hatch_chances, load_bird_species,
     bless_egg, handle_blessed_egg_hatching, get_less_brood_chance,
     get_extra_bird_chance, get_extra_bird_space, get_prayer_effectiveness_bonus
 )
 from utils.logging import log_debug
+from utils.discord_resolver import resolve_members, resolve_users
 from utils.time_utils import get_time_until_reset, get_current_date
 
 class IncubationCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def _resolve_members_for_user_ids(self, guild, user_ids):
-        """Resolve user IDs to guild members with cached lookup first."""
-        if guild is None:
-            return {}
-
-        members_by_id = {}
-        unresolved = []
-
-        for user_id in user_ids:
-            try:
-                int_user_id = int(user_id)
-            except ValueError:
-                continue
-
-            member = guild.get_member(int_user_id)
-            if member is not None:
-                members_by_id[user_id] = member
-            else:
-                unresolved.append((user_id, int_user_id))
-
-        if not unresolved:
-            return members_by_id
-
-        semaphore = asyncio.Semaphore(5)
-
-        async def fetch_member(user_id, int_user_id):
-            async with semaphore:
-                try:
-                    member = await guild.fetch_member(int_user_id)
-                    return user_id, member
-                except (discord.NotFound, discord.HTTPException):
-                    return user_id, None
-
-        resolved = await asyncio.gather(*(fetch_member(user_id, int_user_id) for user_id, int_user_id in unresolved))
-        for user_id, member in resolved:
-            if member is not None:
-                members_by_id[user_id] = member
-
-        return members_by_id
-
     async def _get_broodable_targets(self, interaction, max_birds, today, allow_own_locked=False):
-        """Find broodable targets with batch DB queries."""
+        """Find broodable targets from the storage index, minus nests brooded today."""
         brooder_id = str(interaction.user.id)
-        all_players = await db.load_all_players()
-
-        candidate_players = []
-        candidate_user_ids = []
-        for player in all_players:
-            target_user_id = str(player["user_id"])
-            if player.get("locked", False) and not (allow_own_locked and target_user_id == brooder_id):
-                continue
-            candidate_players.append(player)
-            candidate_user_ids.append(target_user_id)
-
-        if not candidate_user_ids:
-            return []
-
-        eggs_by_user = await db.get_eggs_for_users(candidate_user_ids)
-        if not eggs_by_user:
+        indexed_targets = await db.get_broodable_targets(
+            max_birds, allow_locked_user_id=brooder_id if allow_own_locked else None
+        )
+        if not indexed_targets:
             return []
 
-        users_with_eggs = list(eggs_by_user.keys())
-        bird_counts_by_user = await db.get_bird_counts_for_users(users_with_eggs)
-        already_brooded = await db.get_brooded_targets_today(brooder_id, today, users_with_eggs)
-
-        ordered_target_ids = []
-        players_by_id = {str(player["user_id"]): player for player in candidate_players}
-        for player in candidate_players:
-            target_user_id = str(player["user_id"])
-            if target_user_id not in eggs_by_user:
-                continue
-            if bird_counts_by_user.get(target_user_id, 0) >= max_birds:
-                continue
-            if target_user_id in already_brooded:
-                continue
-            ordered_target_ids.append(target_user_id)
+        players_by_id = {player["user_id"]: player for player, _ in indexed_targets}
+        eggs_by_user = {player["user_id"]: egg for player, egg in indexed_targets}
+        already_brooded = await db.get_brooded_targets_today(brooder_id, today, list(players_by_id))
+        ordered_target_ids = [uid for uid in players_by_id if uid not in already_brooded]
 
         if not ordered_target_ids:
             return []
 
-        members_by_id = await self._resolve_members_for_user_ids(interaction.guild, ordered_target_ids)
+        members_by_id = await resolve_members(interaction.guild, ordered_target_ids)
 
         valid_targets = []
         for target_user_id in ordered_target_ids:
@@ -191,13 +129,9 @@ class IncubationCommands(commands.Cog):
         # Parse mentioned users or default to self
         mentioned_users = []
         if target_users:
-            for user_id in target_users.split():
-                try:
-                    user_id = user_id.strip('<@!>')
-                    user = await self.bot.fetch_user(int(user_id))
-                    mentioned_users.append(user)
-                except (ValueError, discord.NotFound, discord.HTTPException):
-                    continue
+            mentions = target_users.split()
+            users_by_mention = await resolve_users(self.bot, mentions)
+            mentioned_users = [users_by_mention[m] for m in mentions if m in users_by_mention]
 
         if not mentioned_users:
             mentioned_users = [interaction.user]
@@ -220,7 +154,7 @@ class IncubationCommands(commands.Cog):
                 skipped_targets.append((target_user, "no actions left"))
                 continue
 
-            result_tuple, error = await self.process_brooding(interaction, target_user, remaining_actions)
+            result_tuple, error, remaining_actions = await self.process_brooding(interaction, target_user, remaining_actions)
             if error:
                 skipped_targets.append((target_user, error))
             else:
@@ -228,8 +162,6 @@ class IncubationCommands(commands.Cog):
                     hatched_targets.append(result_tuple)
                 else:
                     successful_targets.append(result_tuple)
-                await record_actions(interaction.user.id, 1, "brood")
-                remaining_actions -= 1
 
         # Send batched response for successful broods
         if successful_targets:
@@ -277,39 +209,12 @@ class IncubationCommands(commands.Cog):
             await interaction.followup.send("There are no nests available to brood! All nests either have no eggs, you've already brooded them today, or they are at capacity. \U0001f95a")
             return
 
-        # Process brooding for as many targets as possible
-        successful_targets = []
-        hatched_targets = []
-        skipped_targets = []
-        successful_count = 0
-
-        # Process each target until out of actions or targets
-        for target_user, target_player, target_egg in valid_targets:
-            if remaining_actions <= 0:
-                break
-
-            result_tuple, error = await self.process_brooding(
-                interaction,
-                target_user,
-                remaining_actions,
-                prefetched_player=target_player,
-                prefetched_egg=target_egg,
-                max_birds=max_birds,
-            )
-            if error:
-                skipped_targets.append((target_user, error))
-                continue
-
-            if result_tuple[0] == "hatch":
-                hatched_targets.append(result_tuple)
-            else:
-                successful_targets.append(result_tuple)
-
-            successful_count += 1
-            remaining_actions -= 1
-
-        if successful_count > 0:
-            await record_actions(interaction.user.id, successful_count, "brood")
+        # Brood as many targets as actions allow, in bulk; actions are spent as eggs are brooded
+        successful_targets, hatched_targets, skipped_targets = await self.brood_targets(
+            interaction, valid_targets, today, remaining_actions
+        )
+        # The brood_eggs RPC doesn't report the budget, so read back what the spends left
+        remaining_actions = await get_remaining_actions(interaction.user.id)
 
         # Send batched response for successful broods
         if successful_targets:
@@ -357,7 +262,7 @@ class IncubationCommands(commands.Cog):
 
         # Select a random target and brood their egg
         target_user, target_player, target_egg = random.choice(valid_targets)
-        result_tuple, error = await self.process_brooding(
+        result_tuple, error, remaining_actions = await self.process_brooding(
             interaction,
             target_user,
             remaining_actions,
@@ -370,14 +275,11 @@ class IncubationCommands(commands.Cog):
             await interaction.followup.send(f"Couldn't brood at {target_user.display_name}'s nest: {error}")
             return
 
-        await record_actions(interaction.user.id, 1, "brood")
-
         # Send appropriate response
         if result_tuple[0] == "hatch":
             await self.send_hatching_response(interaction, result_tuple)
         else:
             _, remaining, target_nest_name, target_user = result_tuple
-            remaining_actions = await get_remaining_actions(interaction.user.id)
             await interaction.followup.send(f"You brooded at {target_user.mention}'s **{target_nest_name}**! The egg needs {remaining} more {'brood' if remaining == 1 else 'broods'} until it hatches. \U0001f95a\nYou have {remaining_actions} {'action' if remaining_actions == 1 else 'actions'} remaining today.")
 
     @app_commands.command(name='lock_nest', description='Lock your nest to prevent others from brooding')
@@ -423,26 +325,89 @@ class IncubationCommands(commands.Cog):
         success, message = await bless_egg(user_id)
         await interaction.followup.send(message)
 
+    async def brood_targets(self, interaction, targets, today, max_broods):
+        """Brood up to max_broods of a prefiltered list of (member, player, egg) targets with bulk writes.
+
+        Eggs below the hatch threshold are brooded in one storage call, which also spends
+        one action per egg and moves on to later targets when earlier ones turn out to be
+        brooded already. Stuck eggs (already at the threshold) spend their action
+        individually. Only eggs that reach the threshold go through hatch_egg. Targets
+        must already be unlocked, not brooded today and below the nest capacity (see
+        _get_broodable_targets).
+        Returns (progress results, hatch results, skipped (member, reason) pairs).
+        """
+        brooder_id = str(interaction.user.id)
+        to_brood = [str(member.id) for member, _, egg in targets if egg["brooding_progress"] < 10]
+        new_progress_by_user = await db.brood_eggs(brooder_id, to_brood, today, max_broods, BASE_DAILY_ACTIONS)
+        broods_left = max_broods - len(new_progress_by_user)
+
+        # When the budget ran out, targets after the last brooded egg were never tried
+        tried = set(to_brood)
+        if broods_left <= 0:
+            brooded_positions = [i for i, uid in enumerate(to_brood) if uid in new_progress_by_user]
+            tried = set(to_brood[:brooded_positions[-1] + 1]) if brooded_positions else set()
+
+        successful_targets = []
+        hatched_targets = []
+        skipped_targets = []
+        for target_user, target_player, target_egg in targets:
+            target_user_id = str(target_user.id)
+            target_nest_name = target_player.get("nest_name", "Some Bird's Nest")
+
+            if target_egg["brooding_progress"] >= 10:
+                # Stuck eggs hatch without another brood, but still cost an action
+                if broods_left <= 0:
+                    continue
+                consumed, _ = await consume_actions(brooder_id, 1, "brood")
+                if not consumed:
+                    broods_left = 0
+                    continue
+                broods_left -= 1
+                new_progress = target_egg["brooding_progress"]
+            elif target_user_id in new_progress_by_user:
+                new_progress = new_progress_by_user[target_user_id]
+            elif target_user_id in tried:
+                skipped_targets.append((target_user, "already brooded this egg today"))
+                continue
+            else:
+                continue
+
+            if new_progress >= 10:
+                result = await self.hatch_egg(target_user, target_egg, target_nest_name)
+                if result is None:
+                    skipped_targets.append((target_user, "egg has already hatched"))
+                else:
+                    hatched_targets.append(result)
+            else:
+                successful_targets.append(("progress", 10 - new_progress, target_nest_name, target_user))
+
+        return successful_targets, hatched_targets, skipped_targets
+
     async def process_brooding(self, interaction_or_ctx, target_user, remaining_actions, prefetched_player=None, prefetched_egg=None, max_birds=None):
-        """Helper function to process brooding for a single user"""
+        """Helper function to process brooding for a single user.
+
+        Spends the brooder's action once the target checks pass, before anything is written.
+        Returns (result, error, remaining_actions), where remaining_actions is what the
+        spend left (or the count passed in, if nothing was spent).
+        """
         target_user_id = str(target_user.id)
         target_player = prefetched_player if prefetched_player is not None else await db.load_player(target_user_id)
 
         # Check if target's nest is locked and brooder is not the owner
         user_id = getattr(interaction_or_ctx, 'user', getattr(interaction_or_ctx, 'author', None)).id
         if target_player.get("locked", False) and str(user_id) != target_user_id:
-            return None, "Nest is locked!"
+            return None, "Nest is locked!", remaining_actions
 
         # Check if target has an egg
         egg = prefetched_egg if prefetched_egg is not None else await db.get_egg(target_user_id)
         if egg is None:
-            return None, "doesn't have an egg to brood"
+            return None, "doesn't have an egg to brood", remaining_actions
 
         # Check if already brooded today
         brooder_id = str(user_id)
         today = get_current_date()
         if await db.has_brooded_today(brooder_id, target_user_id, today):
-            return None, "already brooded this egg today"
+            return None, "already brooded this egg today", remaining_actions
 
         # Check nest capacity before hatching would occur
         would_hatch = egg["brooding_progress"] >= 10 or egg["brooding_progress"] + 1 >= 10
@@ -452,7 +417,12 @@ class IncubationCommands(commands.Cog):
                 max_birds = MAX_BIRDS_PER_NEST + extra_bird_space
             current_birds = await db.get_player_birds(target_user_id)
             if len(current_birds) >= max_birds:
-                return None, f"nest already has the maximum of {max_birds} birds — free a spot before hatching"
+                return None, f"nest already has the maximum of {max_birds} birds — free a spot before hatching", remaining_actions
+
+        # Spend the action before any write so concurrent commands can't overdraw
+        consumed, remaining_actions = await consume_actions(brooder_id, 1, "brood")
+        if not consumed:
+            return None, "no actions left", remaining_actions
 
         # If egg is already at hatching threshold (stuck state recovery), skip increment
         if egg["brooding_progress"] >= 10:
@@ -460,97 +430,105 @@ class IncubationCommands(commands.Cog):
         else:
             # Record brooding and increment
             await db.record_brooding(brooder_id, target_user_id, today)
-            new_progress = egg["brooding_progress"] + 1
-            await db.update_egg(target_user_id, brooding_progress=new_progress)
+            # Incremented server-side: the egg may be a prefetched (and possibly stale) copy
+            new_progress = await db.increment_egg_progress(target_user_id)
+            if new_progress is None:
+                return None, "egg has already hatched", remaining_actions
             await db.add_egg_brooder(target_user_id, brooder_id)
 
         target_nest_name = target_player.get("nest_name", "Some Bird's Nest")
 
         if new_progress >= 10:
-            if "multipliers" not in egg:
-                full_egg = await db.get_egg(target_user_id)
-                if full_egg is not None:
-                    egg = full_egg
-
-            # Get multipliers if they exist
-            multipliers = egg.get("multipliers", {})
-
-            # Get the main bird species
-            bird_species = await select_random_bird_species(multipliers)
-            chick = {
-                "commonName": bird_species["commonName"],
-                "scientificName": bird_species["scientificName"]
-            }
-
-            # Add the main chick to the nest via DB
-            await db.add_bird(target_user_id, chick["commonName"], chick["scientificName"])
-
-            # Check for "extra bird" effect from plants
-            target_plants = await db.get_player_plants(target_user_id)
-            extra_bird_chance = await get_extra_bird_chance(target_plants)
-            extra_birds = []
-
-            if extra_bird_chance > 0:
-                # Calculate how many guaranteed extra birds (each 100% is one guaranteed bird)
-                guaranteed_extra_birds = int(extra_bird_chance // 100)
-                # Calculate chance for an additional extra bird
-                remaining_chance = extra_bird_chance % 100
-
-                # Add guaranteed extra birds
-                for i in range(guaranteed_extra_birds):
-                    extra_bird_species = await select_random_bird_species(multipliers)
-                    extra_chick = {
-                        "commonName": extra_bird_species["commonName"],
-                        "scientificName": extra_bird_species["scientificName"]
-                    }
-                    await db.add_bird(target_user_id, extra_chick["commonName"], extra_chick["scientificName"])
-                    extra_birds.append(extra_chick)
-
-                # Check for chance of additional extra bird
-                if remaining_chance > 0 and random.random() < (remaining_chance / 100):
-                    extra_bird_species = await select_random_bird_species(multipliers)
-                    extra_chick = {
-                        "commonName": extra_bird_species["commonName"],
-                        "scientificName": extra_bird_species["scientificName"]
-                    }
-                    await db.add_bird(target_user_id, extra_chick["commonName"], extra_chick["scientificName"])
-                    extra_birds.append(extra_chick)
-
-            # Handle blessed egg hatching
-            saved_multipliers = handle_blessed_egg_hatching(egg, bird_species["scientificName"])
-
-            # Delete the egg (cascades to multipliers/brooders)
-            await db.delete_egg(target_user_id)
-
-            # If we saved multipliers, create a new egg with them
-            if saved_multipliers:
-                # Apply plant brood reduction to the new egg (same as /lay_egg)
-                less_brood_chance = await get_less_brood_chance(target_plants)
-                initial_brooding_progress = 0
-                if less_brood_chance > 0:
-                    guaranteed_less_broods = int(less_brood_chance // 100)
-                    remaining_chance = less_brood_chance % 100
-                    if guaranteed_less_broods > 0:
-                        initial_brooding_progress += guaranteed_less_broods
-                    if remaining_chance > 0 and random.random() < (remaining_chance / 100):
-                        initial_brooding_progress += 1
-                await db.create_egg(target_user_id, brooding_progress=initial_brooding_progress, protected_prayers=False)
-                for sci_name, mult_value in saved_multipliers.items():
-                    await db.upsert_egg_multiplier(target_user_id, sci_name, mult_value)
-
-            # Get updated bird count for the response
-            updated_birds = await db.get_player_birds(target_user_id)
-            total_chicks = len(updated_birds)
-
-            # Add extra birds to the result tuple
-            result_tuple = ("hatch", chick, target_nest_name, target_user, total_chicks)
-            if extra_birds:
-                result_tuple = ("hatch", chick, target_nest_name, target_user, total_chicks, extra_birds)
-
-            return result_tuple, None
+            result = await self.hatch_egg(target_user, egg, target_nest_name)
+            if result is None:
+                return None, "egg has already hatched", remaining_actions
+            return result, None, remaining_actions
         else:
             remaining = 10 - new_progress
-            return ("progress", remaining, target_nest_name, target_user), None
+            return ("progress", remaining, target_nest_name, target_user), None, remaining_actions
+
+    async def hatch_egg(self, target_user, egg, target_nest_name):
+        """Hatch a target's egg: roll the chick (plus any plant extras), then write the hatch in one RPC.
+
+        Returns the hatch result tuple, or None if the egg was hatched by someone else first.
+        """
+        target_user_id = str(target_user.id)
+        if "multipliers" not in egg:
+            full_egg = await db.get_egg(target_user_id)
+            if full_egg is not None:
+                egg = full_egg
+
+        # Get multipliers if they exist
+        multipliers = egg.get("multipliers", {})
+
+        # Get the main bird species
+        bird_species = await select_random_bird_species(multipliers)
+        chick = {
+            "commonName": bird_species["commonName"],
+            "scientificName": bird_species["scientificName"]
+        }
+
+        # Check for "extra bird" effect from plants
+        target_plants = await db.get_player_plants(target_user_id)
+        extra_bird_chance = await get_extra_bird_chance(target_plants)
+        extra_birds = []
+
+        if extra_bird_chance > 0:
+            # Calculate how many guaranteed extra birds (each 100% is one guaranteed bird)
+            guaranteed_extra_birds = int(extra_bird_chance // 100)
+            # Calculate chance for an additional extra bird
+            remaining_chance = extra_bird_chance % 100
+
+            # Add guaranteed extra birds
+            for i in range(guaranteed_extra_birds):
+                extra_bird_species = await select_random_bird_species(multipliers)
+                extra_chick = {
+                    "commonName": extra_bird_species["commonName"],
+                    "scientificName": extra_bird_species["scientificName"]
+                }
+                extra_birds.append(extra_chick)
+
+            # Check for chance of additional extra bird
+            if remaining_chance > 0 and random.random() < (remaining_chance / 100):
+                extra_bird_species = await select_random_bird_species(multipliers)
+                extra_chick = {
+                    "commonName": extra_bird_species["commonName"],
+                    "scientificName": extra_bird_species["scientificName"]
+                }
+                extra_birds.append(extra_chick)
+
+        # Handle blessed egg hatching
+        saved_multipliers = handle_blessed_egg_hatching(egg, bird_species["scientificName"])
+
+        # If we saved multipliers, the hatch lays a new egg with them
+        initial_brooding_progress = 0
+        if saved_multipliers:
+            # Apply plant brood reduction to the new egg (same as /lay_egg)
+            less_brood_chance = await get_less_brood_chance(target_plants)
+            if less_brood_chance > 0:
+                guaranteed_less_broods = int(less_brood_chance // 100)
+                remaining_chance = less_brood_chance % 100
+                if guaranteed_less_broods > 0:
+                    initial_brooding_progress += guaranteed_less_broods
+                if remaining_chance > 0 and random.random() < (remaining_chance / 100):
+                    initial_brooding_progress += 1
+
+        # Add the birds and delete (or re-lay) the egg atomically
+        total_chicks = await db.hatch_egg(
+            target_user_id,
+            [chick] + extra_birds,
+            saved_multipliers=saved_multipliers,
+            new_egg_progress=initial_brooding_progress,
+        )
+        if total_chicks is None:
+            return None
+
+        # Add extra birds to the result tuple
+        result_tuple = ("hatch", chick, target_nest_name, target_user, total_chicks)
+        if extra_birds:
+            result_tuple = ("hatch", chick, target_nest_name, target_user, total_chicks, extra_birds)
+
+        return result_tuple
 
     async def send_hatching_response(self, interaction_or_ctx, result):
         """Helper function to send a hatching response"""
@@ -736,37 +714,23 @@ class IncubationCommands(commands.Cog):
             effective_prayers_to_add = 0
 
         new_multiplier = current_multiplier + effective_prayers_to_add
-        await db.upsert_egg_multiplier(user_id, scientific_name, new_multiplier)
 
-        # Calculate actual percentage chance
-        total_weight = 0
-        target_weight = 0
-        target_base_weight = 0
+        # Spend the actions before adding prayers so concurrent commands can't overdraw
+        consumed, remaining_actions = await consume_actions(user_id, amount_of_prayers, "pray")
+        if not consumed:
+            await interaction.followup.send(
+                f"You don't have enough actions! You need {amount_of_prayers} but only have {remaining_actions} remaining. \U0001f319"
+            )
+            return
+
+        await db.upsert_egg_multiplier(user_id, scientific_name, new_multiplier)
 
-        # Calculate total weights with multipliers
-        # Re-read egg to get all current multipliers including the one we just updated
+        # Calculate actual percentage chance from the same weights hatching draws from
         updated_multipliers = egg.get("multipliers", {})
         updated_multipliers[scientific_name] = new_multiplier
-
-        for species in all_birds:
-            base_weight = species["rarityWeight"]
-            if species["scientificName"] == scientific_name:
-                target_base_weight = base_weight
-                multiplied_weight = base_weight * new_multiplier
-                target_weight = multiplied_weight
-                total_weight += multiplied_weight
-            else:
-                # Apply any existing multipliers for other species
-                if species["scientificName"] in updated_multipliers:
-                    total_weight += base_weight * updated_multipliers[species["scientificName"]]
-                else:
-                    total_weight += base_weight
-
-        base_percentage = (target_base_weight / sum(s["rarityWeight"] for s in all_birds)) * 100
-        actual_percentage = (target_weight / total_weight) * 100
-
-        # Consume actions
-        await record_actions(user_id, amount_of_prayers, "pray")
+        base_chance, current_chance = await get_hatch_chances(scientific_name, updated_multipliers)
+        base_percentage = base_chance * 100
+        actual_percentage = current_chance * 100
 
         response_message = (
             f"\U0001f64f You offered {amount_of_prayers} {'prayer' if amount_of_prayers == 1 else 'prayers'} for {scientific_name}! \U0001f64f\n"
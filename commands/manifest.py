@@ -1,16 +1,16 @@
 from discord.ext import commands
 from discord import app_commands
 import discord
-import aiohttp
 import json
 import os
 import urllib.parse
 import random
 
 import data.storage as db
-from data.models import get_remaining_actions, record_actions, clear_bird_species_cache
+from data.models import get_remaining_actions, consume_actions, clear_bird_species_cache
 from data.manifest_constants import get_points_needed
 from utils.logging import log_debug
+from utils.http import get_http_session
 from config.config import SPECIES_IMAGES_DIR
 
 class ManifestCommands(commands.Cog):
@@ -133,6 +133,14 @@ class ManifestCommands(commands.Cog):
         # Only use as many actions as needed to fully manifest
         actions_used = min(actions, points_remaining)
 
+        # Spend the actions before adding points so concurrent commands can't overdraw
+        consumed, remaining = await consume_actions(user_id, actions_used, "manifest")
+        if not consumed:
+            await interaction.followup.send(
+                f"You don't have enough actions! You need {actions_used} but only have {remaining} remaining. 🌙"
+            )
+            return
+
         # Add manifestation points
         bird["manifested_points"] += actions_used
 
@@ -153,9 +161,6 @@ class ManifestCommands(commands.Cog):
         if is_newly_manifested:
             clear_bird_species_cache()
 
-        # Record only the actions actually used
-        await record_actions(user_id, actions_used, "manifest")
-
         # Create and send response
         if is_newly_manifested:
             await self.send_fully_manifested_response(interaction, bird)
@@ -270,6 +275,14 @@ class ManifestCommands(commands.Cog):
         # Only use as many actions as needed to fully manifest
         actions_used = min(actions, points_remaining)
 
+        # Spend the actions before adding points so concurrent commands can't overdraw
+        consumed, remaining = await consume_actions(user_id, actions_used, "manifest")
+        if not consumed:
+            await interaction.followup.send(
+                f"You don't have enough actions! You need {actions_used} but only have {remaining} remaining. 🌙"
+            )
+            return
+
         # Add manifestation points
         plant["manifested_points"] += actions_used
 
@@ -286,9 +299,6 @@ class ManifestCommands(commands.Cog):
         # Save the updated data via upsert
         await db.upsert_manifested_plant(plant)
 
-        # Record only the actions actually used
-        await record_actions(user_id, actions_used, "manifest")
-
         # Create and send response
         if is_newly_manifested:
             await self.send_fully_manifested_plant_response(interaction, plant)
@@ -313,12 +323,11 @@ class ManifestCommands(commands.Cog):
 
         api_url = f"https://api.inaturalist.org/v1/taxa?q={name}&limit=1"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('results') and len(data['results']) > 0:
-                            return data['results'][0]
+            async with get_http_session().get(api_url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('results') and len(data['results']) > 0:
+                        return data['results'][0]
         except Exception as e:
             log_debug(f"Error fetching data from iNaturalist: {e}")
         return None
@@ -387,23 +396,23 @@ class ManifestCommands(commands.Cog):
 
             # Image doesn't exist, fetch from iNaturalist API
             api_url = f"https://api.inaturalist.org/v1/taxa?q={scientific_name}&limit=1"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data['results']:
-                            taxon = data['results'][0]
-                            image_url = taxon.get('default_photo', {}).get('medium_url')
-
-                            if image_url:
-                                # Download the image
-                                async with session.get(image_url) as img_response:
-                                    if img_response.status == 200:
-                                        image_data = await img_response.read()
-                                        with open(filepath, 'wb') as f:
-                                            f.write(image_data)
-                                        log_debug(f"Downloaded image for {scientific_name}")
-                                        return True
+            session = get_http_session()
+            async with session.get(api_url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data['results']:
+                        taxon = data['results'][0]
+                        image_url = taxon.get('default_photo', {}).get('medium_url')
+
+                        if image_url:
+                            # Download the image
+                            async with session.get(image_url) as img_response:
+                                if img_response.status == 200:
+                                    image_data = await img_response.read()
+                                    with open(filepath, 'wb') as f:
+                                        f.write(image_data)
+                                    log_debug(f"Downloaded image for {scientific_name}")
+                                    return True
 
             log_debug(f"Failed to download image for {scientific_name}")
             return False
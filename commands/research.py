@@ -9,7 +9,7 @@ import random
 
 import data.storage as db
 from data.storage import load_research_entities
-from data.models import get_remaining_actions, record_actions, load_bird_species
+from data.models import get_remaining_actions, consume_actions, load_bird_species
 from config.config import SPECIES_IMAGES_DIR, DATA_PATH
 from utils.logging import log_debug
 
@@ -141,8 +141,14 @@ class ResearchCommands(commands.Cog):
             )
             return
 
-        # Record the actions used
-        await record_actions(user_id, actions, "study")
+        # Spend the actions before studying so concurrent commands can't overdraw
+        consumed, remaining_actions = await consume_actions(user_id, actions, "study")
+        if not consumed:
+            await interaction.followup.send(
+                f"You don't have enough actions! You need {actions} but only have {remaining_actions} remaining. 🌙",
+                ephemeral=True
+            )
+            return
 
         # Load research entities for the active event
         active_event = await db.get_active_event()
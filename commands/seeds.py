@@ -4,7 +4,7 @@ import discord
 
 from config.config import MAX_GARDEN_SIZE
 import data.storage as db
-from data.models import (get_remaining_actions, record_actions,
+from data.models import (get_remaining_actions, consume_actions,
                          get_seed_gathering_bonus, get_extra_garden_space)
 from utils.logging import log_debug
 from utils.time_utils import get_time_until_reset
@@ -65,10 +65,13 @@ class SeedCommands(commands.Cog):
             await interaction.followup.send("Your nest is full! Add more twigs to store more seeds. 🪹")
             return
 
+        consumed, remaining = await consume_actions(user_id, amount, "seed")
+        if not consumed:
+            await interaction.followup.send(f"You've used all your actions for today! Come back in {get_time_until_reset()}! 🌙")
+            return
+
         await db.increment_player_field(user_id, "seeds", amount)
-        await record_actions(user_id, amount, "seed")
 
-        remaining = await get_remaining_actions(user_id)
         new_seeds = player["seeds"] + amount
         await interaction.followup.send(f"Added {amount} {'seed' if amount == 1 else 'seeds'} to your nest! 🏡\n"
                       f"Your nest now has {player['twigs']} twigs and {new_seeds} seeds.{bonus_msg}\n"
@@ -125,10 +128,13 @@ class SeedCommands(commands.Cog):
             await interaction.followup.send("The common nest is full! Add more twigs to store more seeds. 🪺")
             return
 
+        consumed, remaining = await consume_actions(user_id, amount, "seed_common")
+        if not consumed:
+            await interaction.followup.send(f"You've used all your actions for today! Come back in {get_time_until_reset()}! 🌙")
+            return
+
         await db.increment_common_nest("seeds", amount)
-        await record_actions(user_id, amount, "seed_common")
 
-        remaining = await get_remaining_actions(user_id)
         new_common_seeds = common_nest["seeds"] + amount
         await interaction.followup.send(f"Added {amount} {'seed' if amount == 1 else 'seeds'} to the common nest! 🌇\n"
                       f"The common nest now has {common_nest['twigs']} twigs and {new_common_seeds} seeds.{bonus_msg}\n"
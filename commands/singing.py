@@ -1,24 +1,58 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
 import io
 import random
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 
 import data.storage as db
 from data.models import (
-    get_remaining_actions, record_actions, add_bonus_actions,
+    get_remaining_actions, consume_actions, add_bonus_actions,
     get_singing_bonus, get_singing_inspiration_chance
 )
 from utils.logging import log_debug
-from utils.birdsong_audio import get_birdsong_for_bird
-from utils.time_utils import get_time_until_reset, get_current_date
-from config.config import DEBUG
+from utils.discord_resolver import resolve_users
+from utils.birdsong_audio import (
+    get_birdsong_for_bird, in_prefetch_hours, load_fallback_pool, prefetch_birdsongs, flush_disk_index
+)
+from utils.audio_clip import clip_filename
+from utils.time_utils import get_time_until_reset, get_current_date, get_australian_time
+from config.config import DEBUG, BIRDSONG_PREFETCH_ACTIVE_DAYS
 
 class SingingCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.last_prefetch_date = None
+        self.birdsong_prefetch_task.start()
+
+    def cog_unload(self):
+        self.birdsong_prefetch_task.cancel()
+
+    @tasks.loop(minutes=30)
+    async def birdsong_prefetch_task(self):
+        """Once a night during quiet hours, cache songs for the species active players own"""
+        # Also persist the last-used times of cached clips served since the last run
+        await asyncio.to_thread(flush_disk_index)
+
+        now = get_australian_time()
+        today = now.strftime('%Y-%m-%d')
+        if not in_prefetch_hours(now.hour) or self.last_prefetch_date == today:
+            return
+        self.last_prefetch_date = today
+
+        try:
+            since = (now - timedelta(days=BIRDSONG_PREFETCH_ACTIVE_DAYS)).strftime('%Y-%m-%d')
+            species = await db.get_active_player_species(since)
+            fetched = await prefetch_birdsongs(species)
+            log_debug(f"Birdsong prefetch: {fetched} new clips for {len(species)} owned species")
+        except Exception as e:
+            log_debug(f"Birdsong prefetch failed: {e}")
+
+    @birdsong_prefetch_task.before_loop
+    async def before_birdsong_prefetch_task(self):
+        """Wait until the bot is ready before starting the task"""
+        await self.bot.wait_until_ready()
 
     async def _process_singing(self, interaction: discord.Interaction, target_users: list[discord.User]):
         """Helper method to process the core singing logic for a list of target users."""
@@ -28,7 +62,7 @@ class SingingCommands(commands.Cog):
         # 1. Pre-fetch all needed data (few DB calls total)
         remaining_actions = await get_remaining_actions(singer_id)
         if remaining_actions <= 0:
-            return [], [(u, "no actions left") for u in target_users], []
+            return [], [(u, "no actions left") for u in target_users], [], remaining_actions
 
         birds = await db.get_player_birds(singer_id)
         singing_bonus = await get_singing_bonus(birds)
@@ -65,19 +99,23 @@ class SingingCommands(commands.Cog):
         # 4. Batch write all results
         points_per_target = 3 + singing_bonus
         if successful_targets:
+            # Spend the singer's actions once, before any song is granted, so concurrent
+            # commands can't overdraw
+            consumed, remaining_actions = await consume_actions(singer_id, len(successful_targets), "sing")
+            if not consumed:
+                skipped_targets.extend((target_user, "no actions left") for target_user, _, _ in successful_targets)
+                return [], skipped_targets, birds, remaining_actions
             # Batch record all songs (1 DB call)
             await db.record_songs_batch(singer_id, successful_target_ids, today, points_given=points_per_target)
             # Batch bonus actions concurrently (parallel RPC calls)
             await asyncio.gather(*[add_bonus_actions(tid, 3 + singing_bonus)
                                     for tid in successful_target_ids])
-            # Record singer's actions once (instead of per-target)
-            await record_actions(singer_id, len(successful_targets), "sing")
             # Inspiration for first sing only
             total_inspiration = successful_targets[0][2]
             if total_inspiration > 0:
                 await db.increment_player_field(singer_id, "inspiration", total_inspiration)
 
-        return successful_targets, skipped_targets, birds
+        return successful_targets, skipped_targets, birds, remaining_actions
 
 
     @app_commands.command(name='sing', description='Give other users extra actions for the day')
@@ -87,15 +125,12 @@ class SingingCommands(commands.Cog):
         await interaction.response.defer() # Defer response immediately
 
         # Parse mentioned users
-        target_users = []
-        for user_id in target_users_str.split():
-            try:
-                user_id = user_id.strip('<@!>') # Keep original name
-                user = await self.bot.fetch_user(int(user_id))
-                target_users.append(user)
-            except Exception as e:
-                log_debug(f"Could not parse user ID {user_id} in sing command: {e}")
-                continue # Skip invalid mentions
+        mentions = target_users_str.split()
+        users_by_mention = await resolve_users(self.bot, mentions)
+        target_users = [users_by_mention[m] for m in mentions if m in users_by_mention]
+        for mention in mentions:
+            if mention not in users_by_mention:
+                log_debug(f"Could not resolve user {mention} in sing command")
 
         if not target_users:
             await interaction.followup.send("Please mention valid users to sing to! Usage: /sing @user1 @user2 ...")
@@ -107,7 +142,7 @@ class SingingCommands(commands.Cog):
         await db.set_last_song_targets(interaction.user.id, [str(user.id) for user in target_users])
 
         # Call the helper method to process singing
-        successful_targets, skipped_targets, birds = await self._process_singing(interaction, target_users)
+        successful_targets, skipped_targets, birds, singer_actions_left = await self._process_singing(interaction, target_users)
 
         # Construct response message
         if not successful_targets and not skipped_targets:
@@ -135,7 +170,6 @@ class SingingCommands(commands.Cog):
                 for user, reason in skipped_targets:
                     message.append(f"• {user.mention} ({reason})")
 
-            singer_actions_left = await get_remaining_actions(interaction.user.id)
             message.append(f"\n(You have {singer_actions_left} {'action' if singer_actions_left == 1 else 'actions'} remaining)")
 
         # Try to attach a birdsong audio clip
@@ -145,7 +179,7 @@ class SingingCommands(commands.Cog):
                 chosen_bird = random.choice(birds)
                 mp3_data, singing_bird_name, is_default = await get_birdsong_for_bird(chosen_bird)
                 if mp3_data:
-                    audio_file = discord.File(io.BytesIO(mp3_data), filename="birdsong.mp3")
+                    audio_file = discord.File(io.BytesIO(mp3_data), filename=clip_filename(mp3_data))
                     if is_default:
                         message.insert(0, f"🐦 Your {singing_bird_name} sings! (Though no xeno-canto song was found)")
                     else:
@@ -171,18 +205,11 @@ class SingingCommands(commands.Cog):
             return
 
         # Fetch user objects from IDs
-        target_users = []
-        invalid_ids = []
-        for user_id_str in last_target_ids:
-            try:
-                user = await self.bot.fetch_user(int(user_id_str))
-                target_users.append(user)
-            except discord.NotFound:
-                log_debug(f"User ID {user_id_str} not found for sing_repeat.")
-                invalid_ids.append(user_id_str)
-            except ValueError:
-                 log_debug(f"Invalid user ID format {user_id_str} for sing_repeat.")
-                 invalid_ids.append(user_id_str) # Keep track of invalid IDs
+        users_by_id = await resolve_users(self.bot, last_target_ids)
+        target_users = [users_by_id[uid] for uid in last_target_ids if uid in users_by_id]
+        invalid_ids = [uid for uid in last_target_ids if uid not in users_by_id]
+        if invalid_ids:
+            log_debug(f"User IDs not found for sing_repeat: {', '.join(invalid_ids)}")
 
         # Check if we have any valid users left after fetching
         if not target_users:
@@ -193,7 +220,7 @@ class SingingCommands(commands.Cog):
             return
 
         # Call the helper method to process singing
-        successful_targets, skipped_targets, birds = await self._process_singing(interaction, target_users)
+        successful_targets, skipped_targets, birds, singer_actions_left = await self._process_singing(interaction, target_users)
 
         # Construct response message
         if not successful_targets and not skipped_targets:
@@ -230,8 +257,6 @@ class SingingCommands(commands.Cog):
             if invalid_ids:
                  message.append(f"\nAlso couldn't find users with IDs: {', '.join(invalid_ids)}")
 
-            # Use the latest data to get remaining actions
-            singer_actions_left = await get_remaining_actions(interaction.user.id)
             message.append(f"\n(You have {singer_actions_left} {'action' if singer_actions_left == 1 else 'actions'} remaining)")
 
         # Try to attach a birdsong audio clip
@@ -241,7 +266,7 @@ class SingingCommands(commands.Cog):
                 chosen_bird = random.choice(birds)
                 mp3_data, singing_bird_name, is_default = await get_birdsong_for_bird(chosen_bird)
                 if mp3_data:
-                    audio_file = discord.File(io.BytesIO(mp3_data), filename="birdsong.mp3")
+                    audio_file = discord.File(io.BytesIO(mp3_data), filename=clip_filename(mp3_data))
                     if is_default:
                         message.insert(0, f"🐦 Your {singing_bird_name} sings! (Though no xeno-canto song was found)")
                     else:
@@ -255,4 +280,5 @@ class SingingCommands(commands.Cog):
             await interaction.followup.send("\n".join(message))
 
 async def setup(bot):
+    await asyncio.to_thread(load_fallback_pool)
     await bot.add_cog(SingingCommands(bot))
@@ -8,11 +8,12 @@ from discord.ext import commands
 from discord import app_commands, File
 
 from data.models import (
-    get_remaining_actions, record_actions, get_swooping_bonus
+    get_remaining_actions, consume_actions, get_swooping_bonus
 )
 import data.storage as db
 from utils.checks import has_birds
 from utils.human_spawner import HumanSpawner
+from utils.blessings import apply_blessing
 
 class Swooping(commands.Cog):
     def __init__(self, bot):
@@ -47,32 +48,7 @@ class Swooping(commands.Cog):
         elif blessing["type"] == "common_nest_growth":
             await db.increment_common_nest("twigs", amount)
         else:
-            # All other blessing types need the full player list — load once
-            players = await db.load_all_players()
-            if blessing["type"] == "individual_seeds":
-                for player in players:
-                    user_id = player["user_id"]
-                    space_left = player.get("twigs", 0) - player.get("seeds", 0)
-                    add_amount = min(amount, max(0, space_left))
-                    if add_amount > 0:
-                        await db.increment_player_field(user_id, "seeds", add_amount)
-            elif blessing["type"] == "inspiration":
-                for player in players:
-                    await db.increment_player_field(player["user_id"], "inspiration", amount)
-            elif blessing["type"] == "garden_growth":
-                from config.config import MAX_GARDEN_SIZE
-                for player in players:
-                    current_size = player.get("garden_size", 0)
-                    new_size = min(current_size + amount, MAX_GARDEN_SIZE)
-                    increment = new_size - current_size
-                    if increment > 0:
-                        await db.increment_player_field(player["user_id"], "garden_size", increment)
-            elif blessing["type"] == "bonus_actions":
-                for player in players:
-                    await db.increment_player_field(player["user_id"], "bonus_actions", amount)
-            elif blessing["type"] == "individual_nest_growth":
-                for player in players:
-                    await db.increment_player_field(player["user_id"], "twigs", amount)
+            await apply_blessing(blessing["type"], amount)
 
         # Record the defeated human
         await db.add_defeated_human(
@@ -120,9 +96,16 @@ class Swooping(commands.Cog):
                 await interaction.followup.send("There are no humans to swoop at right now! The current human has already been defeated.")
                 return
 
+            # Spend the actions before dealing damage so concurrent commands can't overdraw
+            consumed, actions_left = await consume_actions(user_id, amount, "swoop")
+            if not consumed:
+                await interaction.followup.send(
+                    f"You don't have enough actions! You have {actions_left} actions."
+                )
+                return
+
             damage = amount + bonus_damage
             was_defeated = spawner.damage_human(damage)
-            await record_actions(user_id, amount, "swoop")
 
             if not was_defeated:
                 # Get updated human state after damage
@@ -133,7 +116,6 @@ class Swooping(commands.Cog):
                     message.append(f"\u2728 Your birds' special abilities add **+{bonus_damage}** damage! \u2728")
                 message.append(f"They still have **{updated_human['resilience']}/{updated_human['max_resilience']}** resilience left.")
 
-                actions_left = await get_remaining_actions(user_id)
                 message.append(f"\n\u26A1 You have **{actions_left}** {'action' if actions_left == 1 else 'actions'} remaining")
                 await interaction.followup.send("\n".join(message))
             else:
@@ -147,7 +129,6 @@ class Swooping(commands.Cog):
                     message.append(f"\u2728 Your birds' special abilities added **+{bonus_damage}** damage to the final blow! \u2728")
                 message.append(f"\U0001F64F The bird gods are pleased and grant everyone: **{blessing_name}** (**{blessing_amount}**)")
 
-                actions_left = await get_remaining_actions(user_id)
                 message.append(f"\n\u26A1 You have **{actions_left}** {'action' if actions_left == 1 else 'actions'} remaining")
 
                 if victory_gif_path and os.path.exists(victory_gif_path):
@@ -7,7 +7,7 @@ from config.config import DEBUG
 import data.storage as db
 from data.models import (
     get_remaining_actions, add_bonus_actions,
-    record_actions, select_random_bird_species
+    consume_actions, select_random_bird_species
 )
 from utils.logging import log_debug
 from utils.time_utils import get_current_date
@@ -81,9 +81,12 @@ class TestCommands(commands.Cog):
             return
 
         # Perform sing operation
+        consumed, _ = await consume_actions(interaction.user.id, 1)
+        if not consumed:
+            await interaction.followup.send(f"TEST - Singer has no actions remaining!")
+            return
         await db.record_song(interaction.user.id, target_user.id, today)
         await add_bonus_actions(target_user.id, 3)
-        await record_actions(interaction.user.id, 1)
 
         # Show state after singing
         remaining_after = await get_remaining_actions(target_user.id)
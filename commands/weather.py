@@ -1,12 +1,12 @@
 from discord.ext import commands, tasks
 from discord import app_commands
 import discord
-import aiohttp
 from datetime import datetime, time
 import pytz
 
 import data.storage as db
 from utils.logging import log_debug
+from utils.http import get_http_session
 from utils.time_utils import get_australian_time
 
 class WeatherCommands(commands.Cog):
@@ -86,14 +86,13 @@ class WeatherCommands(commands.Cog):
             "forecast_days": 1
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.format_weather_message(data, location["name"])
-                else:
-                    log_debug(f"Error fetching weather: {response.status}")
-                    return "Could not fetch weather information today."
+        async with get_http_session().get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return self.format_weather_message(data, location["name"])
+            else:
+                log_debug(f"Error fetching weather: {response.status}")
+                return "Could not fetch weather information today."
 
     def format_weather_message(self, data, location_name="Naarm"):
         """Format weather data into a nice message"""
@@ -1,4 +1,5 @@
 import os
+import shutil
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,10 +13,17 @@ NESTS_FILE = os.path.join(DATA_PATH, 'nests.json')
 LORE_FILE = os.path.join(DATA_PATH, "lore.json")
 REALM_LORE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'realm_lore.json')
 SPECIES_IMAGES_DIR = os.path.join(DATA_PATH, 'species_images')
+COMMAND_TREE_HASH_FILE = os.path.join(DATA_PATH, 'command_tree_hash.txt')  # Hash of the last synced slash command schema
+DISCORD_RESOLVE_CONCURRENCY = int(os.getenv('DISCORD_RESOLVE_CONCURRENCY', 5))  # Concurrent REST lookups when resolving users/members
+DISCORD_RESOLVE_TTL_SECONDS = int(os.getenv('DISCORD_RESOLVE_TTL_SECONDS', 3600))  # How long REST-resolved users/members are cached
+MEMBER_CHUNK_GUILD_IDS = [int(g) for g in os.getenv('MEMBER_CHUNK_GUILD_IDS', '').split(',') if g.strip()]  # Guilds whose member lists are loaded at startup (needs the Server Members intent)
 
 # Web server configuration
 PORT = int(os.getenv('PORT', 10000))
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'godbird')  # Default password if not set
+HOMEPAGE_REFRESH_SECONDS = int(os.getenv('HOMEPAGE_REFRESH_SECONDS', 30))  # How often the homepage snapshot is rebuilt
+PAGE_FETCH_WORKERS = int(os.getenv('PAGE_FETCH_WORKERS', 8))  # Threads for running a page's queries concurrently
+SHOWCASE_LAYER_CACHE_BYTES = int(os.getenv('SHOWCASE_LAYER_CACHE_BYTES', 64 * 1024 * 1024))  # Memory budget for pre-scaled nest showcase layers
 
 # Create necessary directories
 os.makedirs(DATA_PATH, exist_ok=True)
@@ -24,6 +32,15 @@ os.makedirs(SPECIES_IMAGES_DIR, exist_ok=True)
 # Supabase configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
+SUPABASE_POOL_SIZE = int(os.getenv('SUPABASE_POOL_SIZE', 10))  # Max keep-alive connections shared by sync (web) callers
+SUPABASE_POOL_IDLE_TIMEOUT = float(os.getenv('SUPABASE_POOL_IDLE_TIMEOUT', 30))  # Seconds before an idle connection is closed
+BULK_FETCH_CHUNK_SIZE = int(os.getenv('BULK_FETCH_CHUNK_SIZE', 1000))  # Rows per page when streaming whole tables
+BROOD_INDEX_REFRESH_SECONDS = int(os.getenv('BROOD_INDEX_REFRESH_SECONDS', 300))  # How often the broodable-targets index is rebuilt from the database
+
+# Outbound HTTP (shared aiohttp sessions)
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', 10))  # Max open connections per remote host
+HTTP_KEEPALIVE_SECONDS = float(os.getenv('HTTP_KEEPALIVE_SECONDS', 30))  # How long idle connections are kept for reuse
+HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', 20))  # Default total timeout for an outbound request
 
 # Game limits
 MAX_BIRDS_PER_NEST = 45  # Maximum number of birds a user can have
@@ -41,3 +58,16 @@ WEB_BASE_URL = os.getenv('WEB_BASE_URL', f'http://localhost:{PORT}')
 
 # Xeno-canto API (optional, for bird song audio in /sing commands)
 XENO_CANTO_API_KEY = os.getenv('XENO_CANTO_API_KEY', '')
+BIRDSONG_CACHE_DIR = os.path.join(DATA_PATH, 'birdsongs')  # On-disk cache of downloaded clips
+BIRDSONG_MEMORY_CACHE_BYTES = int(os.getenv('BIRDSONG_MEMORY_CACHE_BYTES', 16 * 1024 * 1024))  # In-memory clip budget
+BIRDSONG_DISK_CACHE_BYTES = int(os.getenv('BIRDSONG_DISK_CACHE_BYTES', 256 * 1024 * 1024))  # On-disk clip budget, least recently used species evicted first
+BIRDSONG_CACHE_TTL_SECONDS = int(os.getenv('BIRDSONG_CACHE_TTL_SECONDS', 30 * 24 * 3600))  # Age after which a cached clip is refreshed in the background (the old clip is still served meanwhile)
+BIRDSONG_METADATA_TTL_SECONDS = int(os.getenv('BIRDSONG_METADATA_TTL_SECONDS', 7 * 24 * 3600))  # How long a species' xeno-canto recording list is reused before searching again
+BIRDSONG_INDEX_FLUSH_SECONDS = int(os.getenv('BIRDSONG_INDEX_FLUSH_SECONDS', 300))  # How often last-used times from cache hits are written back to the disk cache index
+BIRDSONG_PREFETCH_HOURS = tuple(int(h) for h in os.getenv('BIRDSONG_PREFETCH_HOURS', '3-5').split('-'))  # Quiet hours (Australian time, start-end) when songs for owned species are prefetched
+BIRDSONG_PREFETCH_ACTIVE_DAYS = int(os.getenv('BIRDSONG_PREFETCH_ACTIVE_DAYS', 14))  # Players who acted within this many days count as active for prefetching
+BIRDSONG_PREFETCH_DELAY_SECONDS = float(os.getenv('BIRDSONG_PREFETCH_DELAY_SECONDS', 2))  # Pause between prefetched species to stay gentle on xeno-canto
+FFMPEG_PATH = os.getenv('FFMPEG_PATH') or shutil.which('ffmpeg')  # Optional; birdsong clips are re-encoded to Opus when set, else MP3s are only trimmed
+BIRDSONG_CLIP_SECONDS = float(os.getenv('BIRDSONG_CLIP_SECONDS', 8))  # Length birdsong clips are trimmed to before caching
+BIRDSONG_OPUS_BITRATE = os.getenv('BIRDSONG_OPUS_BITRATE', '24k')  # Opus bitrate for transcoded clips
+BIRDSONG_FALLBACK_RELOAD_SECONDS = int(os.getenv('BIRDSONG_FALLBACK_RELOAD_SECONDS', 60))  # How often the fallback birdsong directory is checked for changes
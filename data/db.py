@@ -2,34 +2,71 @@ import threading
 import httpx
 from supabase import create_client, Client, ClientOptions
 from supabase import create_async_client, AsyncClient
-from config.config import SUPABASE_URL, SUPABASE_KEY
+from config.config import SUPABASE_URL, SUPABASE_KEY, SUPABASE_POOL_SIZE, SUPABASE_POOL_IDLE_TIMEOUT
 
 _async_client: AsyncClient | None = None
-_sync_local = threading.local()
+_sync_client: Client | None = None
+_sync_client_lock = threading.Lock()
+
+_pool_stats = {"requests": 0, "connections_created": 0}
+_pool_stats_lock = threading.Lock()
+
+
+def _trace_connection(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        with _pool_stats_lock:
+            _pool_stats["connections_created"] += 1
+
+
+def _count_request(request):
+    # httpcore reports new connections through the per-request trace extension
+    request.extensions["trace"] = _trace_connection
+    with _pool_stats_lock:
+        _pool_stats["requests"] += 1
 
 
 def get_sync_client() -> Client:
-    """Get or create a thread-local synchronous Supabase client (for Flask routes).
+    """Get or create the shared synchronous Supabase client (for Flask routes and worker threads).
 
-    Uses thread-local storage so each thread gets its own HTTP connection.
+    Every thread shares one bounded pool of keep-alive connections (SUPABASE_POOL_SIZE),
+    and connections idle for SUPABASE_POOL_IDLE_TIMEOUT seconds are closed.
     Forces HTTP/1.1 to avoid HTTP/2 hangs in threaded Flask on Windows.
     """
-    client = getattr(_sync_local, "client", None)
-    if client is None:
-        client = create_client(
-            SUPABASE_URL, SUPABASE_KEY,
-            options=ClientOptions(
-                httpx_client=httpx.Client(
-                    http2=False,
-                    headers={
-                        "apikey": SUPABASE_KEY,
-                        "Authorization": f"Bearer {SUPABASE_KEY}",
-                    },
-                ),
-            ),
-        )
-        _sync_local.client = client
-    return client
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                _sync_client = create_client(
+                    SUPABASE_URL, SUPABASE_KEY,
+                    options=ClientOptions(
+                        httpx_client=httpx.Client(
+                            http2=False,
+                            headers={
+                                "apikey": SUPABASE_KEY,
+                                "Authorization": f"Bearer {SUPABASE_KEY}",
+                            },
+                            limits=httpx.Limits(
+                                max_connections=SUPABASE_POOL_SIZE,
+                                max_keepalive_connections=SUPABASE_POOL_SIZE,
+                                keepalive_expiry=SUPABASE_POOL_IDLE_TIMEOUT,
+                            ),
+                            event_hooks={"request": [_count_request]},
+                        ),
+                    ),
+                )
+    return _sync_client
+
+
+def get_sync_pool_stats():
+    """Requests sent through the shared sync pool and how many needed a new connection."""
+    with _pool_stats_lock:
+        requests = _pool_stats["requests"]
+        created = _pool_stats["connections_created"]
+    return {
+        "requests": requests,
+        "connections_created": created,
+        "connections_reused": max(requests - created, 0),
+    }
 
 
 async def get_async_client() -> AsyncClient:
@@ -3,6 +3,8 @@ Game business logic.  All functions are now async and call storage.py DB operati
 instead of mutating in-memory dicts.
 """
 
+import bisect
+import itertools
 import json
 import os
 import random
@@ -50,29 +52,12 @@ async def get_remaining_actions(user_id):
     return total_available - used
 
 
-async def record_actions(user_id, count, action_type=None):
-    """Record actions used by a user. Consumes bonus actions first."""
-    user_id = str(user_id)
-    today = get_current_date()
-
-    player = await db.load_player(user_id)
-    actions = await db.get_daily_actions(user_id, today)
+async def consume_actions(user_id, count, action_type=None):
+    """Atomically spend actions if today's budget allows it. Consumes bonus actions first.
 
-    current_used = actions["used"] if actions else 0
-    current_history = list(actions["action_history"]) if actions else []
-
-    bonus_to_use = 0
-    if player.get("bonus_actions", 0) > 0:
-        bonus_to_use = min(count, player["bonus_actions"])
-        await db.increment_player_field(user_id, "bonus_actions", -bonus_to_use)
-        count -= bonus_to_use
-
-    new_used = current_used + count
-    if action_type:
-        total = count + bonus_to_use
-        current_history.extend([action_type] * total)
-
-    await db.upsert_daily_actions(user_id, today, new_used, current_history)
+    Returns (consumed, remaining). Nothing is spent when consumed is False.
+    """
+    return await db.consume_actions(str(user_id), get_current_date(), count, action_type, BASE_DAILY_ACTIONS)
 
 
 async def is_first_action_of_type(user_id, action_type):
@@ -182,13 +167,19 @@ def _load_bird_species_json():
 
 _bird_species_cache = None
 _bird_species_cache_sync = None
+_bird_registry = None
+_bird_registry_sync = None
+_bird_sampler = None
 
 
 def clear_bird_species_cache():
     """Clear both async and sync bird species caches. Call after manifesting a new bird."""
-    global _bird_species_cache, _bird_species_cache_sync
+    global _bird_species_cache, _bird_species_cache_sync, _bird_registry, _bird_registry_sync, _bird_sampler
     _bird_species_cache = None
     _bird_species_cache_sync = None
+    _bird_registry = None
+    _bird_registry_sync = None
+    _bird_sampler = None
 
 
 async def load_bird_species(include_manifested=True):
@@ -228,61 +219,216 @@ def load_bird_species_sync(include_manifested=True):
     return result
 
 
+# ---------------------------------------------------------------------------
+# Bird species registry (indexed species + pre-parsed effect bonuses)
+# ---------------------------------------------------------------------------
+
+_INSPIRATION_CHANCE_RE = re.compile(r"has a (\d+)% chance to give you \+1 inspiration")
+_NO_BONUSES = {"build": 0, "song": 0, "seed_garden": 0, "swoop": 0, "inspiration_chances": ()}
+
+
+def _effect_number(effect):
+    """All digits in an effect text read as one number, 0 if there are none."""
+    digits = ''.join(filter(str.isdigit, effect))
+    return int(digits) if digits else 0
+
+
+def parse_bird_effect(effect):
+    """Turn a bird's effect text into the numeric bonuses the game applies."""
+    if not effect:
+        return _NO_BONUSES
+    bonuses = dict(_NO_BONUSES)
+    if "Your first nest-building action of the day gives" in effect:
+        bonuses["build"] = _effect_number(effect)
+    if "All your songs give" in effect:
+        bonuses["song"] = _effect_number(effect)
+    if "Your first seed gathering action of the day also gives" in effect:
+        bonuses["seed_garden"] = _effect_number(effect)
+    lowered = effect.lower()
+    if "your first swoop" in lowered and "more effective" in lowered:
+        bonuses["swoop"] = _effect_number(effect)
+    bonuses["inspiration_chances"] = tuple(
+        int(pct) / 100 for pct in _INSPIRATION_CHANCE_RE.findall(effect)
+    )
+    return bonuses
+
+
+def _build_bird_registry(all_birds):
+    """Index species by scientific name. The first entry wins, as with a linear scan."""
+    registry = {}
+    for species in all_birds:
+        name = species.get("scientificName")
+        if name in registry:
+            continue
+        registry[name] = {
+            "species": species,
+            "effect": species.get("effect", ""),
+            "bonuses": parse_bird_effect(species.get("effect", "")),
+        }
+    return registry
+
+
+async def get_bird_registry():
+    """scientificName -> {species, effect, bonuses}, rebuilt once per species cache generation."""
+    global _bird_registry
+    if _bird_registry is None:
+        _bird_registry = _build_bird_registry(await load_bird_species())
+    return _bird_registry
+
+
+def get_bird_registry_sync():
+    global _bird_registry_sync
+    if _bird_registry_sync is None:
+        _bird_registry_sync = _build_bird_registry(load_bird_species_sync())
+    return _bird_registry_sync
+
+
 async def get_bird_effect(scientific_name):
-    all_birds = await load_bird_species()
-    for b in all_birds:
-        if b.get("scientificName") == scientific_name:
-            return b.get("effect", "")
-    return ""
+    entry = (await get_bird_registry()).get(scientific_name)
+    return entry["effect"] if entry else ""
 
 
 def get_bird_effect_sync(scientific_name):
-    all_birds = load_bird_species_sync()
-    for b in all_birds:
-        if b.get("scientificName") == scientific_name:
-            return b.get("effect", "")
-    return ""
+    entry = get_bird_registry_sync().get(scientific_name)
+    return entry["effect"] if entry else ""
+
+
+async def _sum_bird_bonus(birds, kind):
+    registry = await get_bird_registry()
+    total = 0
+    for bird in birds:
+        entry = registry.get(bird["scientific_name"])
+        if entry:
+            total += entry["bonuses"][kind]
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Hatch sampling (cumulative weights + sparse prayer deltas)
+# ---------------------------------------------------------------------------
+
+def _build_bird_sampler(all_birds):
+    weights = [species.get("rarityWeight", 1) for species in all_birds]
+    index = {}
+    for i, species in enumerate(all_birds):
+        index.setdefault(species.get("scientificName"), i)
+    return {
+        "species": all_birds,
+        "weights": weights,
+        "cumulative": list(itertools.accumulate(weights)),
+        "total": sum(weights),
+        "index": index,
+    }
+
+
+async def get_bird_sampler():
+    """Cumulative rarity weights over all species, rebuilt once per species cache generation."""
+    global _bird_sampler
+    if _bird_sampler is None:
+        _bird_sampler = _build_bird_sampler(await load_bird_species())
+    return _bird_sampler
+
+
+def _prayer_deltas(sampler, multipliers):
+    """Extra weight each prayed-for species adds on top of its base rarity weight.
+
+    Returns None if any multiplier shrinks a weight, since that can't be expressed as an addition.
+    """
+    deltas = []
+    for scientific_name, multiplier in (multipliers or {}).items():
+        i = sampler["index"].get(scientific_name)
+        if i is None:
+            continue
+        delta = sampler["weights"][i] * (multiplier - 1)
+        if delta < 0:
+            return None
+        if delta > 0:
+            deltas.append((i, delta))
+    return deltas
+
+
+def _weighted_choice(sampler, multipliers):
+    """Full rebuild of the weights, only needed for multipliers below 1."""
+    weights = [
+        w * multipliers.get(species.get("scientificName"), 1)
+        for species, w in zip(sampler["species"], sampler["weights"])
+    ]
+    return random.choices(sampler["species"], weights=weights, k=1)[0]
 
 
 async def select_random_bird_species(multipliers=None):
-    all_birds = await load_bird_species()
+    sampler = await get_bird_sampler()
+    all_birds = sampler["species"]
     if not all_birds:
         return None
 
-    weights = []
-    for species in all_birds:
-        base_weight = species.get("rarityWeight", 1)
-        if multipliers and species.get("scientificName") in multipliers:
-            weights.append(base_weight * multipliers[species["scientificName"]])
-        else:
-            weights.append(base_weight)
-
-    return random.choices(all_birds, weights=weights, k=1)[0]
+    deltas = _prayer_deltas(sampler, multipliers)
+    if deltas is None:
+        return _weighted_choice(sampler, multipliers)
+
+    total = sampler["total"] + sum(delta for _, delta in deltas)
+    if total <= 0:
+        return random.choice(all_birds)
+
+    # Draw from [0, total): the base range maps through the cumulative array,
+    # anything past it lands in one of the (few) prayer deltas
+    r = random.random() * total
+    if r < sampler["total"] or not deltas:
+        i = bisect.bisect_right(sampler["cumulative"], r)
+        return all_birds[min(i, len(all_birds) - 1)]
+    r -= sampler["total"]
+    for i, delta in deltas:
+        if r < delta:
+            return all_birds[i]
+        r -= delta
+    return all_birds[deltas[-1][0]]
+
+
+async def get_hatch_chances(scientific_name, multipliers=None):
+    """Return (base_chance, current_chance) for a species as fractions, using the same
+    weights select_random_bird_species draws from."""
+    sampler = await get_bird_sampler()
+    i = sampler["index"].get(scientific_name)
+    if i is None or sampler["total"] <= 0:
+        return 0.0, 0.0
+    multipliers = multipliers or {}
+    base_weight = sampler["weights"][i]
+
+    deltas = _prayer_deltas(sampler, multipliers)
+    if deltas is None:
+        total = sum(
+            w * multipliers.get(species.get("scientificName"), 1)
+            for species, w in zip(sampler["species"], sampler["weights"])
+        )
+    else:
+        total = sampler["total"] + sum(delta for _, delta in deltas)
+    target = base_weight * multipliers.get(scientific_name, 1)
+    current = target / total if total > 0 else 0.0
+    return base_weight / sampler["total"], current
 
 
 # ---------------------------------------------------------------------------
 # Discovered species (computed from DB)
 # ---------------------------------------------------------------------------
 
+_SPECIES_COLUMNS = "id, common_name, scientific_name"
+
+
 async def get_discovered_species():
     """Retrieve all unique bird species discovered by all players."""
     discovered = set()
-    all_birds = await db.get_all_birds()
-    for bird in all_birds:
+    async for bird in db.iter_all_birds(_SPECIES_COLUMNS):
         discovered.add((bird["common_name"], bird["scientific_name"]))
-    released = await db.get_released_birds()
-    for bird in released:
+    async for bird in db.iter_released_birds(_SPECIES_COLUMNS):
         discovered.add((bird["common_name"], bird["scientific_name"]))
     return discovered
 
 
 def get_discovered_species_sync():
     discovered = set()
-    all_birds = db.get_all_birds_sync()
-    for bird in all_birds:
+    for bird in db.iter_all_birds_sync(_SPECIES_COLUMNS):
         discovered.add((bird["common_name"], bird["scientific_name"]))
-    released = db.get_released_birds_sync()
-    for bird in released:
+    for bird in db.iter_released_birds_sync(_SPECIES_COLUMNS):
         discovered.add((bird["common_name"], bird["scientific_name"]))
     return discovered
 
@@ -297,16 +443,14 @@ def get_discovered_species_count_sync():
 
 async def get_discovered_plants():
     discovered = set()
-    all_plants = await db.get_all_plants()
-    for plant in all_plants:
+    async for plant in db.iter_all_plants(_SPECIES_COLUMNS):
         discovered.add((plant["common_name"], plant["scientific_name"]))
     return discovered
 
 
 def get_discovered_plants_sync():
     discovered = set()
-    all_plants = db.get_all_plants_sync()
-    for plant in all_plants:
+    for plant in db.iter_all_plants_sync(_SPECIES_COLUMNS):
         discovered.add((plant["common_name"], plant["scientific_name"]))
     return discovered
 
@@ -337,25 +481,12 @@ async def get_nest_building_bonus(user_id, birds):
     """Calculate building bonus from birds that give first-build-of-day bonuses."""
     if not await is_first_action_of_any_type(user_id, ["build", "build_common"]):
         return 0
-
-    total_bonus = 0
-    for bird in birds:
-        effect = await get_bird_effect(bird["scientific_name"])
-        if "Your first nest-building action of the day gives" in effect:
-            bonus_amount = int(''.join(filter(str.isdigit, effect)))
-            total_bonus += bonus_amount
-    return total_bonus
+    return await _sum_bird_bonus(birds, "build")
 
 
 async def get_singing_bonus(birds):
     """Calculate total singing bonus from birds with song-enhancing effects."""
-    total_bonus = 0
-    for bird in birds:
-        effect = await get_bird_effect(bird["scientific_name"])
-        if "All your songs give" in effect:
-            bonus_amount = int(''.join(filter(str.isdigit, effect)))
-            total_bonus += bonus_amount
-    return total_bonus
+    return await _sum_bird_bonus(birds, "song")
 
 
 async def get_singing_inspiration_chance(user_id, birds):
@@ -363,14 +494,14 @@ async def get_singing_inspiration_chance(user_id, birds):
     if not await is_first_action_of_type(user_id, "sing"):
         return 0
 
+    registry = await get_bird_registry()
     inspiration_chances = 0
     for bird in birds:
-        effect = await get_bird_effect(bird["scientific_name"])
-        if "has a 50% chance to give you +1 inspiration" in effect:
-            if random.random() < 0.5:
-                inspiration_chances += 1
-        if "has a 90% chance to give you +1 inspiration" in effect:
-            if random.random() < 0.9:
+        entry = registry.get(bird["scientific_name"])
+        if not entry:
+            continue
+        for chance in entry["bonuses"]["inspiration_chances"]:
+            if random.random() < chance:
                 inspiration_chances += 1
     return inspiration_chances
 
@@ -379,31 +510,14 @@ async def get_seed_gathering_bonus(user_id, birds):
     """Calculate garden size bonus from birds that give first-gather-of-day bonuses."""
     if not await is_first_action_of_any_type(user_id, ["seed", "seed_common"]):
         return 0
-
-    total_bonus = 0
-    for bird in birds:
-        effect = await get_bird_effect(bird["scientific_name"])
-        if "Your first seed gathering action of the day also gives" in effect:
-            bonus_amount = int(''.join(filter(str.isdigit, effect)))
-            total_bonus += bonus_amount
-    return total_bonus
+    return await _sum_bird_bonus(birds, "seed_garden")
 
 
 async def get_swooping_bonus(user_id, birds):
     """Get the bonus swooping damage from birds that boost swooping."""
     if not await is_first_action_of_type(user_id, "swoop"):
         return 0
-
-    bonus = 0
-    for bird in birds:
-        effect = (await get_bird_effect(bird["scientific_name"])).lower()
-        if "your first swoop" in effect and "more effective" in effect:
-            try:
-                this_bonus = int(''.join(filter(str.isdigit, effect)))
-                bonus += this_bonus
-            except ValueError:
-                continue
-    return bonus
+    return await _sum_bird_bonus(birds, "swoop")
 
 
 # ---------------------------------------------------------------------------
@@ -452,11 +566,7 @@ def _load_plant_species_json():
         return json.load(f)
 
 
-async def load_plant_species(include_manifested=True):
-    base = _load_plant_species_json()
-    if not include_manifested:
-        return base
-    manifested = await db.load_manifested_plants()
+def _normalize_manifested_plants(manifested):
     fully = [p for p in manifested if p.get("fully_manifested", False)]
     for p in fully:
         p.setdefault("commonName", p.get("common_name", ""))
@@ -465,61 +575,107 @@ async def load_plant_species(include_manifested=True):
         p.setdefault("seedCost", p.get("seed_cost", 30))
         p.setdefault("sizeCost", p.get("size_cost", 1))
         p.setdefault("inspirationCost", p.get("inspiration_cost", 0.2))
-    return base + fully
+    return fully
+
+
+_PERCENT_RE = re.compile(r'([0-9]*\.?[0-9]+)%')
+
+
+def _effect_percentage(effect, marker):
+    """The first percentage in an effect text, if the effect mentions marker."""
+    if marker not in effect:
+        return 0
+    match = _PERCENT_RE.search(effect)
+    return float(match.group(1)) if match else 0
+
+
+def _build_plant_registry(all_plants):
+    """Index plant species by commonName with their percentage effects pre-parsed."""
+    registry = {}
+    for plant in all_plants:
+        name = plant.get("commonName")
+        if name in registry:
+            continue
+        effect = plant.get("effect", "")
+        registry[name] = {
+            "species": plant,
+            "effect": effect,
+            "less_brood_chance": _effect_percentage(effect, "chance of your eggs needing one less brood"),
+            "extra_bird_chance": _effect_percentage(effect, "chance of your eggs hatching an extra bird"),
+        }
+    return registry
+
+
+# (generation, species list, registry) tuples, rebuilt when the manifested plants generation moves
+_plant_species_cache = None
+_plant_species_cache_sync = None
+
+
+def clear_plant_species_cache():
+    """Clear both async and sync plant species caches."""
+    global _plant_species_cache, _plant_species_cache_sync
+    _plant_species_cache = None
+    _plant_species_cache_sync = None
+
+
+async def _get_plant_species_cache():
+    global _plant_species_cache
+    generation = db.manifested_plants_generation()
+    if _plant_species_cache is None or _plant_species_cache[0] != generation:
+        plants = _load_plant_species_json() + _normalize_manifested_plants(await db.load_manifested_plants())
+        _plant_species_cache = (generation, plants, _build_plant_registry(plants))
+    return _plant_species_cache
+
+
+def _get_plant_species_cache_sync():
+    global _plant_species_cache_sync
+    generation = db.manifested_plants_generation()
+    if _plant_species_cache_sync is None or _plant_species_cache_sync[0] != generation:
+        plants = _load_plant_species_json() + _normalize_manifested_plants(db.load_manifested_plants_sync())
+        _plant_species_cache_sync = (generation, plants, _build_plant_registry(plants))
+    return _plant_species_cache_sync
+
+
+async def load_plant_species(include_manifested=True):
+    if not include_manifested:
+        return _load_plant_species_json()
+    return (await _get_plant_species_cache())[1]
 
 
 def load_plant_species_sync(include_manifested=True):
-    base = _load_plant_species_json()
     if not include_manifested:
-        return base
-    manifested = db.load_manifested_plants_sync()
-    fully = [p for p in manifested if p.get("fully_manifested", False)]
-    for p in fully:
-        p.setdefault("commonName", p.get("common_name", ""))
-        p.setdefault("scientificName", p.get("scientific_name", ""))
-        p.setdefault("rarityWeight", p.get("rarity_weight", 0))
-        p.setdefault("seedCost", p.get("seed_cost", 30))
-        p.setdefault("sizeCost", p.get("size_cost", 1))
-        p.setdefault("inspirationCost", p.get("inspiration_cost", 0.2))
-    return base + fully
+        return _load_plant_species_json()
+    return _get_plant_species_cache_sync()[1]
+
+
+async def get_plant_registry():
+    """commonName -> {species, effect, less_brood_chance, extra_bird_chance}."""
+    return (await _get_plant_species_cache())[2]
 
 
 async def get_plant_effect(common_name):
-    plants = await load_plant_species()
-    for p in plants:
-        if p.get("commonName") == common_name:
-            return p.get("effect", "")
-    return ""
+    entry = (await get_plant_registry()).get(common_name)
+    return entry["effect"] if entry else ""
 
 
-async def get_less_brood_chance(plants):
-    """Calculate the total chance of needing one less brood from plants list."""
+async def _sum_plant_chance(plants, kind):
+    registry = await get_plant_registry()
     total_chance = 0
-    all_plant_species = await load_plant_species()
-    plant_effects = {p["commonName"]: p.get("effect", "") for p in all_plant_species}
-
     for plant in plants:
-        effect = plant_effects.get(plant["common_name"], "")
-        if "chance of your eggs needing one less brood" in effect:
-            match = re.search(r'([0-9]*\.?[0-9]+)%', effect)
-            if match:
-                total_chance += float(match.group(1))
+        entry = registry.get(plant["common_name"])
+        if entry:
+            total_chance += entry[kind]
     return total_chance
 
 
+async def get_less_brood_chance(plants):
+    """Calculate the total chance of needing one less brood from plants list."""
+    return await _sum_plant_chance(plants, "less_brood_chance")
+
+
 async def get_extra_bird_chance(plants):
     """Calculate the total chance of hatching an extra bird from plants list."""
-    total_chance = 0
-    all_plant_species = await load_plant_species()
-    plant_effects = {p["commonName"]: p.get("effect", "") for p in all_plant_species}
-
-    for plant in plants:
-        effect = plant_effects.get(plant["common_name"], "")
-        if "chance of your eggs hatching an extra bird" in effect:
-            match = re.search(r'([0-9]*\.?[0-9]+)%', effect)
-            if match:
-                total_chance += float(match.group(1))
-    return total_chance
+    return await _sum_plant_chance(plants, "extra_bird_chance")
 
 
 # ---------------------------------------------------------------------------
@@ -536,98 +692,84 @@ def _get_milestone_type(entity):
     return entity.get("milestone", "")
 
 
-async def get_extra_garden_space():
-    research_progress = await db.load_research_progress()
-    research_entities = db.load_all_research_entities()
-    thresholds = _get_milestone_thresholds()
+# Milestone texts that grant in-game bonuses, keyed by snapshot field
+_MILESTONE_BONUSES = {
+    "extra_garden_space": "+1 Max Garden Size",
+    "extra_bird_space": "+1 Bird Limit",
+    "prayer_milestones": "Prayers are 1% more effective. Compounding!",
+}
 
-    extra_space = 0
-    for entity in research_entities:
-        author_name = entity["author"]
-        current_progress = research_progress.get(author_name, 0)
-        if "+1 Max Garden Size" not in _get_milestone_type(entity):
-            continue
-        for threshold in thresholds:
-            if current_progress >= threshold:
-                extra_space += 1
-            else:
-                break
-    return extra_space
+_milestone_authors = None
+# (research generation, snapshot dict)
+_milestone_snapshot = None
 
 
-def get_extra_garden_space_sync():
-    research_progress = db.load_research_progress_sync()
-    research_entities = db.load_all_research_entities()
+def clear_milestone_snapshot():
+    """Forget the cached milestone bonuses (and the research entities they were built from)."""
+    global _milestone_snapshot, _milestone_authors
+    _milestone_snapshot = None
+    _milestone_authors = None
+
+
+def _get_milestone_authors():
+    """Author of every research entity whose milestone grants a bonus, per bonus.
+
+    Authors repeated across event files are listed once per entity, as each entity counts.
+    """
+    global _milestone_authors
+    if _milestone_authors is None:
+        authors = {field: [] for field in _MILESTONE_BONUSES}
+        for entity in db.load_all_research_entities():
+            milestone = _get_milestone_type(entity)
+            for field, text in _MILESTONE_BONUSES.items():
+                if text in milestone:
+                    authors[field].append(entity["author"])
+        _milestone_authors = authors
+    return _milestone_authors
+
+
+def _build_milestone_snapshot(research_progress):
     thresholds = _get_milestone_thresholds()
+    snapshot = {}
+    for field, authors in _get_milestone_authors().items():
+        snapshot[field] = sum(
+            bisect.bisect_right(thresholds, research_progress.get(author, 0)) for author in authors
+        )
+    return snapshot
+
+
+async def get_milestone_snapshot():
+    """Milestones reached per bonus, rebuilt only after research progress changes."""
+    global _milestone_snapshot
+    generation = db.research_progress_generation()
+    if _milestone_snapshot is None or _milestone_snapshot[0] != generation:
+        _milestone_snapshot = (generation, _build_milestone_snapshot(await db.load_research_progress()))
+    return _milestone_snapshot[1]
 
-    extra_space = 0
-    for entity in research_entities:
-        author_name = entity["author"]
-        current_progress = research_progress.get(author_name, 0)
-        if "+1 Max Garden Size" not in _get_milestone_type(entity):
-            continue
-        for threshold in thresholds:
-            if current_progress >= threshold:
-                extra_space += 1
-            else:
-                break
-    return extra_space
+
+def get_milestone_snapshot_sync():
+    global _milestone_snapshot
+    generation = db.research_progress_generation()
+    if _milestone_snapshot is None or _milestone_snapshot[0] != generation:
+        _milestone_snapshot = (generation, _build_milestone_snapshot(db.load_research_progress_sync()))
+    return _milestone_snapshot[1]
+
+
+async def get_extra_garden_space():
+    return (await get_milestone_snapshot())["extra_garden_space"]
+
+
+def get_extra_garden_space_sync():
+    return get_milestone_snapshot_sync()["extra_garden_space"]
 
 
 async def get_prayer_effectiveness_bonus():
-    research_progress = await db.load_research_progress()
-    research_entities = db.load_all_research_entities()
-    thresholds = _get_milestone_thresholds()
-    prayer_exponent = 1.0
-    bonus_string = "Prayers are 1% more effective. Compounding!"
-
-    for entity in research_entities:
-        if bonus_string in _get_milestone_type(entity):
-            author_name = entity["author"]
-            current_progress = research_progress.get(author_name, 0)
-            milestones_reached = 0
-            for threshold in thresholds:
-                if current_progress >= threshold:
-                    milestones_reached += 1
-                else:
-                    break
-            prayer_exponent += (milestones_reached * 0.01)
-    return prayer_exponent
+    return 1.0 + (await get_milestone_snapshot())["prayer_milestones"] * 0.01
 
 
 async def get_extra_bird_space():
-    research_progress = await db.load_research_progress()
-    research_entities = db.load_all_research_entities()
-    thresholds = _get_milestone_thresholds()
-
-    extra_space = 0
-    for entity in research_entities:
-        author_name = entity["author"]
-        current_progress = research_progress.get(author_name, 0)
-        if "+1 Bird Limit" not in _get_milestone_type(entity):
-            continue
-        for threshold in thresholds:
-            if current_progress >= threshold:
-                extra_space += 1
-            else:
-                break
-    return extra_space
+    return (await get_milestone_snapshot())["extra_bird_space"]
 
 
 def get_extra_bird_space_sync():
-    research_progress = db.load_research_progress_sync()
-    research_entities = db.load_all_research_entities()
-    thresholds = _get_milestone_thresholds()
-
-    extra_space = 0
-    for entity in research_entities:
-        author_name = entity["author"]
-        current_progress = research_progress.get(author_name, 0)
-        if "+1 Bird Limit" not in _get_milestone_type(entity):
-            continue
-        for threshold in thresholds:
-            if current_progress >= threshold:
-                extra_space += 1
-            else:
-                break
-    return extra_space
+    return get_milestone_snapshot_sync()["extra_bird_space"]
@@ -8,11 +8,16 @@ Reference data loaders (bird_species.json, plant_species.json, etc.) remain as l
 import os
 import io
 import json
+import copy
 import uuid
+import time
 import asyncio
+import threading
+import contextlib
+import contextvars
 import glob as glob_module
 from utils.logging import log_debug
-from config.config import DATA_PATH, BIRDWATCH_MAX_DIMENSION, BIRDWATCH_JPEG_QUALITY
+from config.config import DATA_PATH, BIRDWATCH_MAX_DIMENSION, BIRDWATCH_JPEG_QUALITY, BULK_FETCH_CHUNK_SIZE, MAX_GARDEN_SIZE, BROOD_INDEX_REFRESH_SECONDS
 
 # ---------------------------------------------------------------------------
 # Reference data loaders (read-only JSON bundled with code)
@@ -98,6 +103,304 @@ def _sync_client():
     return get_sync_client()
 
 
+# ---------------------------------------------------------------------------
+# Unit of work (per-interaction read memo)
+# ---------------------------------------------------------------------------
+#
+# A single slash command typically reads the same player, birds and daily_actions
+# rows several times (checks, remaining actions, consume_actions, the footer).
+# While a unit of work is open, those async reads are memoized in a dict held by
+# a contextvar, and the matching write functions below invalidate or refresh them.
+# Subtasks started with asyncio.gather share the same dict.
+
+_unit_of_work = contextvars.ContextVar("unit_of_work", default=None)
+_MISSING = object()
+
+
+def begin_unit_of_work():
+    """Start a fresh read memo for the current task (e.g. one Discord interaction)."""
+    _unit_of_work.set({})
+
+
+@contextlib.contextmanager
+def unit_of_work():
+    """Context manager that memoizes player/bird/daily-action reads until exit."""
+    token = _unit_of_work.set({})
+    try:
+        yield
+    finally:
+        _unit_of_work.reset(token)
+
+
+def _memo_get(key):
+    memo = _unit_of_work.get()
+    if memo is None or key not in memo:
+        return _MISSING
+    return copy.deepcopy(memo[key])
+
+
+def _memo_put(key, value):
+    memo = _unit_of_work.get()
+    if memo is not None:
+        memo[key] = copy.deepcopy(value)
+    return value
+
+
+def _memo_invalidate(table, user_id=None):
+    """Drop memoized reads for a table, optionally only for one user."""
+    memo = _unit_of_work.get()
+    if not memo:
+        return
+    stale = [k for k in memo if k[0] == table and (user_id is None or k[1] == str(user_id))]
+    for key in stale:
+        del memo[key]
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination (bulk reads in chunks instead of one capped response)
+# ---------------------------------------------------------------------------
+#
+# Filters are (method, column, value) tuples applied to the query builder,
+# e.g. ("gte", "song_date", "2026-01-01"). The key column must be selected.
+# "in_" filters go in the URL, so their value lists are kept to _IN_FILTER_CHUNK_SIZE.
+# Paging only stops on an empty page: PostgREST's max-rows may cap a page below
+# chunk_size, so a short page doesn't mean the table is exhausted.
+
+_IN_FILTER_CHUNK_SIZE = 200
+
+def _page_query(sb, table, columns, key, filters, last_key, chunk_size):
+    query = sb.table(table).select(columns)
+    for method, column, value in filters or ():
+        query = getattr(query, method)(column, value)
+    if last_key is not None:
+        query = query.gt(key, last_key)
+    return query.order(key).limit(chunk_size)
+
+
+def iter_table_sync(table, columns="*", key="id", filters=None, chunk_size=None):
+    """Yield every row of a table, paging by its primary key."""
+    chunk_size = chunk_size or BULK_FETCH_CHUNK_SIZE
+    sb = _sync_client()
+    last_key = None
+    while True:
+        rows = _page_query(sb, table, columns, key, filters, last_key, chunk_size).execute().data or []
+        if not rows:
+            return
+        yield from rows
+        last_key = rows[-1][key]
+
+
+async def iter_table(table, columns="*", key="id", filters=None, chunk_size=None):
+    """Async-generator twin of iter_table_sync."""
+    chunk_size = chunk_size or BULK_FETCH_CHUNK_SIZE
+    sb = await _client()
+    last_key = None
+    while True:
+        res = await _page_query(sb, table, columns, key, filters, last_key, chunk_size).execute()
+        rows = res.data or []
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        last_key = rows[-1][key]
+
+
+# ---------------------------------------------------------------------------
+# Broodable-targets index
+# ---------------------------------------------------------------------------
+#
+# /brood_all and /brood_random need every player with an egg, whether their nest
+# is locked and how many birds they hold. Instead of reloading players, eggs and
+# birds per command, the index is built once from bulk reads and kept current by
+# the player, egg and bird write functions below. A write for a user the index
+# doesn't know drops it, and it is rebuilt every BROOD_INDEX_REFRESH_SECONDS to
+# pick up writes made outside this process. The Flask thread writes through the
+# _sync functions too, so every read and write of the index holds _brood_lock.
+#
+# Writes that land while a build is reading the tables are queued in _brood_pending
+# and replayed onto the built index, so it can be trusted straight away. They all
+# set absolute values, so replaying one the reads already saw is harmless. Bird
+# count deltas are the exception: one made while the birds are being counted may
+# or may not have been counted, so only that (and an explicit clear) makes the
+# build untrusted.
+
+_brood_index = None          # user_id -> {"player": {user_id, nest_name, locked}, "egg": row or None, "bird_count": int}
+_brood_egg_holders = set()   # user_ids in the index that currently have an egg
+_brood_index_built_at = 0.0
+_brood_index_generation = 0  # bumped by writes a running build can't account for
+_brood_pending = None        # while a build runs: [(user_id, apply, create)] to replay onto it
+_brood_counting_birds = False
+_brood_build_task = None
+_BROOD_PLAYER_FIELDS = ("user_id", "nest_name", "locked")
+_BROOD_EGG_COLUMNS = "user_id, brooding_progress, protected_prayers"
+_brood_lock = threading.RLock()  # re-entrant: _brood_entry may call clear_brood_index
+
+
+def clear_brood_index():
+    """Drop the index; the next lookup rebuilds it."""
+    global _brood_index, _brood_index_built_at, _brood_index_generation
+    with _brood_lock:
+        _brood_index = None
+        _brood_egg_holders.clear()
+        _brood_index_built_at = 0.0
+        _brood_index_generation += 1
+
+
+def _brood_entry(user_id):
+    """The index entry for a user, or None (dropping the index) if it's unknown.
+
+    Callers must hold _brood_lock while they use the entry. While a build runs the
+    index is left alone: the build picks the user up, or replaying the write fails.
+    """
+    if _brood_index is None:
+        return None
+    entry = _brood_index.get(str(user_id))
+    if entry is None and _brood_pending is None:
+        clear_brood_index()
+    return entry
+
+
+def _new_brood_entry(user_id):
+    return {"player": {"user_id": user_id}, "egg": None, "bird_count": 0}
+
+
+def _brood_write(user_id, apply, create=False):
+    """Apply a write to a user's entry now, and again to the index being built, if any.
+
+    apply(entry) must set absolute values. With create, a missing entry is added
+    instead of dropping the index.
+    """
+    user_id = str(user_id)
+    with _brood_lock:
+        if _brood_pending is not None:
+            _brood_pending.append((user_id, apply, create))
+        if create and _brood_index is not None:
+            _brood_index.setdefault(user_id, _new_brood_entry(user_id))
+        entry = _brood_entry(user_id)
+        if entry is None:
+            return
+        apply(entry)
+        if entry["egg"] is None:
+            _brood_egg_holders.discard(user_id)
+        else:
+            _brood_egg_holders.add(user_id)
+
+
+def _brood_index_put_player(row):
+    player = {k: row.get(k) for k in _BROOD_PLAYER_FIELDS}
+    _brood_write(row["user_id"], lambda entry: entry["player"].update(player), create=True)
+
+
+def _brood_index_update_player(user_id, fields):
+    player = {k: v for k, v in fields.items() if k in _BROOD_PLAYER_FIELDS}
+    _brood_write(user_id, lambda entry: entry["player"].update(player))
+
+
+def _brood_index_set_egg(user_id, egg):
+    def apply(entry):
+        entry["egg"] = dict(egg) if egg is not None else None
+    _brood_write(user_id, apply)
+
+
+def _brood_index_update_egg(user_id, fields):
+    def apply(entry):
+        if entry["egg"] is not None:
+            entry["egg"].update({k: v for k, v in fields.items() if k in entry["egg"]})
+    _brood_write(user_id, apply)
+
+
+def _brood_index_set_birds(user_id, bird_count):
+    def apply(entry):
+        entry["bird_count"] = bird_count
+    _brood_write(user_id, apply)
+
+
+def _brood_index_add_birds(user_id, delta):
+    global _brood_index_generation
+    with _brood_lock:
+        if _brood_counting_birds:
+            _brood_index_generation += 1
+        entry = _brood_entry(user_id)
+        if entry is not None:
+            entry["bird_count"] = max(entry["bird_count"] + delta, 0)
+
+
+async def _build_brood_index():
+    global _brood_index, _brood_index_built_at, _brood_pending, _brood_counting_birds
+    with _brood_lock:
+        generation = _brood_index_generation
+        _brood_pending = []
+    index = {}
+    try:
+        async for row in iter_all_players(", ".join(_BROOD_PLAYER_FIELDS)):
+            index[str(row["user_id"])] = {"player": row, "egg": None, "bird_count": 0}
+        async for row in iter_table("eggs", _BROOD_EGG_COLUMNS, key="user_id"):
+            if row["user_id"] in index:
+                index[row["user_id"]]["egg"] = row
+        _brood_counting_birds = True
+        async for row in iter_all_birds("id, user_id"):
+            if row["user_id"] in index:
+                index[row["user_id"]]["bird_count"] += 1
+    finally:
+        with _brood_lock:
+            pending, _brood_pending, _brood_counting_birds = _brood_pending, None, False
+
+    with _brood_lock:
+        trusted = generation == _brood_index_generation
+        for user_id, apply, create in pending:
+            if create:
+                index.setdefault(user_id, _new_brood_entry(user_id))
+            if user_id in index:
+                apply(index[user_id])
+            else:
+                trusted = False  # a player the reads missed; the next lookup rebuilds
+        _brood_index = index
+        _brood_egg_holders.clear()
+        _brood_egg_holders.update(uid for uid, entry in index.items() if entry["egg"] is not None)
+        _brood_index_built_at = time.monotonic() if trusted else 0.0
+    log_debug(f"Built broodable-targets index: {len(index)} players, {len(_brood_egg_holders)} eggs")
+    return index
+
+
+def _rebuild_brood_index():
+    """Build the index, joining a build already in progress (they'd share _brood_pending)."""
+    global _brood_build_task
+    if _brood_build_task is None or _brood_build_task.done():
+        _brood_build_task = asyncio.ensure_future(_build_brood_index())
+    return asyncio.shield(_brood_build_task)
+
+
+async def get_broodable_targets(max_birds, allow_locked_user_id=None):
+    """Return [(player, egg)] for every egg whose nest is unlocked and holds fewer than max_birds.
+
+    player only carries user_id, nest_name and locked. allow_locked_user_id's own nest
+    is included even when locked. Order follows user_id.
+    """
+    allowed = str(allow_locked_user_id) if allow_locked_user_id is not None else None
+    with _brood_lock:
+        index = _brood_index
+        if index is not None and time.monotonic() - _brood_index_built_at > BROOD_INDEX_REFRESH_SECONDS:
+            index = None
+    if index is None:
+        # Use the index this build returned even if another thread drops it meanwhile
+        index = await _rebuild_brood_index()
+
+    targets = []
+    with _brood_lock:
+        if index is _brood_index:
+            holders = _brood_egg_holders
+        else:
+            holders = [uid for uid, entry in index.items() if entry["egg"] is not None]
+        for user_id in sorted(holders):
+            entry = index[user_id]
+            if entry["player"].get("locked") and user_id != allowed:
+                continue
+            if entry["bird_count"] >= max_birds:
+                continue
+            targets.append((dict(entry["player"]), dict(entry["egg"])))
+    return targets
+
+
 # ---------------------------------------------------------------------------
 # Players
 # ---------------------------------------------------------------------------
@@ -118,23 +421,32 @@ _DEFAULT_NEST = {
 async def load_player(user_id):
     """Load a player row, creating one if it doesn't exist. Returns a dict."""
     user_id = str(user_id)
+    cached = _memo_get(("players", user_id))
+    if cached is not _MISSING:
+        return cached
     sb = await _client()
     res = await sb.table("players").select("*").eq("user_id", user_id).execute()
     if res.data:
-        return res.data[0]
+        return _memo_put(("players", user_id), res.data[0])
     # Auto-create
     row = {"user_id": user_id, **_DEFAULT_NEST}
     await sb.table("players").insert(row).execute()
+    _brood_index_put_player(row)
     log_debug(f"Created new player: {user_id}")
-    return row
+    return _memo_put(("players", user_id), row)
 
 
 async def get_player(user_id):
     """Read-only player lookup. Returns dict or None. Does NOT auto-create."""
     user_id = str(user_id)
+    cached = _memo_get(("players", user_id))
+    if cached is not _MISSING:
+        return cached
     sb = await _client()
     res = await sb.table("players").select("*").eq("user_id", user_id).execute()
-    return res.data[0] if res.data else None
+    if not res.data:
+        return None
+    return _memo_put(("players", user_id), res.data[0])
 
 
 def load_player_sync(user_id):
@@ -145,6 +457,7 @@ def load_player_sync(user_id):
         return res.data[0]
     row = {"user_id": user_id, **_DEFAULT_NEST}
     sb.table("players").insert(row).execute()
+    _brood_index_put_player(row)
     return row
 
 
@@ -161,12 +474,37 @@ async def update_player(user_id, **fields):
     user_id = str(user_id)
     sb = await _client()
     await sb.table("players").update(fields).eq("user_id", user_id).execute()
+    _memo_invalidate("players", user_id)
+    _brood_index_update_player(user_id, fields)
+
+
+async def set_discord_usernames(usernames):
+    """Write {user_id: discord_username} for many existing players via the set_discord_usernames RPC.
+
+    Only existing rows are updated, so a player deleted since the names were read is
+    not recreated. Returns rows written.
+    """
+    names = {str(uid): name for uid, name in usernames.items()}
+    if not names:
+        return 0
+    sb = await _client()
+    items = list(names.items())
+    written = 0
+    for start in range(0, len(items), BULK_FETCH_CHUNK_SIZE):
+        res = await sb.rpc("set_discord_usernames", {
+            "p_names": dict(items[start:start + BULK_FETCH_CHUNK_SIZE]),
+        }).execute()
+        # RPC returns the number of rows updated as a scalar
+        written += res.data or 0
+    _memo_invalidate("players")
+    return written
 
 
 def update_player_sync(user_id, **fields):
     user_id = str(user_id)
     sb = _sync_client()
     sb.table("players").update(fields).eq("user_id", user_id).execute()
+    _brood_index_update_player(user_id, fields)
 
 
 async def increment_player_field(user_id, field, amount):
@@ -177,6 +515,7 @@ async def increment_player_field(user_id, field, amount):
         "field_name": field,
         "amount": amount,
     }).execute()
+    _memo_invalidate("players", user_id)
 
 
 def increment_player_field_sync(user_id, field, amount):
@@ -188,17 +527,47 @@ def increment_player_field_sync(user_id, field, amount):
     }).execute()
 
 
+async def increment_all_players_field(field, amount):
+    """Add amount to a numeric field for every player in one set-based RPC.
+
+    Seeds are capped by each nest's free space and garden_size by MAX_GARDEN_SIZE.
+    Returns the number of players changed.
+    """
+    sb = await _client()
+    res = await sb.rpc("increment_all_players_field", {
+        "field_name": field,
+        "amount": amount,
+        "p_max_garden_size": MAX_GARDEN_SIZE,
+    }).execute()
+    _memo_invalidate("players")
+    return res.data or 0
+
+
+def increment_all_players_field_sync(field, amount):
+    sb = _sync_client()
+    res = sb.rpc("increment_all_players_field", {
+        "field_name": field,
+        "amount": amount,
+        "p_max_garden_size": MAX_GARDEN_SIZE,
+    }).execute()
+    return res.data or 0
+
+
+def iter_all_players(columns="*"):
+    return iter_table("players", columns, key="user_id")
+
+
+def iter_all_players_sync(columns="*"):
+    return iter_table_sync("players", columns, key="user_id")
+
+
 async def load_all_players():
     """Load all player rows."""
-    sb = await _client()
-    res = await sb.table("players").select("*").limit(10000).execute()
-    return res.data or []
+    return [row async for row in iter_all_players()]
 
 
 def load_all_players_sync():
-    sb = _sync_client()
-    res = sb.table("players").select("*").limit(10000).execute()
-    return res.data or []
+    return list(iter_all_players_sync())
 
 
 # ---------------------------------------------------------------------------
@@ -239,9 +608,12 @@ def increment_common_nest_sync(field, amount):
 
 async def get_player_birds(user_id):
     """Return list of bird dicts for a player."""
+    cached = _memo_get(("player_birds", str(user_id)))
+    if cached is not _MISSING:
+        return cached
     sb = await _client()
     res = await sb.table("player_birds").select("*").eq("user_id", str(user_id)).execute()
-    return res.data or []
+    return _memo_put(("player_birds", str(user_id)), res.data or [])
 
 
 async def get_bird_counts_for_users(user_ids):
@@ -274,13 +646,21 @@ async def add_bird(user_id, common_name, scientific_name):
         "common_name": common_name,
         "scientific_name": scientific_name,
     }).execute()
+    _memo_invalidate("player_birds", user_id)
+    _brood_index_add_birds(user_id, 1)
     return res.data[0] if res.data else None
 
 
 async def remove_bird(bird_id):
     """Remove a bird by its DB id."""
     sb = await _client()
-    await sb.table("player_birds").delete().eq("id", bird_id).execute()
+    res = await sb.table("player_birds").delete().eq("id", bird_id).execute()
+    # Owner is unknown here, so drop every memoized bird list
+    _memo_invalidate("player_birds")
+    if res.data:
+        _brood_index_add_birds(res.data[0]["user_id"], -1)
+    else:
+        clear_brood_index()
 
 
 async def remove_bird_by_name(user_id, common_name):
@@ -291,6 +671,8 @@ async def remove_bird_by_name(user_id, common_name):
         return None
     bird = res.data[0]
     await sb.table("player_birds").delete().eq("id", bird["id"]).execute()
+    _memo_invalidate("player_birds", user_id)
+    _brood_index_add_birds(user_id, -1)
     return bird
 
 
@@ -298,6 +680,7 @@ async def update_bird_group(bird_id, group_name):
     """Set group_name on a bird row by its DB id."""
     sb = await _client()
     await sb.table("player_birds").update({"group_name": group_name}).eq("id", bird_id).execute()
+    _memo_invalidate("player_birds")
 
 
 async def clear_group_birds(user_id, group_name):
@@ -307,20 +690,44 @@ async def clear_group_birds(user_id, group_name):
     count = len(res.data or [])
     if count:
         await sb.table("player_birds").update({"group_name": None}).eq("user_id", str(user_id)).eq("group_name", group_name).execute()
+        _memo_invalidate("player_birds", user_id)
     return count
 
 
+def iter_all_birds(columns="*"):
+    return iter_table("player_birds", columns)
+
+
+def iter_all_birds_sync(columns="*"):
+    return iter_table_sync("player_birds", columns)
+
+
 async def get_all_birds():
     """Get all birds across all players."""
-    sb = await _client()
-    res = await sb.table("player_birds").select("*").limit(10000).execute()
-    return res.data or []
+    return [row async for row in iter_all_birds()]
 
 
 def get_all_birds_sync():
-    sb = _sync_client()
-    res = sb.table("player_birds").select("*").limit(10000).execute()
-    return res.data or []
+    return list(iter_all_birds_sync())
+
+
+async def get_active_player_species(since_date):
+    """Scientific names of birds owned by players who used actions on or after since_date."""
+    active = set()
+    async for row in iter_table("daily_actions", "id, user_id", filters=[("gte", "action_date", since_date)]):
+        active.add(row["user_id"])
+    if not active:
+        return []
+
+    # Only the active players' birds are read, a batch of owners per paged query
+    active = sorted(active)
+    species = set()
+    for start in range(0, len(active), _IN_FILTER_CHUNK_SIZE):
+        owners = active[start:start + _IN_FILTER_CHUNK_SIZE]
+        async for row in iter_table("player_birds", "id, scientific_name", filters=[("in_", "user_id", owners)]):
+            if row.get("scientific_name"):
+                species.add(row["scientific_name"])
+    return sorted(species)
 
 
 # ---------------------------------------------------------------------------
@@ -420,17 +827,21 @@ async def clear_group_plants(user_id, group_name):
     return count
 
 
+def iter_all_plants(columns="*", filters=None):
+    return iter_table("player_plants", columns, filters=filters)
+
+
+def iter_all_plants_sync(columns="*", filters=None):
+    return iter_table_sync("player_plants", columns, filters=filters)
+
+
 async def get_all_plants():
     """Get all plants across all players."""
-    sb = await _client()
-    res = await sb.table("player_plants").select("*").limit(10000).execute()
-    return res.data or []
+    return [row async for row in iter_all_plants()]
 
 
 def get_all_plants_sync():
-    sb = _sync_client()
-    res = sb.table("player_plants").select("*").limit(10000).execute()
-    return res.data or []
+    return list(iter_all_plants_sync())
 
 
 # ---------------------------------------------------------------------------
@@ -684,17 +1095,39 @@ async def create_egg(user_id, brooding_progress=0, protected_prayers=False):
         "brooding_progress": brooding_progress,
         "protected_prayers": protected_prayers,
     }).execute()
+    _brood_index_set_egg(user_id, {
+        "user_id": str(user_id),
+        "brooding_progress": brooding_progress,
+        "protected_prayers": protected_prayers,
+    })
 
 
 async def update_egg(user_id, **fields):
     sb = await _client()
     await sb.table("eggs").update(fields).eq("user_id", str(user_id)).execute()
+    _brood_index_update_egg(user_id, fields)
+
+
+async def increment_egg_progress(user_id, amount=1):
+    """Atomically add to an egg's brooding_progress. Returns the new progress, or None if there is no egg."""
+    sb = await _client()
+    res = await sb.rpc("increment_egg_progress", {
+        "p_user_id": str(user_id),
+        "p_amount": amount,
+    }).execute()
+    # RPC returns the new progress as a scalar
+    if res.data is None:
+        _brood_index_set_egg(user_id, None)
+        return None
+    _brood_index_update_egg(user_id, {"brooding_progress": res.data})
+    return res.data
 
 
 async def delete_egg(user_id):
     """Delete an egg and its related multipliers/brooders (cascade)."""
     sb = await _client()
     await sb.table("eggs").delete().eq("user_id", str(user_id)).execute()
+    _brood_index_set_egg(user_id, None)
 
 
 def get_egg_progress_sync(user_id):
@@ -723,32 +1156,91 @@ async def add_egg_brooder(user_id, brooder_user_id):
     }, on_conflict="egg_user_id,brooder_user_id").execute()
 
 
+async def hatch_egg(user_id, birds, saved_multipliers=None, new_egg_progress=0):
+    """Hatch a player's egg in one transactional RPC.
+
+    Inserts every bird in birds ({"commonName", "scientificName"} dicts) and deletes the egg.
+    If saved_multipliers is given, a new egg carrying them is laid at new_egg_progress.
+    Returns the player's new bird count, or None (writing nothing) if the player has no
+    egg at the hatch threshold any more.
+    """
+    sb = await _client()
+    res = await sb.rpc("hatch_egg", {
+        "p_user_id": str(user_id),
+        "p_birds": [
+            {"common_name": bird["commonName"], "scientific_name": bird["scientificName"]}
+            for bird in birds
+        ],
+        "p_new_egg_progress": new_egg_progress,
+        "p_multipliers": saved_multipliers or None,
+    }).execute()
+    _memo_invalidate("player_birds", user_id)
+    if res.data is None:
+        clear_brood_index()
+        return None
+    _brood_index_set_birds(user_id, res.data)
+    new_egg = None
+    if saved_multipliers:
+        new_egg = {"user_id": str(user_id), "brooding_progress": new_egg_progress, "protected_prayers": False}
+    _brood_index_set_egg(user_id, new_egg)
+    return res.data
+
+
 # ---------------------------------------------------------------------------
 # Daily Actions
 # ---------------------------------------------------------------------------
 
 async def get_daily_actions(user_id, action_date):
+    key = ("daily_actions", str(user_id), action_date)
+    cached = _memo_get(key)
+    if cached is not _MISSING:
+        return cached
     sb = await _client()
     res = await sb.table("daily_actions").select("*").eq("user_id", str(user_id)).eq("action_date", action_date).execute()
-    if res.data:
-        return res.data[0]
-    return None
+    return _memo_put(key, res.data[0] if res.data else None)
 
 
 async def upsert_daily_actions(user_id, action_date, used, action_history):
     sb = await _client()
-    await sb.table("daily_actions").upsert({
+    row = {
         "user_id": str(user_id),
         "action_date": action_date,
         "used": used,
         "action_history": action_history,
-    }, on_conflict="user_id,action_date").execute()
+    }
+    await sb.table("daily_actions").upsert(row, on_conflict="user_id,action_date").execute()
+    # The upsert writes every column we read back, so refresh the memo in place
+    _memo_put(("daily_actions", str(user_id), action_date), row)
+
+
+async def consume_actions(user_id, action_date, count, action_type, base_actions):
+    """Atomically check the daily budget and spend actions via RPC.
+
+    The budget is base_actions + bonus_actions + chick count - used. Bonus actions
+    are spent first and action_type (if given) is appended to action_history.
+    Returns (consumed, remaining) where remaining is the budget left afterwards.
+    """
+    sb = await _client()
+    res = await sb.rpc("consume_actions", {
+        "p_user_id": str(user_id),
+        "p_action_date": action_date,
+        "p_count": count,
+        "p_action_type": action_type,
+        "p_base_actions": base_actions,
+    }).execute()
+    _memo_invalidate("players", user_id)
+    _memo_invalidate("daily_actions", user_id)
+    if not res.data:
+        return False, 0
+    row = res.data[0]
+    return bool(row["consumed"]), int(row["remaining"])
 
 
 async def delete_old_daily_actions(cutoff_date):
     """Delete daily actions older than cutoff_date."""
     sb = await _client()
     await sb.table("daily_actions").delete().lt("action_date", cutoff_date).execute()
+    _memo_invalidate("daily_actions")
 
 
 def delete_old_daily_actions_sync(cutoff_date):
@@ -756,20 +1248,25 @@ def delete_old_daily_actions_sync(cutoff_date):
     sb.table("daily_actions").delete().lt("action_date", cutoff_date).execute()
 
 
+def iter_all_daily_actions_sync(since_date=None, columns="*"):
+    """Stream daily actions, optionally only those on or after since_date."""
+    filters = [("gte", "action_date", since_date)] if since_date else None
+    return iter_table_sync("daily_actions", columns, filters=filters)
+
+
 def get_all_daily_actions_sync(since_date=None):
-    """Get all daily actions, optionally filtered to on or after since_date."""
-    sb = _sync_client()
-    query = sb.table("daily_actions").select("*")
-    if since_date:
-        query = query.gte("action_date", since_date)
-    res = query.order("action_date", desc=True).limit(10000).execute()
-    return res.data or []
+    """Get all daily actions, optionally filtered to on or after since_date. Newest first."""
+    rows = list(iter_all_daily_actions_sync(since_date))
+    rows.sort(key=lambda r: r["action_date"], reverse=True)
+    return rows
+
+
+def iter_all_birdwatch_sightings_sync():
+    return iter_table_sync("birdwatch_sightings", "id, user_id, created_at")
 
 
 def get_all_birdwatch_sightings_unpaginated_sync():
-    sb = _sync_client()
-    res = sb.table("birdwatch_sightings").select("user_id, created_at").limit(10000).execute()
-    return res.data or []
+    return list(iter_all_birdwatch_sightings_sync())
 
 
 # ---------------------------------------------------------------------------
@@ -830,14 +1327,17 @@ async def get_all_songs_for_date(song_date):
     return res.data or []
 
 
+def iter_all_songs_sync(since_date=None, columns="*"):
+    """Stream songs, optionally only those on or after since_date."""
+    filters = [("gte", "song_date", since_date)] if since_date else None
+    return iter_table_sync("daily_songs", columns, filters=filters)
+
+
 def get_all_songs_sync(since_date=None):
-    """Get all songs, optionally filtered to on or after since_date."""
-    sb = _sync_client()
-    query = sb.table("daily_songs").select("*")
-    if since_date:
-        query = query.gte("song_date", since_date)
-    res = query.order("song_date", desc=True).limit(10000).execute()
-    return res.data or []
+    """Get all songs, optionally filtered to on or after since_date. Newest first."""
+    rows = list(iter_all_songs_sync(since_date))
+    rows.sort(key=lambda r: r["song_date"], reverse=True)
+    return rows
 
 
 async def delete_old_songs(cutoff_date):
@@ -863,6 +1363,35 @@ async def record_brooding(brooder_user_id, target_user_id, brooding_date):
     }, on_conflict="brooding_date,brooder_user_id,target_user_id").execute()
 
 
+async def brood_eggs(brooder_user_id, target_user_ids, brooding_date, max_broods, base_actions):
+    """Brood many eggs in one RPC: records the daily_brooding rows, bumps progress and adds the brooder.
+
+    Targets are tried in order until max_broods eggs are brooded or the brooder runs out
+    of actions; one "brood" action is spent per egg in the same transaction (budget as in
+    consume_actions). Eggs already at the hatch threshold, or already brooded by this user
+    today, are skipped without using up the budget.
+    Returns a dict of target_user_id -> new brooding_progress for the eggs actually brooded.
+    """
+    normalized_ids = [str(uid) for uid in target_user_ids]
+    if not normalized_ids or max_broods <= 0:
+        return {}
+
+    sb = await _client()
+    res = await sb.rpc("brood_eggs", {
+        "p_brooder_user_id": str(brooder_user_id),
+        "p_brooding_date": brooding_date,
+        "p_target_user_ids": normalized_ids,
+        "p_max_broods": max_broods,
+        "p_base_actions": base_actions,
+    }).execute()
+    _memo_invalidate("players", brooder_user_id)
+    _memo_invalidate("daily_actions", brooder_user_id)
+    progress_by_user = {row["target_user_id"]: row["brooding_progress"] for row in (res.data or [])}
+    for target_user_id, progress in progress_by_user.items():
+        _brood_index_update_egg(target_user_id, {"brooding_progress": progress})
+    return progress_by_user
+
+
 async def get_brooded_targets_today(brooder_user_id, brooding_date, target_user_ids=None):
     """Return a set of target_user_id values brooded by this user on this date."""
     sb = await _client()
@@ -923,16 +1452,20 @@ async def set_last_song_targets(user_id, target_user_ids):
 # Released Birds
 # ---------------------------------------------------------------------------
 
+def iter_released_birds(columns="*"):
+    return iter_table("released_birds", columns)
+
+
+def iter_released_birds_sync(columns="*"):
+    return iter_table_sync("released_birds", columns)
+
+
 async def get_released_birds():
-    sb = await _client()
-    res = await sb.table("released_birds").select("*").limit(10000).execute()
-    return res.data or []
+    return [row async for row in iter_released_birds()]
 
 
 def get_released_birds_sync():
-    sb = _sync_client()
-    res = sb.table("released_birds").select("*").limit(10000).execute()
-    return res.data or []
+    return list(iter_released_birds_sync())
 
 
 async def upsert_released_bird(common_name, scientific_name):
@@ -1053,6 +1586,15 @@ async def get_manifested_bird(scientific_name):
 # Manifested Plants
 # ---------------------------------------------------------------------------
 
+# Bumped whenever a plant becomes fully manifested, so species caches built from
+# the manifested_plants table know to rebuild
+_manifested_plants_generation = 0
+
+
+def manifested_plants_generation():
+    return _manifested_plants_generation
+
+
 async def load_manifested_plants():
     sb = await _client()
     res = await sb.table("manifested_plants").select("*").execute()
@@ -1067,8 +1609,11 @@ def load_manifested_plants_sync():
 
 async def upsert_manifested_plant(plant_data):
     """Upsert a manifested plant by scientific_name."""
+    global _manifested_plants_generation
     sb = await _client()
     await sb.table("manifested_plants").upsert(plant_data, on_conflict="scientific_name").execute()
+    if plant_data.get("fully_manifested"):
+        _manifested_plants_generation += 1
 
 
 async def get_manifested_plant(scientific_name):
@@ -1093,13 +1638,24 @@ def load_research_progress_sync():
     return {r["author_name"]: r["points"] for r in (res.data or {})}
 
 
+# Bumped on every research increment, so milestone snapshots built from
+# research_progress know to rebuild
+_research_progress_generation = 0
+
+
+def research_progress_generation():
+    return _research_progress_generation
+
+
 async def increment_research(author_name, points):
     """Atomically upsert research progress, incrementing points."""
+    global _research_progress_generation
     sb = await _client()
     await sb.rpc("increment_research_progress", {
         "p_author_name": author_name,
         "p_points": points,
     }).execute()
+    _research_progress_generation += 1
 
 
 # ---------------------------------------------------------------------------
@@ -1156,41 +1712,32 @@ async def remove_weather_channel(guild_id):
 # Bulk-fetch functions (for homepage performance)
 # ---------------------------------------------------------------------------
 
+def _group_by_user(rows):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(str(row["user_id"]), []).append(row)
+    return grouped
+
+
 def get_all_eggs_sync():
-    """Fetch all eggs in one query. Returns dict keyed by user_id."""
-    sb = _sync_client()
-    res = sb.table("eggs").select("user_id, brooding_progress").limit(10000).execute()
-    return {row["user_id"]: row["brooding_progress"] for row in (res.data or [])}
+    """Fetch all eggs. Returns dict keyed by user_id."""
+    rows = iter_table_sync("eggs", "user_id, brooding_progress", key="user_id")
+    return {row["user_id"]: row["brooding_progress"] for row in rows}
 
 
 def get_all_player_birds_sync():
     """Fetch all player birds. Returns dict of user_id -> list of birds."""
-    sb = _sync_client()
-    res = sb.table("player_birds").select("*").limit(10000).execute()
-    grouped = {}
-    for row in (res.data or []):
-        grouped.setdefault(str(row["user_id"]), []).append(row)
-    return grouped
+    return _group_by_user(iter_all_birds_sync())
 
 
 def get_all_player_plants_sync():
     """Fetch all player plants. Returns dict of user_id -> list of plants."""
-    sb = _sync_client()
-    res = sb.table("player_plants").select("*").limit(10000).execute()
-    grouped = {}
-    for row in (res.data or []):
-        grouped.setdefault(str(row["user_id"]), []).append(row)
-    return grouped
+    return _group_by_user(iter_all_plants_sync())
 
 
 def get_all_nest_treasures_sync():
     """Fetch all nest treasures. Returns dict of user_id -> list of decorations."""
-    sb = _sync_client()
-    res = sb.table("nest_treasures").select("*").limit(10000).execute()
-    grouped = {}
-    for row in (res.data or []):
-        grouped.setdefault(str(row["user_id"]), []).append(row)
-    return grouped
+    return _group_by_user(iter_table_sync("nest_treasures"))
 
 
 # ---------------------------------------------------------------------------
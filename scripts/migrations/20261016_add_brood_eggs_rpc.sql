@@ -0,0 +1,28 @@
+-- Add the brood_eggs RPC used by /brood_all.
+-- Safe to run multiple times (CREATE OR REPLACE).
+-- Batched brooding: for every target egg below the hatch threshold that this brooder
+-- hasn't brooded today, record the daily_brooding row, bump progress and add the brooder.
+-- Returns the new progress of each egg actually brooded.
+CREATE OR REPLACE FUNCTION brood_eggs(p_brooder_user_id TEXT, p_brooding_date TEXT, p_target_user_ids TEXT[])
+RETURNS TABLE(target_user_id TEXT, brooding_progress INTEGER) AS $$
+    WITH recorded AS (
+        INSERT INTO daily_brooding (brooding_date, brooder_user_id, target_user_id)
+        SELECT p_brooding_date, p_brooder_user_id, e.user_id
+        FROM eggs e
+        WHERE e.user_id = ANY(p_target_user_ids) AND e.brooding_progress < 10
+        ON CONFLICT (brooding_date, brooder_user_id, target_user_id) DO NOTHING
+        RETURNING daily_brooding.target_user_id
+    ),
+    bumped AS (
+        UPDATE eggs SET brooding_progress = eggs.brooding_progress + 1
+        FROM recorded
+        WHERE eggs.user_id = recorded.target_user_id
+        RETURNING eggs.user_id, eggs.brooding_progress
+    ),
+    brooders AS (
+        INSERT INTO egg_brooders (egg_user_id, brooder_user_id)
+        SELECT bumped.user_id, p_brooder_user_id FROM bumped
+        ON CONFLICT (egg_user_id, brooder_user_id) DO NOTHING
+    )
+    SELECT bumped.user_id, bumped.brooding_progress FROM bumped;
+$$ LANGUAGE sql;
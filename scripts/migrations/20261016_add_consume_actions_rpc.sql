@@ -0,0 +1,50 @@
+-- Add the consume_actions RPC used by data.models.record_actions.
+-- Safe to run multiple times (CREATE OR REPLACE).
+CREATE OR REPLACE FUNCTION consume_actions(
+    p_user_id TEXT, p_action_date TEXT, p_count INTEGER, p_action_type TEXT, p_base_actions INTEGER
+)
+RETURNS TABLE(consumed BOOLEAN, remaining INTEGER) AS $$
+DECLARE
+    v_bonus INTEGER;
+    v_chicks INTEGER;
+    v_used INTEGER;
+    v_available INTEGER;
+    v_bonus_to_use INTEGER;
+BEGIN
+    -- Row lock serializes concurrent commands for the same player
+    SELECT GREATEST(COALESCE(bonus_actions, 0), 0) INTO v_bonus
+    FROM players WHERE user_id = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT FALSE, 0;
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO v_chicks FROM player_birds WHERE user_id = p_user_id;
+    SELECT COALESCE(MAX(used), 0) INTO v_used
+    FROM daily_actions WHERE user_id = p_user_id AND action_date = p_action_date;
+    v_available := p_base_actions + v_bonus + v_chicks - v_used;
+
+    IF p_count > v_available THEN
+        RETURN QUERY SELECT FALSE, v_available;
+        RETURN;
+    END IF;
+
+    v_bonus_to_use := LEAST(p_count, v_bonus);
+    IF v_bonus_to_use > 0 THEN
+        UPDATE players SET bonus_actions = bonus_actions - v_bonus_to_use, updated_at = now()
+        WHERE user_id = p_user_id;
+    END IF;
+
+    INSERT INTO daily_actions (user_id, action_date, used, action_history)
+    VALUES (
+        p_user_id, p_action_date, p_count - v_bonus_to_use,
+        CASE WHEN p_action_type IS NULL OR p_count <= 0 THEN '{}'::TEXT[]
+             ELSE array_fill(p_action_type, ARRAY[p_count]) END
+    )
+    ON CONFLICT (user_id, action_date) DO UPDATE
+    SET used = daily_actions.used + EXCLUDED.used,
+        action_history = daily_actions.action_history || EXCLUDED.action_history;
+
+    RETURN QUERY SELECT TRUE, v_available - p_count;
+END;
+$$ LANGUAGE plpgsql;
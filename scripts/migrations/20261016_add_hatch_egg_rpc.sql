@@ -0,0 +1,32 @@
+-- Add the hatch_egg RPC used when brooding hatches an egg.
+-- Safe to run multiple times (CREATE OR REPLACE).
+-- Transactional hatch: delete the egg, add every hatched bird and, when prayers were
+-- preserved (p_multipliers not NULL), lay a new egg carrying them at p_new_egg_progress.
+-- Returns the owner's new bird count, or NULL (changing nothing) if the player has no egg
+-- at the hatch threshold, e.g. it already hatched and a fresh egg was laid since.
+CREATE OR REPLACE FUNCTION hatch_egg(p_user_id TEXT, p_birds JSONB, p_new_egg_progress INTEGER, p_multipliers JSONB)
+RETURNS INTEGER AS $$
+DECLARE v_count INTEGER;
+BEGIN
+    -- Deleting first locks the egg row, so a concurrent hatch of the same egg finds nothing.
+    -- A late or retried call must not hatch the egg laid after it, hence the progress check.
+    DELETE FROM eggs WHERE user_id = p_user_id AND brooding_progress >= 10;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO player_birds (user_id, common_name, scientific_name)
+    SELECT p_user_id, b->>'common_name', b->>'scientific_name'
+    FROM jsonb_array_elements(p_birds) AS b;
+
+    IF p_multipliers IS NOT NULL THEN
+        INSERT INTO eggs (user_id, brooding_progress, protected_prayers)
+        VALUES (p_user_id, COALESCE(p_new_egg_progress, 0), FALSE);
+        INSERT INTO egg_multipliers (egg_user_id, scientific_name, multiplier)
+        SELECT p_user_id, m.key, m.value::NUMERIC FROM jsonb_each_text(p_multipliers) AS m;
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM player_birds WHERE user_id = p_user_id;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
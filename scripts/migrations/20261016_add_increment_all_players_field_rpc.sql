@@ -0,0 +1,22 @@
+-- Add the increment_all_players_field RPC used for blessings and admin boons.
+-- Safe to run multiple times (CREATE OR REPLACE).
+-- Set-based blessing: add amount to one field for every player, returns rows changed.
+-- Seeds are capped by free nest space (twigs - seeds), garden_size by p_max_garden_size.
+CREATE OR REPLACE FUNCTION increment_all_players_field(field_name TEXT, amount NUMERIC, p_max_garden_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE affected INTEGER;
+BEGIN
+    IF field_name = 'seeds' THEN
+        UPDATE players SET seeds = seeds + LEAST(amount, twigs - seeds), updated_at = now()
+        WHERE twigs - seeds > 0;
+    ELSIF field_name = 'garden_size' THEN
+        UPDATE players SET garden_size = LEAST(garden_size + amount, p_max_garden_size), updated_at = now()
+        WHERE garden_size < p_max_garden_size;
+    ELSE
+        EXECUTE format('UPDATE players SET %I = %I + $1, updated_at = now()', field_name, field_name)
+        USING amount;
+    END IF;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
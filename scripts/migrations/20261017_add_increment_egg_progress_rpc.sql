@@ -0,0 +1,13 @@
+-- Add the increment_egg_progress RPC used by /brood, so progress is bumped server-side
+-- instead of written back from a possibly stale copy of the egg.
+-- Safe to run multiple times (CREATE OR REPLACE).
+-- Atomic egg progress increment, returns the new progress (NULL if the player has no egg)
+CREATE OR REPLACE FUNCTION increment_egg_progress(p_user_id TEXT, p_amount INTEGER)
+RETURNS INTEGER AS $$
+DECLARE new_progress INTEGER;
+BEGIN
+    UPDATE eggs SET brooding_progress = brooding_progress + p_amount WHERE user_id = p_user_id
+    RETURNING brooding_progress INTO new_progress;
+    RETURN new_progress;
+END;
+$$ LANGUAGE plpgsql;
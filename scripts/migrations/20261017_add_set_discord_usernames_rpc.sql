@@ -0,0 +1,16 @@
+-- Add the set_discord_usernames RPC used by the background username refresh.
+-- Safe to run multiple times (CREATE OR REPLACE).
+-- Bulk Discord username refresh: p_names maps user_id -> discord_username. Only
+-- players that still exist are updated, so a player deleted since the names were
+-- read is never recreated. Returns the number of rows updated.
+CREATE OR REPLACE FUNCTION set_discord_usernames(p_names JSONB)
+RETURNS INTEGER AS $$
+DECLARE v_count INTEGER;
+BEGIN
+    UPDATE players SET discord_username = n.value, updated_at = now()
+    FROM jsonb_each_text(p_names) AS n
+    WHERE players.user_id = n.key;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
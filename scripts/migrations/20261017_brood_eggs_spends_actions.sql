@@ -0,0 +1,66 @@
+-- Make brood_eggs (used by /brood_all) spend the brooder's actions itself and stop at
+-- p_max_broods, so skipped targets are replaced by later ones.
+-- Safe to run multiple times (DROP IF EXISTS / CREATE OR REPLACE).
+DROP FUNCTION IF EXISTS brood_eggs(TEXT, TEXT, TEXT[]);
+
+-- Batched brooding that spends the brooder's actions in the same transaction. Targets
+-- are tried in array order: each egg below the hatch threshold that this brooder hasn't
+-- brooded today gets a daily_brooding row, +1 progress and the brooder recorded, until
+-- p_max_broods eggs are brooded or the brooder's actions run out. Skipped targets don't
+-- use up the budget, so later targets fill in for them. One 'brood' action is spent per
+-- egg brooded. Returns the new progress of each egg actually brooded.
+CREATE OR REPLACE FUNCTION brood_eggs(
+    p_brooder_user_id TEXT, p_brooding_date TEXT, p_target_user_ids TEXT[],
+    p_max_broods INTEGER, p_base_actions INTEGER
+)
+RETURNS TABLE(target_user_id TEXT, brooding_progress INTEGER) AS $$
+#variable_conflict use_column
+DECLARE
+    v_bonus INTEGER;
+    v_chicks INTEGER;
+    v_used INTEGER;
+    v_limit INTEGER;
+    v_count INTEGER := 0;
+    v_target TEXT;
+    v_progress INTEGER;
+BEGIN
+    -- Row lock serializes this with the brooder's other action spends
+    SELECT GREATEST(COALESCE(bonus_actions, 0), 0) INTO v_bonus
+    FROM players WHERE user_id = p_brooder_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO v_chicks FROM player_birds WHERE user_id = p_brooder_user_id;
+    SELECT COALESCE(MAX(used), 0) INTO v_used
+    FROM daily_actions WHERE user_id = p_brooder_user_id AND action_date = p_brooding_date;
+    v_limit := LEAST(p_base_actions + v_bonus + v_chicks - v_used, p_max_broods);
+
+    FOREACH v_target IN ARRAY p_target_user_ids LOOP
+        EXIT WHEN v_count >= v_limit;
+
+        INSERT INTO daily_brooding (brooding_date, brooder_user_id, target_user_id)
+        SELECT p_brooding_date, p_brooder_user_id, e.user_id
+        FROM eggs e
+        WHERE e.user_id = v_target AND e.brooding_progress < 10
+        ON CONFLICT (brooding_date, brooder_user_id, target_user_id) DO NOTHING;
+        CONTINUE WHEN NOT FOUND;
+
+        UPDATE eggs SET brooding_progress = eggs.brooding_progress + 1
+        WHERE eggs.user_id = v_target
+        RETURNING eggs.brooding_progress INTO v_progress;
+        INSERT INTO egg_brooders (egg_user_id, brooder_user_id)
+        VALUES (v_target, p_brooder_user_id)
+        ON CONFLICT (egg_user_id, brooder_user_id) DO NOTHING;
+
+        v_count := v_count + 1;
+        target_user_id := v_target;
+        brooding_progress := v_progress;
+        RETURN NEXT;
+    END LOOP;
+
+    IF v_count > 0 THEN
+        PERFORM consume_actions(p_brooder_user_id, p_brooding_date, v_count, 'brood', p_base_actions);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
@@ -298,6 +298,17 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Atomic egg progress increment, returns the new progress (NULL if the player has no egg)
+CREATE OR REPLACE FUNCTION increment_egg_progress(p_user_id TEXT, p_amount INTEGER)
+RETURNS INTEGER AS $$
+DECLARE new_progress INTEGER;
+BEGIN
+    UPDATE eggs SET brooding_progress = brooding_progress + p_amount WHERE user_id = p_user_id
+    RETURNING brooding_progress INTO new_progress;
+    RETURN new_progress;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Atomic released bird upsert
 CREATE OR REPLACE FUNCTION upsert_released_bird_atomic(p_common_name TEXT, p_scientific_name TEXT)
 RETURNS void AS $$
@@ -306,3 +317,184 @@ BEGIN
     ON CONFLICT (scientific_name) DO UPDATE SET count = released_birds.count + 1;
 END;
 $$ LANGUAGE plpgsql;
+
+-- Bulk Discord username refresh: p_names maps user_id -> discord_username. Only
+-- players that still exist are updated, so a player deleted since the names were
+-- read is never recreated. Returns the number of rows updated.
+CREATE OR REPLACE FUNCTION set_discord_usernames(p_names JSONB)
+RETURNS INTEGER AS $$
+DECLARE v_count INTEGER;
+BEGIN
+    UPDATE players SET discord_username = n.value, updated_at = now()
+    FROM jsonb_each_text(p_names) AS n
+    WHERE players.user_id = n.key;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Atomic "consume actions": checks today's budget (base + bonus + chick count - used),
+-- spends bonus actions first and appends to action_history in one transaction.
+-- Returns whether the actions were consumed and the remaining budget afterwards.
+CREATE OR REPLACE FUNCTION consume_actions(
+    p_user_id TEXT, p_action_date TEXT, p_count INTEGER, p_action_type TEXT, p_base_actions INTEGER
+)
+RETURNS TABLE(consumed BOOLEAN, remaining INTEGER) AS $$
+DECLARE
+    v_bonus INTEGER;
+    v_chicks INTEGER;
+    v_used INTEGER;
+    v_available INTEGER;
+    v_bonus_to_use INTEGER;
+BEGIN
+    -- Row lock serializes concurrent commands for the same player
+    SELECT GREATEST(COALESCE(bonus_actions, 0), 0) INTO v_bonus
+    FROM players WHERE user_id = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT FALSE, 0;
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO v_chicks FROM player_birds WHERE user_id = p_user_id;
+    SELECT COALESCE(MAX(used), 0) INTO v_used
+    FROM daily_actions WHERE user_id = p_user_id AND action_date = p_action_date;
+    v_available := p_base_actions + v_bonus + v_chicks - v_used;
+
+    IF p_count > v_available THEN
+        RETURN QUERY SELECT FALSE, v_available;
+        RETURN;
+    END IF;
+
+    v_bonus_to_use := LEAST(p_count, v_bonus);
+    IF v_bonus_to_use > 0 THEN
+        UPDATE players SET bonus_actions = bonus_actions - v_bonus_to_use, updated_at = now()
+        WHERE user_id = p_user_id;
+    END IF;
+
+    INSERT INTO daily_actions (user_id, action_date, used, action_history)
+    VALUES (
+        p_user_id, p_action_date, p_count - v_bonus_to_use,
+        CASE WHEN p_action_type IS NULL OR p_count <= 0 THEN '{}'::TEXT[]
+             ELSE array_fill(p_action_type, ARRAY[p_count]) END
+    )
+    ON CONFLICT (user_id, action_date) DO UPDATE
+    SET used = daily_actions.used + EXCLUDED.used,
+        action_history = daily_actions.action_history || EXCLUDED.action_history;
+
+    RETURN QUERY SELECT TRUE, v_available - p_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Set-based blessing: add amount to one field for every player, returns rows changed.
+-- Seeds are capped by free nest space (twigs - seeds), garden_size by p_max_garden_size.
+CREATE OR REPLACE FUNCTION increment_all_players_field(field_name TEXT, amount NUMERIC, p_max_garden_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE affected INTEGER;
+BEGIN
+    IF field_name = 'seeds' THEN
+        UPDATE players SET seeds = seeds + LEAST(amount, twigs - seeds), updated_at = now()
+        WHERE twigs - seeds > 0;
+    ELSIF field_name = 'garden_size' THEN
+        UPDATE players SET garden_size = LEAST(garden_size + amount, p_max_garden_size), updated_at = now()
+        WHERE garden_size < p_max_garden_size;
+    ELSE
+        EXECUTE format('UPDATE players SET %I = %I + $1, updated_at = now()', field_name, field_name)
+        USING amount;
+    END IF;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Batched brooding that spends the brooder's actions in the same transaction. Targets
+-- are tried in array order: each egg below the hatch threshold that this brooder hasn't
+-- brooded today gets a daily_brooding row, +1 progress and the brooder recorded, until
+-- p_max_broods eggs are brooded or the brooder's actions run out. Skipped targets don't
+-- use up the budget, so later targets fill in for them. One 'brood' action is spent per
+-- egg brooded. Returns the new progress of each egg actually brooded.
+CREATE OR REPLACE FUNCTION brood_eggs(
+    p_brooder_user_id TEXT, p_brooding_date TEXT, p_target_user_ids TEXT[],
+    p_max_broods INTEGER, p_base_actions INTEGER
+)
+RETURNS TABLE(target_user_id TEXT, brooding_progress INTEGER) AS $$
+#variable_conflict use_column
+DECLARE
+    v_bonus INTEGER;
+    v_chicks INTEGER;
+    v_used INTEGER;
+    v_limit INTEGER;
+    v_count INTEGER := 0;
+    v_target TEXT;
+    v_progress INTEGER;
+BEGIN
+    -- Row lock serializes this with the brooder's other action spends
+    SELECT GREATEST(COALESCE(bonus_actions, 0), 0) INTO v_bonus
+    FROM players WHERE user_id = p_brooder_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO v_chicks FROM player_birds WHERE user_id = p_brooder_user_id;
+    SELECT COALESCE(MAX(used), 0) INTO v_used
+    FROM daily_actions WHERE user_id = p_brooder_user_id AND action_date = p_brooding_date;
+    v_limit := LEAST(p_base_actions + v_bonus + v_chicks - v_used, p_max_broods);
+
+    FOREACH v_target IN ARRAY p_target_user_ids LOOP
+        EXIT WHEN v_count >= v_limit;
+
+        INSERT INTO daily_brooding (brooding_date, brooder_user_id, target_user_id)
+        SELECT p_brooding_date, p_brooder_user_id, e.user_id
+        FROM eggs e
+        WHERE e.user_id = v_target AND e.brooding_progress < 10
+        ON CONFLICT (brooding_date, brooder_user_id, target_user_id) DO NOTHING;
+        CONTINUE WHEN NOT FOUND;
+
+        UPDATE eggs SET brooding_progress = eggs.brooding_progress + 1
+        WHERE eggs.user_id = v_target
+        RETURNING eggs.brooding_progress INTO v_progress;
+        INSERT INTO egg_brooders (egg_user_id, brooder_user_id)
+        VALUES (v_target, p_brooder_user_id)
+        ON CONFLICT (egg_user_id, brooder_user_id) DO NOTHING;
+
+        v_count := v_count + 1;
+        target_user_id := v_target;
+        brooding_progress := v_progress;
+        RETURN NEXT;
+    END LOOP;
+
+    IF v_count > 0 THEN
+        PERFORM consume_actions(p_brooder_user_id, p_brooding_date, v_count, 'brood', p_base_actions);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transactional hatch: delete the egg, add every hatched bird and, when prayers were
+-- preserved (p_multipliers not NULL), lay a new egg carrying them at p_new_egg_progress.
+-- Returns the owner's new bird count, or NULL (changing nothing) if the player has no egg
+-- at the hatch threshold, e.g. it already hatched and a fresh egg was laid since.
+CREATE OR REPLACE FUNCTION hatch_egg(p_user_id TEXT, p_birds JSONB, p_new_egg_progress INTEGER, p_multipliers JSONB)
+RETURNS INTEGER AS $$
+DECLARE v_count INTEGER;
+BEGIN
+    -- Deleting first locks the egg row, so a concurrent hatch of the same egg finds nothing.
+    -- A late or retried call must not hatch the egg laid after it, hence the progress check.
+    DELETE FROM eggs WHERE user_id = p_user_id AND brooding_progress >= 10;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO player_birds (user_id, common_name, scientific_name)
+    SELECT p_user_id, b->>'common_name', b->>'scientific_name'
+    FROM jsonb_array_elements(p_birds) AS b;
+
+    IF p_multipliers IS NOT NULL THEN
+        INSERT INTO eggs (user_id, brooding_progress, protected_prayers)
+        VALUES (p_user_id, COALESCE(p_new_egg_progress, 0), FALSE);
+        INSERT INTO egg_multipliers (egg_user_id, scientific_name, multiplier)
+        SELECT p_user_id, m.key, m.value::NUMERIC FROM jsonb_each_text(p_multipliers) AS m;
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM player_birds WHERE user_id = p_user_id;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,60 @@
+"""
+Tests for birdsong clip trimming and transcoding in utils.audio_clip.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from utils.audio_clip import clip_filename, compact_clip, trim_mp3
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, no padding: 417-byte frames of 1152 samples
+FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+FRAME_SECONDS = 1152 / 44100
+
+
+def _id3(payload=b"\x00" * 20):
+    size = len(payload)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + payload
+
+
+def test_trim_cuts_on_frame_boundaries_and_drops_tags():
+    data = _id3() + FRAME * 500
+
+    trimmed = trim_mp3(data, 2)
+
+    frames = len(trimmed) // len(FRAME)
+    assert trimmed == FRAME * frames
+    assert (frames - 1) * FRAME_SECONDS < 2 <= frames * FRAME_SECONDS
+
+
+def test_trim_drops_vbr_header_frame():
+    xing = b"\xff\xfb\x90\x00" + b"\x00" * 32 + b"Xing" + b"\x00" * 377
+    assert trim_mp3(xing + FRAME * 10, 60) == FRAME * 10
+
+
+def test_trim_leaves_unparseable_data_alone():
+    assert trim_mp3(b"not an mp3", 8) == b"not an mp3"
+    assert trim_mp3(FRAME[:100], 8) == FRAME[:100]
+
+
+def test_trim_gives_up_when_no_frame_starts_near_the_beginning():
+    junk = b"\x00" * (1024 * 1024)
+    assert trim_mp3(junk + FRAME * 10, 8) == junk + FRAME * 10
+    assert trim_mp3(b"\x00" * 100 + FRAME * 10, 8) == FRAME * 10
+
+
+@pytest.mark.asyncio
+async def test_compact_clip_falls_back_to_trim_when_ffmpeg_fails():
+    data = FRAME * 500
+    with patch("utils.audio_clip.FFMPEG_PATH", "/nonexistent/ffmpeg"), \
+         patch("utils.audio_clip.BIRDSONG_CLIP_SECONDS", 1):
+        clip = await compact_clip(data)
+
+    assert clip == trim_mp3(data, 1)
+    assert len(clip) < len(data) / 10
+
+
+def test_clip_filename_matches_container():
+    assert clip_filename(b"OggS\x00rest") == "birdsong.ogg"
+    assert clip_filename(FRAME, stem="42") == "42.mp3"
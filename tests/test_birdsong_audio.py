@@ -1,21 +1,39 @@
+import asyncio
 import os
+import threading
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 
+import utils.birdsong_audio as birdsong_audio
 from utils.birdsong_audio import (
     fetch_birdsong_audio,
     get_fallback_audio,
     get_birdsong_for_bird,
+    clear_disk_index,
+    clear_fallback_pool,
+    in_prefetch_hours,
+    prefetch_birdsongs,
     _cache,
+    _cache_put,
+    _disk_put,
 )
 
 
 @pytest.fixture(autouse=True)
-def clear_cache():
-    """Clear the LRU cache before each test."""
+def clear_cache(tmp_path):
+    """Clear the LRU cache and point the disk cache at a temp dir for each test."""
     _cache.clear()
-    yield
+    clear_disk_index()
+    clear_fallback_pool()
+    with patch("utils.birdsong_audio.BIRDSONG_CACHE_DIR", str(tmp_path / "birdsongs")):
+        yield
     _cache.clear()
+    clear_disk_index()
+    clear_fallback_pool()
+
+
+def _no_http():
+    return patch("utils.birdsong_audio.get_http_session", side_effect=AssertionError("unexpected HTTP call"))
 
 
 @pytest.mark.asyncio
@@ -62,16 +80,21 @@ async def test_fetch_birdsong_success():
 
     mock_session = MagicMock()
     mock_session.get = MagicMock(side_effect=[mock_api_response, mock_dl_response])
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
 
     with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), \
-         patch("utils.birdsong_audio.aiohttp.ClientSession", return_value=mock_session):
+         patch("utils.birdsong_audio.get_http_session", return_value=mock_session):
         result = await fetch_birdsong_audio("Dacelo novaeguineae")
 
     assert result == fake_mp3
     assert "Dacelo novaeguineae" in _cache
 
+    # A restart loses the memory tier; the clip is then served from disk
+    _cache.clear()
+    clear_disk_index()
+    with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), _no_http():
+        assert await fetch_birdsong_audio("Dacelo novaeguineae") == fake_mp3
+    assert "Dacelo novaeguineae" in _cache
+
 
 @pytest.mark.asyncio
 async def test_fetch_birdsong_cache_hit():
@@ -80,20 +103,124 @@ async def test_fetch_birdsong_cache_hit():
     _cache["Dacelo novaeguineae"] = fake_mp3
 
     with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), \
-         patch("utils.birdsong_audio.aiohttp.ClientSession") as mock_cls:
+         patch("utils.birdsong_audio.get_http_session") as mock_get_session:
         result = await fetch_birdsong_audio("Dacelo novaeguineae")
-        mock_cls.assert_not_called()
+        mock_get_session.assert_not_called()
 
     assert result == fake_mp3
 
 
-def test_get_fallback_audio_with_files(tmp_path):
+def test_memory_cache_is_bounded_by_bytes():
+    with patch("utils.birdsong_audio.BIRDSONG_MEMORY_CACHE_BYTES", 250):
+        for name in ("a", "b", "c"):
+            _cache_put(name, b"x" * 100)
+
+    assert list(_cache) == ["b", "c"]
+
+
+def test_disk_cache_evicts_least_recently_used_species():
+    with patch("utils.birdsong_audio.BIRDSONG_DISK_CACHE_BYTES", 250), \
+         patch("utils.birdsong_audio.time.time", side_effect=[1, 2, 3]):
+        _disk_put("Old bird", 1, b"x" * 100)
+        _disk_put("Newer bird", 2, b"x" * 100)
+        _disk_put("Newest bird", 3, b"x" * 100)
+
+    clear_disk_index()
+    assert birdsong_audio._disk_get("Old bird") == (None, False)
+    assert birdsong_audio._disk_get("Newest bird")[0] == b"x" * 100
+    assert sorted(os.listdir(birdsong_audio.BIRDSONG_CACHE_DIR)) == ["2.mp3", "3.mp3", "index.json"]
+
+
+def test_disk_hits_batch_last_used_writes():
+    _disk_put("Dacelo novaeguineae", 1, b"clip")
+    index_path = os.path.join(birdsong_audio.BIRDSONG_CACHE_DIR, "index.json")
+    written = os.path.getmtime(index_path)
+    os.utime(index_path, (0, 0))
+
+    # Within the flush interval, hits only update the index in memory
+    for _ in range(3):
+        assert birdsong_audio._disk_get("Dacelo novaeguineae")[0] == b"clip"
+    birdsong_audio._touch_disk_entry("Dacelo novaeguineae")
+    assert os.path.getmtime(index_path) == 0
+    last_used = birdsong_audio._disk_entry("Dacelo novaeguineae")["last_used"]
+
+    birdsong_audio.flush_disk_index(force=True)
+    assert os.path.getmtime(index_path) >= written
+    clear_disk_index()
+    assert birdsong_audio._disk_entry("Dacelo novaeguineae")["last_used"] == last_used
+
+
+@pytest.mark.asyncio
+async def test_stale_disk_clip_is_served_and_refreshed_in_background():
+    _disk_put("Dacelo novaeguineae", 1, b"old clip")
+
+    with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), \
+         patch("utils.birdsong_audio.BIRDSONG_CACHE_TTL_SECONDS", -1), \
+         patch("utils.birdsong_audio._download_birdsong", new_callable=AsyncMock) as mock_download:
+        result = await fetch_birdsong_audio("Dacelo novaeguineae")
+        await asyncio.sleep(0)
+
+    assert result == b"old clip"
+    mock_download.assert_awaited_once_with("Dacelo novaeguineae")
+
+
+def _response(status=200, json_data=None, body=b""):
+    response = MagicMock()
+    response.status = status
+    response.headers = {}
+    response.json = AsyncMock(return_value=json_data)
+    response.read = AsyncMock(return_value=body)
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=False)
+    return response
+
+
+@pytest.mark.asyncio
+async def test_recording_list_is_reused_between_downloads():
+    search = _response(json_data={"recordings": [{"id": "42", "file": "https://xeno-canto.org/42.mp3"}]})
+    session = MagicMock()
+    session.get = MagicMock(side_effect=[search, _response(body=b"first"), _response(body=b"second")])
+
+    with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), \
+         patch("utils.birdsong_audio.get_http_session", return_value=session):
+        assert await birdsong_audio._download_birdsong("Dacelo novaeguineae") == b"first"
+        clear_disk_index()  # the recording list survives a restart too
+        assert await birdsong_audio._download_birdsong("Dacelo novaeguineae") == b"second"
+
+    assert session.get.call_count == 3
+    assert session.get.call_args_list[2].args[0] == "https://xeno-canto.org/42.mp3"
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_fresh_clips_and_leaves_memory_alone():
+    _disk_put("Already cached", 1, b"clip")
+    download = AsyncMock(return_value=b"new clip")
+
+    with patch("utils.birdsong_audio.XENO_CANTO_API_KEY", "test-key"), \
+         patch("utils.birdsong_audio.BIRDSONG_PREFETCH_DELAY_SECONDS", 0), \
+         patch("utils.birdsong_audio._download_birdsong", new=download):
+        fetched = await prefetch_birdsongs(["Already cached", "Dacelo novaeguineae"])
+
+    assert fetched == 1
+    download.assert_awaited_once_with("Dacelo novaeguineae", keep_in_memory=False)
+    assert not _cache
+
+
+def test_prefetch_hours_may_wrap_midnight():
+    with patch("utils.birdsong_audio.BIRDSONG_PREFETCH_HOURS", (3, 5)):
+        assert [h for h in range(24) if in_prefetch_hours(h)] == [3, 4]
+    with patch("utils.birdsong_audio.BIRDSONG_PREFETCH_HOURS", (23, 2)):
+        assert [h for h in range(24) if in_prefetch_hours(h)] == [0, 1, 23]
+
+
+@pytest.mark.asyncio
+async def test_get_fallback_audio_with_files(tmp_path):
     """Returns audio bytes when fallback files exist."""
     mp3_data = b"fake_fallback_mp3"
     (tmp_path / "test_bird.mp3").write_bytes(mp3_data)
 
     with patch("utils.birdsong_audio.FALLBACK_DIR", str(tmp_path)):
-        result = get_fallback_audio()
+        result = await get_fallback_audio()
 
     assert result is not None
     data, name = result
@@ -101,10 +228,45 @@ def test_get_fallback_audio_with_files(tmp_path):
     assert name == "Test Bird"
 
 
-def test_get_fallback_audio_empty_dir(tmp_path):
+@pytest.mark.asyncio
+async def test_fallback_pool_serves_from_memory_and_reloads_on_change(tmp_path):
+    (tmp_path / "magpie.mp3").write_bytes(b"magpie")
+
+    with patch("utils.birdsong_audio.FALLBACK_DIR", str(tmp_path)):
+        assert await get_fallback_audio() == (b"magpie", "Magpie")
+
+        (tmp_path / "magpie.mp3").unlink()
+        with patch("utils.birdsong_audio.os.listdir", side_effect=AssertionError("listed again")), \
+             patch("builtins.open", side_effect=AssertionError("read again")):
+            assert await get_fallback_audio() == (b"magpie", "Magpie")
+
+        with patch("utils.birdsong_audio.BIRDSONG_FALLBACK_RELOAD_SECONDS", 0):
+            assert await get_fallback_audio() is None
+
+
+@pytest.mark.asyncio
+async def test_fallback_pool_reloads_off_the_event_loop(tmp_path):
+    (tmp_path / "magpie.mp3").write_bytes(b"magpie")
+    loop_thread = threading.get_ident()
+    reload_threads = []
+    load = birdsong_audio.load_fallback_pool
+
+    def tracking_load():
+        reload_threads.append(threading.get_ident())
+        load()
+
+    with patch("utils.birdsong_audio.FALLBACK_DIR", str(tmp_path)), \
+         patch("utils.birdsong_audio.load_fallback_pool", side_effect=tracking_load):
+        assert await get_fallback_audio() == (b"magpie", "Magpie")
+
+    assert reload_threads and loop_thread not in reload_threads
+
+
+@pytest.mark.asyncio
+async def test_get_fallback_audio_empty_dir(tmp_path):
     """Returns None when no fallback files exist."""
     with patch("utils.birdsong_audio.FALLBACK_DIR", str(tmp_path)):
-        result = get_fallback_audio()
+        result = await get_fallback_audio()
     assert result is None
 
 
@@ -129,7 +291,7 @@ async def test_get_birdsong_for_bird_fallback():
     bird = {"common_name": "Laughing Kookaburra", "scientific_name": "Dacelo novaeguineae"}
 
     with patch("utils.birdsong_audio.fetch_birdsong_audio", new_callable=AsyncMock, return_value=None), \
-         patch("utils.birdsong_audio.get_fallback_audio", return_value=(fallback_mp3, "Generic Bird")):
+         patch("utils.birdsong_audio.get_fallback_audio", new_callable=AsyncMock, return_value=(fallback_mp3, "Generic Bird")):
         data, name, is_default = await get_birdsong_for_bird(bird)
 
     assert data == fallback_mp3
@@ -143,7 +305,7 @@ async def test_get_birdsong_for_bird_no_audio():
     bird = {"common_name": "Laughing Kookaburra", "scientific_name": "Dacelo novaeguineae"}
 
     with patch("utils.birdsong_audio.fetch_birdsong_audio", new_callable=AsyncMock, return_value=None), \
-         patch("utils.birdsong_audio.get_fallback_audio", return_value=None):
+         patch("utils.birdsong_audio.get_fallback_audio", new_callable=AsyncMock, return_value=None):
         data, name, is_default = await get_birdsong_for_bird(bird)
 
     assert data is None
@@ -0,0 +1,189 @@
+"""
+Tests for the in-process broodable-targets index in data.storage.
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import data.storage as db
+
+
+def _async_rows(rows):
+    async def gen(*args, **kwargs):
+        for row in rows:
+            yield dict(row)  # the index keeps the rows it reads, as with real query results
+    return gen
+
+
+PLAYERS = [
+    {"user_id": "1", "nest_name": "Open", "locked": False},
+    {"user_id": "2", "nest_name": "Locked", "locked": True},
+    {"user_id": "3", "nest_name": "Full", "locked": False},
+    {"user_id": "4", "nest_name": "No Egg", "locked": False},
+]
+EGGS = [
+    {"user_id": "1", "brooding_progress": 3, "protected_prayers": False},
+    {"user_id": "2", "brooding_progress": 5, "protected_prayers": False},
+    {"user_id": "3", "brooding_progress": 1, "protected_prayers": False},
+]
+BIRDS = [{"id": 1, "user_id": "1"}] + [{"id": 10 + i, "user_id": "3"} for i in range(3)]
+
+
+@pytest.fixture
+def built_index():
+    """Patch the bulk readers and clear the index around each test."""
+    db.clear_brood_index()
+    with patch("data.storage.iter_all_players", side_effect=_async_rows(PLAYERS)) as players, \
+         patch("data.storage.iter_table", side_effect=_async_rows(EGGS)), \
+         patch("data.storage.iter_all_birds", side_effect=_async_rows(BIRDS)):
+        yield players
+    db.clear_brood_index()
+
+
+def _fake_client():
+    client = MagicMock()
+    chain = MagicMock()
+    chain.execute = AsyncMock(return_value=MagicMock(data=[]))
+    for method in ("insert", "update", "upsert", "delete", "eq"):
+        getattr(chain, method).return_value = chain
+    client.table.return_value = chain
+
+    async def get_client():
+        return client
+    return get_client
+
+
+def _ids(targets):
+    return [player["user_id"] for player, _ in targets]
+
+
+@pytest.mark.asyncio
+async def test_filters_locked_full_and_eggless_nests(built_index):
+    assert _ids(await db.get_broodable_targets(max_birds=3)) == ["1"]
+    assert _ids(await db.get_broodable_targets(max_birds=4)) == ["1", "3"]
+    assert _ids(await db.get_broodable_targets(max_birds=3, allow_locked_user_id="2")) == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_built_once_then_served_from_memory(built_index):
+    await db.get_broodable_targets(max_birds=45)
+    await db.get_broodable_targets(max_birds=45)
+    assert built_index.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_write_paths_keep_index_current(built_index):
+    await db.get_broodable_targets(max_birds=2)
+
+    with patch("data.storage._client", _fake_client()):
+        await db.update_player("1", locked=True)
+        await db.create_egg("4", brooding_progress=2)
+        await db.delete_egg("2")
+        await db.add_bird("4", "Robin", "Turdus migratorius")
+
+    targets = await db.get_broodable_targets(max_birds=2, allow_locked_user_id="2")
+    assert _ids(targets) == ["4"]
+    assert targets[0][1]["brooding_progress"] == 2
+    assert built_index.call_count == 1
+
+    with patch("data.storage._client", _fake_client()):
+        await db.add_bird("4", "Robin", "Turdus migratorius")
+    assert await db.get_broodable_targets(max_birds=2) == []
+
+
+@pytest.mark.asyncio
+async def test_write_for_unknown_user_forces_rebuild(built_index):
+    await db.get_broodable_targets(max_birds=45)
+
+    with patch("data.storage._client", _fake_client()):
+        await db.create_egg("99")
+
+    await db.get_broodable_targets(max_birds=45)
+    assert built_index.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_after_refresh_interval(built_index):
+    await db.get_broodable_targets(max_birds=45)
+    with patch("data.storage.BROOD_INDEX_REFRESH_SECONDS", -1):
+        await db.get_broodable_targets(max_birds=45)
+    assert built_index.call_count == 2
+
+
+def _rows_then(rows, during):
+    """Like _async_rows, but runs during() halfway through, as a concurrent write would."""
+    async def gen(*args, **kwargs):
+        for i, row in enumerate(rows):
+            if i == len(rows) // 2:
+                during()
+            yield dict(row)
+    return gen
+
+
+@pytest.mark.asyncio
+async def test_writes_during_a_build_are_replayed_and_the_index_trusted(built_index):
+    def writes():
+        db._brood_index_put_player({"user_id": "5", "nest_name": "New", "locked": False})
+        db._brood_index_set_egg("5", {"user_id": "5", "brooding_progress": 0, "protected_prayers": False})
+        db._brood_index_update_player("2", {"locked": False})
+        db._brood_index_update_egg("1", {"brooding_progress": 4})
+
+    with patch("data.storage.iter_table", side_effect=_rows_then(EGGS, writes)):
+        targets = await db.get_broodable_targets(max_birds=2)
+    assert _ids(targets) == ["1", "2", "5"]
+    assert targets[0][1]["brooding_progress"] == 4
+
+    await db.get_broodable_targets(max_birds=2)
+    assert built_index.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bird_count_change_while_counting_birds_forces_a_rebuild(built_index):
+    with patch("data.storage.iter_all_birds", side_effect=_rows_then(BIRDS, lambda: db._brood_index_add_birds("1", 1))):
+        await db.get_broodable_targets(max_birds=2)
+
+    await db.get_broodable_targets(max_birds=2)
+    assert built_index.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_index_dropped_right_after_its_build_is_still_used_once(built_index):
+    # log_debug runs just after the built index is swapped in; drop it there, as the
+    # Flask thread writing for an unknown user would
+    with patch("data.storage.log_debug", side_effect=lambda *_: db.clear_brood_index()):
+        assert _ids(await db.get_broodable_targets(max_birds=2)) == ["1"]
+    assert built_index.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_build(built_index):
+    await asyncio.gather(db.get_broodable_targets(max_birds=2), db.get_broodable_targets(max_birds=2))
+    assert built_index.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_from_another_thread_never_break_a_lookup(built_index):
+    """The Flask thread may drop the index while the bot is iterating it."""
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            db._brood_index_update_player("99", {"locked": True})  # unknown user drops the index
+            db._brood_index_set_egg("1", dict(EGGS[0]))
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # make the threads interleave as often as possible
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            targets = await db.get_broodable_targets(max_birds=2)
+            assert set(_ids(targets)) <= {"1", "2"}
+    finally:
+        stop.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
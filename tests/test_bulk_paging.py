@@ -0,0 +1,132 @@
+"""
+Tests for keyset-paginated bulk reads in data.storage.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import data.storage as db
+
+
+def _make_paged_client(pages, execute_cls=MagicMock):
+    """A client whose query chain returns one page of rows per execute() call."""
+    client = MagicMock()
+    chain = MagicMock()
+    responses = []
+    for page in pages:
+        response = MagicMock()
+        response.data = page
+        responses.append(response)
+    chain.execute = execute_cls(side_effect=responses)
+    for method in ("select", "eq", "gte", "gt", "order", "limit"):
+        getattr(chain, method).return_value = chain
+    client.table.return_value = chain
+    return client, chain
+
+
+def test_sync_pages_by_key_until_empty_page():
+    pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}], []]
+    client, chain = _make_paged_client(pages)
+
+    with patch("data.storage._sync_client", return_value=client):
+        rows = list(db.iter_table_sync("player_birds", chunk_size=2))
+
+    assert [r["id"] for r in rows] == [1, 2, 3, 4, 5]
+    assert chain.execute.call_count == 4
+    # Each page after the first starts after the last key seen
+    assert [c.args for c in chain.gt.call_args_list] == [("id", 2), ("id", 4), ("id", 5)]
+    chain.order.assert_called_with("id")
+    chain.limit.assert_called_with(2)
+
+
+def test_sync_keeps_paging_past_pages_capped_by_server_max_rows():
+    # PostgREST's max-rows can return fewer rows than asked for mid-table
+    pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], []]
+    client, chain = _make_paged_client(pages)
+
+    with patch("data.storage._sync_client", return_value=client):
+        rows = list(db.iter_table_sync("player_birds", chunk_size=1000))
+
+    assert [r["id"] for r in rows] == [1, 2, 3, 4]
+    assert chain.execute.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_async_keeps_paging_past_pages_capped_by_server_max_rows():
+    pages = [[{"id": 1}], [{"id": 2}], []]
+    client, chain = _make_paged_client(pages, execute_cls=AsyncMock)
+
+    async def fake_client():
+        return client
+
+    with patch("data.storage._client", fake_client):
+        rows = [row async for row in db.iter_table("player_birds", chunk_size=1000)]
+
+    assert [r["id"] for r in rows] == [1, 2]
+    assert chain.execute.await_count == 3
+
+
+def test_sync_filters_and_custom_key():
+    client, chain = _make_paged_client([[{"id": 7, "user_id": "a", "song_date": "2026-01-02"}], []])
+
+    with patch("data.storage._sync_client", return_value=client):
+        rows = list(db.iter_all_songs_sync(since_date="2026-01-01"))
+
+    assert len(rows) == 1
+    # The filter is re-applied to every page query
+    assert [c.args for c in chain.gte.call_args_list] == [("song_date", "2026-01-01")] * 2
+    chain.gt.assert_called_once_with("id", 7)
+
+
+def test_list_wrappers_are_no_longer_capped():
+    pages = [[{"user_id": str(i)} for i in range(3)], [{"user_id": "3"}], []]
+    client, _ = _make_paged_client(pages)
+
+    with patch("data.storage._sync_client", return_value=client), \
+         patch("data.storage.BULK_FETCH_CHUNK_SIZE", 3):
+        players = db.load_all_players_sync()
+
+    assert [p["user_id"] for p in players] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_async_generator_streams_pages():
+    pages = [[{"id": 1}, {"id": 2}], []]
+    client, chain = _make_paged_client(pages, execute_cls=AsyncMock)
+
+    async def fake_client():
+        return client
+
+    with patch("data.storage._client", fake_client), \
+         patch("data.storage.BULK_FETCH_CHUNK_SIZE", 2):
+        rows = [row async for row in db.iter_all_birds("id, common_name, scientific_name")]
+
+    assert [r["id"] for r in rows] == [1, 2]
+    assert chain.execute.await_count == 2
+    chain.select.assert_called_with("id, common_name, scientific_name")
+
+
+@pytest.mark.asyncio
+async def test_active_player_species_reads_only_active_players_birds():
+    pages = [
+        [{"id": 1, "user_id": "a"}, {"id": 2, "user_id": "b"}, {"id": 3, "user_id": "c"}],  # daily_actions
+        [],
+        [{"id": 10, "scientific_name": "Pica pica"}, {"id": 11, "scientific_name": None}],   # owners a, b
+        [],
+        [{"id": 12, "scientific_name": "Corvus corax"}, {"id": 13, "scientific_name": "Pica pica"}],  # owner c
+        [],
+    ]
+    client, chain = _make_paged_client(pages, execute_cls=AsyncMock)
+    chain.in_.return_value = chain
+
+    async def fake_client():
+        return client
+
+    with patch("data.storage._client", fake_client), \
+         patch("data.storage._IN_FILTER_CHUNK_SIZE", 2):
+        species = await db.get_active_player_species("2026-10-01")
+
+    assert species == ["Corvus corax", "Pica pica"]
+    # One owner chunk per stream, re-applied to each of its page queries
+    assert [c.args for c in chain.in_.call_args_list] == [("user_id", ["a", "b"])] * 2 + [("user_id", ["c"])] * 2
+    assert [c.args for c in chain.gte.call_args_list] == [("action_date", "2026-10-01")] * 2
@@ -0,0 +1,79 @@
+"""
+Tests for the timed cog loader in bot.py.
+"""
+
+import sys
+
+import discord
+import pytest
+from discord.ext import commands
+from unittest.mock import AsyncMock, MagicMock
+
+import bot as bot_module
+
+
+@pytest.mark.asyncio
+async def test_all_cogs_load_and_report_timings(capsys):
+    fake_bot = MagicMock()
+    fake_bot.load_extension = AsyncMock()
+
+    results = await bot_module.load_cogs(fake_bot)
+
+    loaded = [call.args[0] for call in fake_bot.load_extension.await_args_list]
+    assert loaded == [name for name, _, _, _ in results]
+    assert "commands.incubation" in loaded
+    assert all(error is None and import_ms >= 0 and setup_ms >= 0 for _, import_ms, setup_ms, error in results)
+    assert "Cog startup report" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_failing_cog_is_reported_without_stopping_others(capsys):
+    fake_bot = MagicMock()
+
+    async def load_extension(name):
+        if name == "commands.weather":
+            raise ImportError("boom")
+
+    fake_bot.load_extension = AsyncMock(side_effect=load_extension)
+
+    results = await bot_module.load_cogs(fake_bot)
+
+    errors = {name: error for name, _, _, error in results if error}
+    assert list(errors) == ["commands.weather"]
+    assert fake_bot.load_extension.await_count == len(results)
+    assert "commands.weather" in capsys.readouterr().out
+
+
+COG_SOURCE = """
+import asyncio
+import time
+
+import cog_timing_probe
+cog_timing_probe.executions += 1
+time.sleep(0.05)
+
+
+async def setup(bot):
+    await asyncio.sleep(0.1)
+"""
+
+
+@pytest.mark.asyncio
+async def test_import_and_setup_are_timed_separately_with_one_execution(tmp_path, monkeypatch):
+    (tmp_path / "cog_timing_probe.py").write_text("executions = 0\n")
+    (tmp_path / "timed_cog.py").write_text(COG_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+    try:
+        name, import_ms, setup_ms, error = await bot_module._load_cog(bot, "timed_cog")
+        executions = sys.modules["cog_timing_probe"].executions
+    finally:
+        sys.modules.pop("timed_cog", None)
+        sys.modules.pop("cog_timing_probe", None)
+
+    assert error is None
+    assert executions == 1
+    assert import_ms >= 50  # the module-level sleep
+    assert setup_ms >= 100  # the sleep in setup(), not counted as import
+    assert bot_module._CogImportTimer not in {type(finder) for finder in sys.meta_path}
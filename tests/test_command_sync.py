@@ -0,0 +1,63 @@
+"""
+Tests for hash-gated slash command syncing in utils.command_sync.
+"""
+
+import discord
+import pytest
+from discord import app_commands
+from unittest.mock import AsyncMock, patch
+
+import utils.command_sync as command_sync
+
+
+def _tree(*names):
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    for name in names:
+        async def callback(interaction: discord.Interaction):
+            pass
+        tree.add_command(app_commands.Command(name=name, description=f"{name} command", callback=callback))
+    tree.sync = AsyncMock(side_effect=lambda: list(tree.get_commands()))
+    return tree
+
+
+@pytest.fixture
+def hash_file(tmp_path):
+    path = tmp_path / "command_tree_hash.txt"
+    with patch("utils.command_sync.COMMAND_TREE_HASH_FILE", str(path)):
+        yield path
+
+
+def test_hash_is_stable_and_order_independent():
+    assert command_sync.command_tree_hash(_tree("a", "b")) == command_sync.command_tree_hash(_tree("b", "a"))
+    assert command_sync.command_tree_hash(_tree("a")) != command_sync.command_tree_hash(_tree("a", "b"))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_tree_skips_sync(hash_file):
+    tree = _tree("brood", "sing")
+
+    assert await command_sync.sync_command_tree(tree) == (True, 2)
+    assert await command_sync.sync_command_tree(tree) == (False, 0)
+
+    tree.sync.assert_awaited_once()
+    assert hash_file.read_text() == command_sync.command_tree_hash(tree)
+
+
+@pytest.mark.asyncio
+async def test_changed_tree_or_force_syncs(hash_file):
+    await command_sync.sync_command_tree(_tree("brood"))
+
+    changed = _tree("brood", "sing")
+    assert await command_sync.sync_command_tree(changed) == (True, 2)
+    assert await command_sync.sync_command_tree(changed, force=True) == (True, 2)
+    assert changed.sync.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_does_not_store_hash(hash_file):
+    tree = _tree("brood")
+    tree.sync = AsyncMock(side_effect=discord.HTTPException(AsyncMock(status=429), "rate limited"))
+
+    with pytest.raises(discord.HTTPException):
+        await command_sync.sync_command_tree(tree)
+    assert not hash_file.exists()
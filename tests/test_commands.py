@@ -5,6 +5,8 @@ All DB operations are mocked via AsyncMock / patch so no real Supabase
 connection is needed.
 """
 
+import os
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
@@ -12,12 +14,22 @@ from datetime import datetime, timedelta
 from commands.flock import FlockCommands
 from commands.incubation import IncubationCommands
 from constants import BASE_DAILY_ACTIONS
+from utils.discord_resolver import clear_resolver_cache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 # ---------------------------------------------------------------------------
 # Shared fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def clear_resolver():
+    clear_resolver_cache()
+    yield
+    clear_resolver_cache()
+
+
 @pytest.fixture
 def mock_interaction():
     interaction = AsyncMock()
@@ -120,14 +132,16 @@ class TestIncubationCommands:
         target_egg = {"user_id": "456", "brooding_progress": 3, "multipliers": {}, "brooded_by": []}
 
         bot.fetch_user = AsyncMock(return_value=target_user)
+        bot.get_user = MagicMock(return_value=None)
 
         with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
-             patch("commands.incubation.record_actions", new=AsyncMock()), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(True, 2))), \
              patch("commands.incubation.db.load_player", new=AsyncMock(return_value=target_player)), \
              patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=target_egg)), \
              patch("commands.incubation.db.has_brooded_today", new=AsyncMock(return_value=False)), \
              patch("commands.incubation.db.record_brooding", new=AsyncMock()), \
-             patch("commands.incubation.db.update_egg", new=AsyncMock()), \
+             patch("commands.incubation.db.increment_egg_progress", new=AsyncMock(return_value=4)) as mock_increment, \
+             patch("commands.incubation.db.update_egg", new=AsyncMock()) as mock_update_egg, \
              patch("commands.incubation.db.add_egg_brooder", new=AsyncMock()):
 
             await cog.brood.callback(cog, mock_interaction, f"<@{target_user.id}>")
@@ -135,6 +149,11 @@ class TestIncubationCommands:
         mock_interaction.followup.send.assert_called()
         msg = mock_interaction.followup.send.call_args[0][0]
         assert "You brooded at the following nests" in msg
+        # Progress is bumped server-side, never written back from the (possibly stale) egg copy
+        mock_increment.assert_awaited_once_with("456")
+        # The footer uses what the spend left, not the count read before the command
+        assert "You have 2 actions remaining today." in msg
+        mock_update_egg.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_brood_no_egg(self, mock_interaction):
@@ -146,6 +165,7 @@ class TestIncubationCommands:
         target_player = {"user_id": "456", "nest_name": "Target Nest", "locked": False}
 
         bot.fetch_user = AsyncMock(return_value=target_user)
+        bot.get_user = MagicMock(return_value=None)
 
         with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
              patch("commands.incubation.db.load_player", new=AsyncMock(return_value=target_player)), \
@@ -166,6 +186,7 @@ class TestIncubationCommands:
 
         target_user = mock_interaction.add_member(456, "Target")
         bot.fetch_user = AsyncMock(return_value=target_user)
+        bot.get_user = MagicMock(return_value=None)
 
         with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=0)):
             await cog.brood.callback(cog, mock_interaction, f"<@{target_user.id}>")
@@ -174,54 +195,162 @@ class TestIncubationCommands:
         msg = mock_interaction.followup.send.call_args[0][0]
         assert "You've used all your actions for today" in msg
 
+    @staticmethod
+    def _brood_all_fixtures(mock_interaction, eggs):
+        """Two unlocked nests with room, one per egg in eggs."""
+        target_a = mock_interaction.add_member(456, "Target A")
+        target_b = mock_interaction.add_member(789, "Target B")
+        member_by_id = {456: target_a, 789: target_b}
+        mock_interaction.guild.get_member = MagicMock(side_effect=lambda uid: member_by_id.get(uid))
+        indexed = [
+            ({"user_id": "456", "nest_name": "A Nest", "locked": False}, eggs["456"]),
+            ({"user_id": "789", "nest_name": "B Nest", "locked": False}, eggs["789"]),
+        ]
+        patches = [
+            patch("commands.incubation.get_extra_bird_space", new=AsyncMock(return_value=0)),
+            patch("commands.incubation.db.get_broodable_targets", new=AsyncMock(return_value=indexed)),
+            patch("commands.incubation.db.get_brooded_targets_today", new=AsyncMock(return_value=set())),
+        ]
+        return target_a, target_b, patches
+
     @pytest.mark.asyncio
-    async def test_brood_all_batches_prefetch_and_records_actions_once(self, mock_interaction):
-        """brood_all should batch prefiltering and record actions once for all successes."""
+    async def test_brood_all_broods_in_one_bulk_write_that_spends_actions(self, mock_interaction):
+        """brood_all should brood every target in one bulk write, which also spends the actions."""
         bot = AsyncMock()
         cog = IncubationCommands(bot)
+        eggs = {
+            "456": {"user_id": "456", "brooding_progress": 3, "protected_prayers": False},
+            "789": {"user_id": "789", "brooding_progress": 4, "protected_prayers": False},
+        }
+        _, _, patches = self._brood_all_fixtures(mock_interaction, eggs)
 
-        target_a = mock_interaction.add_member(456, "Target A")
-        target_b = mock_interaction.add_member(789, "Target B")
+        mock_brood_eggs = AsyncMock(return_value={"456": 4, "789": 5})
+        mock_consume_actions = AsyncMock()
+        mock_hatch = AsyncMock()
+
+        with patches[0], patches[1], patches[2], \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(side_effect=[5, 3])), \
+             patch("commands.incubation.db.brood_eggs", new=mock_brood_eggs), \
+             patch("commands.incubation.db.record_brooding", new=AsyncMock()) as mock_record_brooding, \
+             patch.object(cog, "hatch_egg", new=mock_hatch), \
+             patch("commands.incubation.consume_actions", new=mock_consume_actions):
 
-        member_by_id = {
-            456: target_a,
-            789: target_b,
+            await cog.brood_all.callback(cog, mock_interaction)
+
+        mock_brood_eggs.assert_awaited_once()
+        assert mock_brood_eggs.call_args.args[:2] == ("123", ["456", "789"])
+        assert mock_brood_eggs.call_args.args[3:] == (5, BASE_DAILY_ACTIONS)
+        mock_record_brooding.assert_not_called()
+        mock_hatch.assert_not_called()
+        mock_consume_actions.assert_not_called()
+
+        msg = mock_interaction.followup.send.call_args_list[0][0][0]
+        assert "**A Nest** (needs 6 more broods)" in msg
+        assert "**B Nest** (needs 5 more broods)" in msg
+        assert "You have 3 actions remaining today." in msg
+
+    @pytest.mark.asyncio
+    async def test_brood_all_hatches_only_eggs_reaching_threshold(self, mock_interaction):
+        """Only eggs that reach 10 take the per-egg hatch path; stuck eggs skip the bulk write."""
+        bot = AsyncMock()
+        cog = IncubationCommands(bot)
+        eggs = {
+            "456": {"user_id": "456", "brooding_progress": 9, "protected_prayers": False},
+            "789": {"user_id": "789", "brooding_progress": 10, "protected_prayers": False},
         }
-        mock_interaction.guild.get_member = MagicMock(side_effect=lambda uid: member_by_id.get(uid))
+        target_a, target_b, patches = self._brood_all_fixtures(mock_interaction, eggs)
 
-        players = [
-            {"user_id": "456", "nest_name": "A Nest", "locked": False},
-            {"user_id": "789", "nest_name": "B Nest", "locked": False},
-        ]
+        mock_brood_eggs = AsyncMock(return_value={"456": 10})
+        mock_hatch = AsyncMock(side_effect=lambda user, egg, nest: ("hatch", {}, nest, user, 1))
+        mock_send_hatch = AsyncMock()
+        mock_consume_actions = AsyncMock(return_value=(True, 3))
+
+        with patches[0], patches[1], patches[2], \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
+             patch("commands.incubation.db.brood_eggs", new=mock_brood_eggs), \
+             patch.object(cog, "hatch_egg", new=mock_hatch), \
+             patch.object(cog, "send_hatching_response", new=mock_send_hatch), \
+             patch("commands.incubation.consume_actions", new=mock_consume_actions):
+
+            await cog.brood_all.callback(cog, mock_interaction)
+
+        assert mock_brood_eggs.call_args.args[1] == ["456"]
+        assert [c.args[0] for c in mock_hatch.call_args_list] == [target_a, target_b]
+        assert mock_send_hatch.await_count == 2
+        # The stuck egg skips the bulk write, so its action is spent on its own
+        mock_consume_actions.assert_awaited_once_with("123", 1, "brood")
+
+    @pytest.mark.asyncio
+    async def test_brood_all_reports_targets_lost_to_races(self, mock_interaction):
+        """Eggs the bulk write couldn't brood are reported and cost nothing."""
+        bot = AsyncMock()
+        cog = IncubationCommands(bot)
         eggs = {
             "456": {"user_id": "456", "brooding_progress": 3, "protected_prayers": False},
             "789": {"user_id": "789", "brooding_progress": 4, "protected_prayers": False},
         }
+        _, _, patches = self._brood_all_fixtures(mock_interaction, eggs)
 
-        mock_process = AsyncMock(side_effect=[
-            (("progress", 6, "A Nest", target_a), None),
-            (("progress", 5, "B Nest", target_b), None),
-        ])
-        mock_record_actions = AsyncMock()
+        # Another command brooded both between the prefilter and the bulk write
+        mock_brood_eggs = AsyncMock(return_value={})
 
-        with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
-             patch("commands.incubation.get_extra_bird_space", new=AsyncMock(return_value=0)), \
-             patch("commands.incubation.db.load_all_players", new=AsyncMock(return_value=players)), \
-             patch("commands.incubation.db.get_eggs_for_users", new=AsyncMock(return_value=eggs)), \
-             patch("commands.incubation.db.get_bird_counts_for_users", new=AsyncMock(return_value={"456": 2, "789": 3})), \
-             patch("commands.incubation.db.get_brooded_targets_today", new=AsyncMock(return_value=set())), \
-             patch.object(cog, "process_brooding", new=mock_process), \
-             patch("commands.incubation.record_actions", new=mock_record_actions):
+        with patches[0], patches[1], patches[2], \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=1)), \
+             patch("commands.incubation.db.brood_eggs", new=mock_brood_eggs):
 
             await cog.brood_all.callback(cog, mock_interaction)
 
-        mock_record_actions.assert_called_once_with(mock_interaction.user.id, 2, "brood")
-        assert mock_process.call_count == 2
+        # Every candidate is offered; the bulk write stops at the action count itself
+        assert mock_brood_eggs.call_args.args[1] == ["456", "789"]
+        assert mock_brood_eggs.call_args.args[3] == 1
+        msg = mock_interaction.followup.send.call_args[0][0]
+        assert "Target A (already brooded this egg today)" in msg
+        assert "Target B (already brooded this egg today)" in msg
+
+    @pytest.mark.asyncio
+    async def test_brood_all_skipped_targets_are_replaced_by_later_ones(self, mock_interaction):
+        """A skipped egg doesn't use up an action; the next candidate gets brooded instead."""
+        bot = AsyncMock()
+        cog = IncubationCommands(bot)
+        eggs = {
+            "456": {"user_id": "456", "brooding_progress": 3, "protected_prayers": False},
+            "789": {"user_id": "789", "brooding_progress": 4, "protected_prayers": False},
+        }
+        _, _, patches = self._brood_all_fixtures(mock_interaction, eggs)
 
-        first_kwargs = mock_process.call_args_list[0].kwargs
-        assert first_kwargs["prefetched_player"]["user_id"] == "456"
-        assert first_kwargs["prefetched_egg"]["user_id"] == "456"
-        assert first_kwargs["max_birds"] > 0
+        # A was brooded elsewhere, so the single action went to B
+        mock_brood_eggs = AsyncMock(return_value={"789": 5})
+
+        with patches[0], patches[1], patches[2], \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(side_effect=[1, 0])), \
+             patch("commands.incubation.db.brood_eggs", new=mock_brood_eggs):
+
+            await cog.brood_all.callback(cog, mock_interaction)
+
+        messages = [c.args[0] for c in mock_interaction.followup.send.call_args_list]
+        assert "**B Nest** (needs 5 more broods)" in messages[0]
+        assert "You have 0 actions remaining today." in messages[0]
+        assert "Target A (already brooded this egg today)" in messages[1]
+
+    @pytest.mark.asyncio
+    async def test_brood_all_does_not_report_targets_beyond_the_action_budget(self, mock_interaction):
+        """Once the actions run out, the remaining candidates were never tried."""
+        bot = AsyncMock()
+        cog = IncubationCommands(bot)
+        eggs = {
+            "456": {"user_id": "456", "brooding_progress": 3, "protected_prayers": False},
+            "789": {"user_id": "789", "brooding_progress": 4, "protected_prayers": False},
+        }
+        _, _, patches = self._brood_all_fixtures(mock_interaction, eggs)
+
+        with patches[0], patches[1], patches[2], \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=1)), \
+             patch("commands.incubation.db.brood_eggs", new=AsyncMock(return_value={"456": 4})):
+
+            await cog.brood_all.callback(cog, mock_interaction)
+
+        mock_interaction.followup.send.assert_called_once()
+        assert "**A Nest**" in mock_interaction.followup.send.call_args[0][0]
 
     @pytest.mark.asyncio
     async def test_brood_stuck_egg_recovery(self, mock_interaction):
@@ -236,13 +365,14 @@ class TestIncubationCommands:
         test_bird = {"commonName": "Robin", "scientificName": "Turdus migratorius", "rarityWeight": 10}
 
         bot.fetch_user = AsyncMock(return_value=target_user)
+        bot.get_user = MagicMock(return_value=None)
 
         mock_record_brooding = AsyncMock()
         mock_update_egg = AsyncMock()
-        mock_delete_egg = AsyncMock()
+        mock_hatch = AsyncMock(return_value=1)
 
         with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
-             patch("commands.incubation.record_actions", new=AsyncMock()), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(True, 4))), \
              patch("commands.incubation.db.load_player", new=AsyncMock(return_value=target_player)), \
              patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=stuck_egg)), \
              patch("commands.incubation.db.has_brooded_today", new=AsyncMock(return_value=False)), \
@@ -251,11 +381,10 @@ class TestIncubationCommands:
              patch("commands.incubation.db.add_egg_brooder", new=AsyncMock()), \
              patch("commands.incubation.get_extra_bird_space", new=AsyncMock(return_value=0)), \
              patch("commands.incubation.select_random_bird_species", new=AsyncMock(return_value=test_bird)), \
-             patch("commands.incubation.db.add_bird", new=AsyncMock()), \
              patch("commands.incubation.db.get_player_plants", new=AsyncMock(return_value=[])), \
              patch("commands.incubation.get_extra_bird_chance", new=AsyncMock(return_value=0)), \
              patch("commands.incubation.handle_blessed_egg_hatching", return_value=None), \
-             patch("commands.incubation.db.delete_egg", new=mock_delete_egg), \
+             patch("commands.incubation.db.hatch_egg", new=mock_hatch), \
              patch("commands.incubation.db.get_player_birds", new=AsyncMock(return_value=[{"id": 1}])):
 
             await cog.brood.callback(cog, mock_interaction, f"<@{target_user.id}>")
@@ -263,8 +392,71 @@ class TestIncubationCommands:
         # Should NOT have incremented brooding or recorded brooding (stuck recovery path)
         mock_record_brooding.assert_not_called()
         mock_update_egg.assert_not_called()
-        # Egg should have been deleted (hatched)
-        mock_delete_egg.assert_called_once()
+        # Egg should have been hatched in a single write
+        mock_hatch.assert_awaited_once_with(
+            "456",
+            [{"commonName": "Robin", "scientificName": "Turdus migratorius"}],
+            saved_multipliers=None,
+            new_egg_progress=0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_hatch_egg_writes_extras_and_preserved_prayers_at_once(self):
+        """Extra plant birds and a re-laid blessed egg go through the same hatch write."""
+        cog = IncubationCommands(AsyncMock())
+        target_user = MagicMock(id=456)
+        egg = {"user_id": "456", "brooding_progress": 10, "multipliers": {"Turdus migratorius": 3}, "brooded_by": []}
+        bird = {"commonName": "Robin", "scientificName": "Turdus migratorius"}
+        mock_hatch = AsyncMock(return_value=7)
+
+        with patch("commands.incubation.select_random_bird_species", new=AsyncMock(return_value=bird)), \
+             patch("commands.incubation.db.get_player_plants", new=AsyncMock(return_value=[])), \
+             patch("commands.incubation.get_extra_bird_chance", new=AsyncMock(return_value=100)), \
+             patch("commands.incubation.get_less_brood_chance", new=AsyncMock(return_value=200)), \
+             patch("commands.incubation.handle_blessed_egg_hatching", return_value={"Turdus migratorius": 3}), \
+             patch("commands.incubation.db.hatch_egg", new=mock_hatch):
+            result = await cog.hatch_egg(target_user, egg, "Nest")
+
+        assert result == ("hatch", bird, "Nest", target_user, 7, [bird])
+        mock_hatch.assert_awaited_once_with(
+            "456", [bird, bird], saved_multipliers={"Turdus migratorius": 3}, new_egg_progress=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_hatch_egg_reports_egg_hatched_elsewhere(self):
+        """If the egg is gone by the time the hatch runs, nothing is reported as hatched."""
+        cog = IncubationCommands(AsyncMock())
+        bird = {"commonName": "Robin", "scientificName": "Turdus migratorius"}
+
+        with patch("commands.incubation.select_random_bird_species", new=AsyncMock(return_value=bird)), \
+             patch("commands.incubation.db.get_player_plants", new=AsyncMock(return_value=[])), \
+             patch("commands.incubation.get_extra_bird_chance", new=AsyncMock(return_value=0)), \
+             patch("commands.incubation.handle_blessed_egg_hatching", return_value=None), \
+             patch("commands.incubation.db.hatch_egg", new=AsyncMock(return_value=None)):
+            result = await cog.hatch_egg(MagicMock(id=456), {"brooding_progress": 10, "multipliers": {}}, "Nest")
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_hatch_rpc_skips_egg_below_threshold(self):
+        """A late or retried hatch must not hatch a freshly laid egg (progress below 10)."""
+        import data.storage as db
+        sb = MagicMock()
+        sb.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data=None))
+
+        async def fake_client():
+            return sb
+
+        bird = {"commonName": "Robin", "scientificName": "Turdus migratorius"}
+        with patch("data.storage._client", fake_client):
+            assert await db.hatch_egg("456", [bird], saved_multipliers={"Turdus migratorius": 3}) is None
+
+        # The RPC only deletes (and so only hatches) an egg that reached the threshold
+        for path in ("scripts/schema.sql", "scripts/migrations/20261016_add_hatch_egg_rpc.sql"):
+            with open(os.path.join(REPO_ROOT, path), encoding="utf-8") as f:
+                sql = f.read()
+            body = sql[sql.index("FUNCTION hatch_egg"):]
+            assert "DELETE FROM eggs WHERE user_id = p_user_id AND brooding_progress >= 10;" in body
 
     @pytest.mark.asyncio
     async def test_brood_full_nest_blocks_without_incrementing(self, mock_interaction):
@@ -277,6 +469,7 @@ class TestIncubationCommands:
         target_egg = {"user_id": "456", "brooding_progress": 9, "multipliers": {}, "brooded_by": []}
 
         bot.fetch_user = AsyncMock(return_value=target_user)
+        bot.get_user = MagicMock(return_value=None)
 
         # Nest is at max capacity (45 birds, 0 extra space)
         many_birds = [{"id": i} for i in range(45)]
@@ -284,7 +477,7 @@ class TestIncubationCommands:
         mock_record_brooding = AsyncMock()
 
         with patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=5)), \
-             patch("commands.incubation.record_actions", new=AsyncMock()), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(True, 4))), \
              patch("commands.incubation.db.load_player", new=AsyncMock(return_value=target_player)), \
              patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=target_egg)), \
              patch("commands.incubation.db.has_brooded_today", new=AsyncMock(return_value=False)), \
@@ -316,7 +509,8 @@ class TestIncubationCommands:
         with patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=egg)), \
              patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=10)), \
              patch("commands.incubation.load_bird_species", new=AsyncMock(return_value=[test_bird])), \
-             patch("commands.incubation.record_actions", new=AsyncMock()), \
+             patch("commands.incubation.get_hatch_chances", new=AsyncMock(return_value=(1.0, 1.0))), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(True, 4))), \
              patch("commands.incubation.db.upsert_egg_multiplier", new=AsyncMock()), \
              patch("commands.incubation.get_prayer_effectiveness_bonus", new=AsyncMock(return_value=1.0)):
 
@@ -326,6 +520,29 @@ class TestIncubationCommands:
         msg = mock_interaction.followup.send.call_args[0][0]
         assert "You offered 3 prayers for Test Bird" in msg
 
+    @pytest.mark.asyncio
+    async def test_pray_for_bird_refused_spend_adds_no_prayers(self, mock_interaction):
+        """A concurrent command drained the budget after the check: nothing is granted."""
+        bot = AsyncMock()
+        cog = IncubationCommands(bot)
+
+        egg = {"user_id": "123", "brooding_progress": 0, "multipliers": {}, "brooded_by": []}
+        test_bird = {"scientificName": "Test Bird", "rarityWeight": 10, "commonName": "Test Bird"}
+        upsert = AsyncMock()
+
+        with patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=egg)), \
+             patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=10)), \
+             patch("commands.incubation.load_bird_species", new=AsyncMock(return_value=[test_bird])), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(False, 1))), \
+             patch("commands.incubation.db.upsert_egg_multiplier", new=upsert), \
+             patch("commands.incubation.get_prayer_effectiveness_bonus", new=AsyncMock(return_value=1.0)):
+
+            await cog.pray_for_bird.callback(cog, mock_interaction, "Test Bird", 3)
+
+        upsert.assert_not_awaited()
+        msg = mock_interaction.followup.send.call_args[0][0]
+        assert "don't have enough actions" in msg
+
     @pytest.mark.asyncio
     async def test_pray_for_bird_no_egg(self, mock_interaction):
         """Test praying when user has no egg."""
@@ -355,7 +572,8 @@ class TestIncubationCommands:
         with patch("commands.incubation.db.get_egg", new=AsyncMock(return_value=egg)), \
              patch("commands.incubation.get_remaining_actions", new=AsyncMock(return_value=20)), \
              patch("commands.incubation.load_bird_species", new=AsyncMock(return_value=[test_bird])), \
-             patch("commands.incubation.record_actions", new=AsyncMock()), \
+             patch("commands.incubation.get_hatch_chances", new=AsyncMock(return_value=(1.0, 1.0))), \
+             patch("commands.incubation.consume_actions", new=AsyncMock(return_value=(True, 4))), \
              patch("commands.incubation.db.upsert_egg_multiplier", new=track_upsert), \
              patch("commands.incubation.get_prayer_effectiveness_bonus", new=AsyncMock(return_value=1.0)):
 
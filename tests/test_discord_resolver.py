@@ -0,0 +1,189 @@
+"""
+Tests for the bot-wide Discord user/member resolver in utils.discord_resolver.
+"""
+
+import asyncio
+
+import discord
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import utils.discord_resolver as resolver
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    resolver.clear_resolver_cache()
+    resolver._paused_until = 0.0
+    yield
+    resolver.clear_resolver_cache()
+    resolver._paused_until = 0.0
+
+
+def _user(user_id):
+    return MagicMock(id=user_id, name=f"user{user_id}")
+
+
+def _not_found():
+    return discord.NotFound(MagicMock(status=404), "Unknown User")
+
+
+@pytest.mark.asyncio
+async def test_gateway_cache_skips_rest():
+    cached = _user(1)
+    bot = MagicMock()
+    bot.get_user = MagicMock(side_effect=lambda uid: cached if uid == 1 else None)
+    bot.fetch_user = AsyncMock(side_effect=_user)
+
+    users = await resolver.resolve_users(bot, ["<@1>", "2", "not-an-id"])
+
+    assert users["<@1>"] is cached
+    assert users["2"].id == 2
+    bot.fetch_user.assert_awaited_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_rest_results_and_misses_are_cached():
+    bot = MagicMock()
+    bot.get_user = MagicMock(return_value=None)
+
+    async def fetch_user(uid):
+        if uid == 1:
+            return _user(uid)
+        raise _not_found()
+    bot.fetch_user = AsyncMock(side_effect=fetch_user)
+
+    first = await resolver.resolve_users(bot, ["1", "2"])
+    second = await resolver.resolve_users(bot, ["1", "2"])
+
+    assert list(first) == ["1"] and second["1"] is first["1"]
+    assert bot.fetch_user.await_count == 2  # once per ID, not per call
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_expire():
+    bot = MagicMock()
+    bot.get_user = MagicMock(return_value=None)
+    bot.fetch_user = AsyncMock(side_effect=_user)
+
+    with patch("utils.discord_resolver.DISCORD_RESOLVE_TTL_SECONDS", -1):
+        await resolver.resolve_users(bot, ["1"])
+    await resolver.resolve_users(bot, ["1"])
+
+    assert bot.fetch_user.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_is_fetched_concurrently_under_limit():
+    in_flight = 0
+    peak = 0
+
+    async def slow_fetch(uid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _user(uid)
+
+    guild = MagicMock(id=99)
+    guild.get_member = MagicMock(return_value=None)
+    guild.fetch_member = slow_fetch
+
+    with patch("utils.discord_resolver.DISCORD_RESOLVE_CONCURRENCY", 3):
+        resolver._limiter = None
+        members = await resolver.resolve_members(guild, [str(i) for i in range(10)])
+
+    assert len(members) == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backs_off_and_retries():
+    bot = MagicMock()
+    bot.get_user = MagicMock(return_value=None)
+    bot.fetch_user = AsyncMock(side_effect=[discord.RateLimited(0.01), _user(1)])
+
+    users = await resolver.resolve_users(bot, ["1"])
+
+    assert users["1"].id == 1
+    assert bot.fetch_user.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_remembered_members_skip_rest():
+    member = _user(5)
+    member.guild = MagicMock(id=99)
+    resolver.remember_member(member)
+
+    guild = MagicMock(id=99)
+    guild.get_member = MagicMock(return_value=None)
+    guild.fetch_member = AsyncMock()
+
+    assert (await resolver.resolve_members(guild, ["5"]))["5"] is member
+    guild.fetch_member.assert_not_awaited()
+
+
+def _guild(guild_id, member_ids, chunked=False):
+    guild = MagicMock(id=guild_id, chunked=chunked)
+    guild.name = f"guild{guild_id}"
+    members = []
+    for uid in member_ids:
+        member = _user(uid)
+        member.guild = guild
+        members.append(member)
+    guild.members = members
+    guild.chunk = AsyncMock(return_value=members)
+    guild.get_member = MagicMock(return_value=None)
+    guild.fetch_member = AsyncMock()
+    return guild
+
+
+@pytest.mark.asyncio
+async def test_warmup_chunks_configured_guilds_into_cache():
+    big = _guild(1, [10, 11, 12])
+    ready = _guild(2, [20], chunked=True)
+    bot = MagicMock()
+    bot.get_guild = MagicMock(side_effect={1: big, 2: ready}.get)
+
+    total = await resolver.warm_member_cache(bot, [1, 2, 3])
+
+    assert total == 4
+    big.chunk.assert_awaited_once()
+    ready.chunk.assert_not_awaited()
+    members = await resolver.resolve_members(big, ["10", "12"])
+    assert set(members) == {"10", "12"}
+    big.fetch_member.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_warmup_failure_does_not_stop_other_guilds():
+    broken = _guild(1, [10])
+    broken.chunk = AsyncMock(side_effect=discord.ClientException("Intents.members must be enabled"))
+    ok = _guild(2, [20])
+    bot = MagicMock()
+    bot.get_guild = MagicMock(side_effect={1: broken, 2: ok}.get)
+
+    assert await resolver.warm_member_cache(bot, [1, 2]) == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_starts_in_background_once():
+    bot = MagicMock()
+    bot.get_guild = MagicMock(return_value=_guild(1, [10]))
+    resolver._warmup_task = None
+    try:
+        assert resolver.start_member_warmup(bot, []) is None
+        task = resolver.start_member_warmup(bot, [1])
+        assert task is not None
+        assert resolver.start_member_warmup(bot, [1]) is None
+        assert await task == 1
+    finally:
+        resolver._warmup_task = None
+
+
+def test_bot_leaves_startup_chunking_to_the_warmup():
+    """discord.py would otherwise chunk every guild before on_ready when members intent is on."""
+    import bot as bot_module
+
+    assert bot_module.bot._connection._chunk_guilds is False
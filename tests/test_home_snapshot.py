@@ -0,0 +1,49 @@
+"""
+Tests for the in-memory homepage snapshot in web.home.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import web.home as home
+
+
+@pytest.fixture(autouse=True)
+def reset_snapshot():
+    home._home_model = None
+    home._home_model_built_at = 0.0
+    yield
+    home._home_model = None
+    home._home_model_built_at = 0.0
+
+
+def test_first_request_builds_then_serves_from_memory():
+    build = MagicMock(return_value={"personal_nests": []})
+    with patch("web.home.build_home_model", build):
+        first = home.get_home_model()
+        second = home.get_home_model()
+    assert first is second
+    build.assert_called_once()
+
+
+def test_stale_snapshot_served_while_refreshing():
+    build = MagicMock(return_value={"personal_nests": ["new"]})
+    home._home_model = {"personal_nests": ["old"]}
+    home._home_model_built_at = 1.0  # long ago
+
+    with patch("web.home.build_home_model", build), \
+         patch("web.home.Thread") as mock_thread:
+        model = home.get_home_model()
+
+    # The stale model is returned immediately and a rebuild is kicked off
+    assert model == {"personal_nests": ["old"]}
+    mock_thread.assert_called_once_with(target=home.refresh_home_model, daemon=True)
+    build.assert_not_called()
+
+
+def test_failed_refresh_keeps_previous_snapshot():
+    home._home_model = {"personal_nests": ["old"]}
+    with patch("web.home.build_home_model", side_effect=RuntimeError("db down")):
+        home.refresh_home_model()
+    assert home._home_model == {"personal_nests": ["old"]}
+    assert not home._home_refresh_lock.locked()
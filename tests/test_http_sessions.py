@@ -0,0 +1,41 @@
+"""
+Tests for the shared outbound HTTP sessions in utils.http.
+"""
+
+import pytest
+
+import utils.http as http_sessions
+
+
+@pytest.fixture(autouse=True)
+async def close_sessions():
+    yield
+    await http_sessions.close_http_sessions()
+
+
+@pytest.mark.asyncio
+async def test_same_name_reuses_session():
+    session = http_sessions.get_http_session()
+    assert http_sessions.get_http_session() is session
+    assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_named_sessions_share_one_connector():
+    default = http_sessions.get_http_session()
+    wiki = http_sessions.get_http_session("wikipedia", headers={"User-Agent": "test"})
+
+    assert wiki is not default
+    assert wiki.connector is default.connector
+    assert wiki.headers["User-Agent"] == "test"
+
+
+@pytest.mark.asyncio
+async def test_close_closes_sessions_and_connector():
+    session = http_sessions.get_http_session()
+    connector = session.connector
+
+    await http_sessions.close_http_sessions()
+
+    assert session.closed and connector.closed
+    assert http_sessions.get_http_session() is not session
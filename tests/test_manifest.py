@@ -80,9 +80,12 @@ def manifest_cog():
     async def mock_get_remaining_actions(user_id):
         return actions_state["remaining"]
 
-    async def mock_record_actions(user_id, count, action_type=None):
+    async def mock_consume_actions(user_id, count, action_type=None):
+        if count > actions_state["remaining"]:
+            return False, actions_state["remaining"]
         actions_state["remaining"] -= count
         actions_state["used"] += count
+        return True, actions_state["remaining"]
 
     # --- async mocks for data.storage (db) ---
     async def mock_load_manifested_birds():
@@ -108,7 +111,7 @@ def manifest_cog():
 
     patches = {
         "commands.manifest.get_remaining_actions": mock_get_remaining_actions,
-        "commands.manifest.record_actions": mock_record_actions,
+        "commands.manifest.consume_actions": mock_consume_actions,
         "commands.manifest.db.load_manifested_birds": mock_load_manifested_birds,
         "commands.manifest.db.upsert_manifested_bird": mock_upsert_manifested_bird,
         "commands.manifest.db.load_manifested_plants": mock_load_manifested_plants,
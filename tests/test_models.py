@@ -15,7 +15,7 @@ from utils.time_utils import get_current_date
 
 from data.models import (
     get_remaining_actions,
-    record_actions,
+    consume_actions,
     add_bonus_actions,
     is_first_action_of_type,
     get_egg_cost,
@@ -23,12 +23,22 @@ from data.models import (
     bless_egg,
     handle_blessed_egg_hatching,
     select_random_bird_species,
+    get_hatch_chances,
     load_bird_species,
     clear_bird_species_cache,
+    clear_plant_species_cache,
+    clear_milestone_snapshot,
+    get_extra_garden_space,
+    get_extra_bird_space_sync,
+    get_prayer_effectiveness_bonus,
+    load_plant_species,
     get_nest_building_bonus,
     get_singing_bonus,
     get_seed_gathering_bonus,
     get_singing_inspiration_chance,
+    get_swooping_bonus,
+    get_bird_effect,
+    parse_bird_effect,
     get_less_brood_chance,
     get_extra_bird_chance,
 )
@@ -57,22 +67,38 @@ def _make_daily_actions(used=0, action_history=None):
     return {"used": used, "action_history": action_history or []}
 
 
+def _patch_bird_effects(effects):
+    """Serve the given {scientific_name: effect} map as the species JSON, so bonuses go through the registry."""
+    species = [
+        {"commonName": name, "scientificName": name, "rarityWeight": 1, "effect": effect}
+        for name, effect in effects.items()
+    ]
+    return patch("data.models._load_bird_species_json", return_value=species)
+
+
 @pytest.fixture
 def mock_db():
     """Patch data.storage (imported as db in models) with AsyncMocks."""
     clear_bird_species_cache()
+    clear_plant_species_cache()
+    clear_milestone_snapshot()
     with patch("data.models.db") as db:
         db.load_player = AsyncMock(return_value=_make_player())
         db.get_player_birds = AsyncMock(return_value=[])
         db.get_daily_actions = AsyncMock(return_value=None)
         db.upsert_daily_actions = AsyncMock()
+        db.consume_actions = AsyncMock(return_value=(True, BASE_DAILY_ACTIONS))
         db.increment_player_field = AsyncMock()
         db.get_egg = AsyncMock(return_value=None)
         db.update_egg = AsyncMock()
         db.load_manifested_birds = AsyncMock(return_value=[])
         db.load_manifested_plants = AsyncMock(return_value=[])
+        db.manifested_plants_generation = MagicMock(return_value=0)
+        db.research_progress_generation = MagicMock(return_value=0)
         yield db
     clear_bird_species_cache()
+    clear_plant_species_cache()
+    clear_milestone_snapshot()
 
 
 # ===================================================================
@@ -132,61 +158,41 @@ class TestGetRemainingActions:
 
 
 # ===================================================================
-# record_actions
+# consume_actions
 # ===================================================================
 
-class TestRecordActions:
-    @pytest.mark.asyncio
-    async def test_record_simple(self, mock_db):
-        """Recording actions when no bonus_actions exist."""
-        await record_actions("123", 2)
-        mock_db.upsert_daily_actions.assert_awaited_once()
-        args = mock_db.upsert_daily_actions.call_args
-        # user_id, today, new_used, history
-        assert args[0][2] == 2  # new_used
+class TestConsumeActions:
+    """Budget checks and bonus-first consumption live in the consume_actions RPC;
+    these tests cover the Python side of the call."""
 
     @pytest.mark.asyncio
-    async def test_record_with_action_type(self, mock_db):
-        """Action type should be appended to the history."""
-        await record_actions("123", 1, "build")
-        args = mock_db.upsert_daily_actions.call_args
-        history = args[0][3]
-        assert history == ["build"]
+    async def test_consume_calls_rpc(self, mock_db):
+        mock_db.consume_actions.return_value = (True, 4)
+        await consume_actions("123", 2)
+        mock_db.consume_actions.assert_awaited_once_with(
+            "123", get_current_date(), 2, None, BASE_DAILY_ACTIONS
+        )
 
     @pytest.mark.asyncio
-    async def test_bonus_actions_consumed_first(self, mock_db):
-        """Bonus actions should be consumed before regular actions."""
-        mock_db.load_player.return_value = _make_player(bonus_actions=2)
-        await record_actions("123", 3, "build")
-
-        # Should decrement bonus_actions by 2
-        mock_db.increment_player_field.assert_awaited_once_with("123", "bonus_actions", -2)
-
-        # Only 1 regular action used (3 total - 2 bonus)
-        args = mock_db.upsert_daily_actions.call_args
-        assert args[0][2] == 1  # new_used = 0 + 1
-        # History should still have 3 entries (all count toward history)
-        assert args[0][3] == ["build", "build", "build"]
+    async def test_consume_with_action_type(self, mock_db):
+        mock_db.consume_actions.return_value = (True, 4)
+        await consume_actions(123, 1, "build")
+        args = mock_db.consume_actions.call_args[0]
+        assert args[0] == "123"
+        assert args[3] == "build"
 
     @pytest.mark.asyncio
-    async def test_all_covered_by_bonus(self, mock_db):
-        """When bonus covers everything, no regular actions are consumed."""
-        mock_db.load_player.return_value = _make_player(bonus_actions=5)
-        await record_actions("123", 3)
-
-        mock_db.increment_player_field.assert_awaited_once_with("123", "bonus_actions", -3)
-        args = mock_db.upsert_daily_actions.call_args
-        assert args[0][2] == 0  # no regular actions used
+    async def test_consume_over_budget_writes_nothing_client_side(self, mock_db):
+        """When the RPC refuses (budget exhausted), nothing is written client-side."""
+        mock_db.consume_actions.return_value = (False, 1)
+        assert await consume_actions("123", 3, "build") == (False, 1)
+        mock_db.upsert_daily_actions.assert_not_awaited()
+        mock_db.increment_player_field.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_record_appends_to_existing(self, mock_db):
-        """Recording should add to existing daily action state."""
-        mock_db.get_daily_actions.return_value = _make_daily_actions(used=1, action_history=["seed"])
-        await record_actions("123", 1, "build")
-
-        args = mock_db.upsert_daily_actions.call_args
-        assert args[0][2] == 2  # 1 existing + 1 new
-        assert args[0][3] == ["seed", "build"]
+    async def test_consume_actions_passes_through(self, mock_db):
+        mock_db.consume_actions.return_value = (False, 0)
+        assert await consume_actions("123", 1, "seed") == (False, 0)
 
 
 # ===================================================================
@@ -397,6 +403,36 @@ class TestSelectRandomBirdSpecies:
             # Bird A should dominate with 100x weight
             assert a_count > 150, f"Bird A should appear most often, got {a_count}/200"
 
+    @pytest.mark.asyncio
+    async def test_prayer_delta_region(self, mock_db):
+        test_birds = [
+            {"commonName": "Bird A", "scientificName": "A a", "rarityWeight": 10},
+            {"commonName": "Bird B", "scientificName": "B b", "rarityWeight": 30},
+        ]
+        # Total weight is 10 + 30 + 10 * (3 - 1) = 60; draws past 40 land in A's prayer delta
+        with patch("data.models._load_bird_species_json", return_value=test_birds):
+            with patch("data.models.random.random", return_value=0.8):
+                assert (await select_random_bird_species({"A a": 3}))["scientificName"] == "A a"
+            with patch("data.models.random.random", return_value=0.3):
+                assert (await select_random_bird_species({"A a": 3}))["scientificName"] == "B b"
+            with patch("data.models.random.random", return_value=0.1):
+                assert (await select_random_bird_species({"A a": 3}))["scientificName"] == "A a"
+
+    @pytest.mark.asyncio
+    async def test_hatch_chances_match_weights(self, mock_db):
+        test_birds = [
+            {"commonName": "Bird A", "scientificName": "A a", "rarityWeight": 10},
+            {"commonName": "Bird B", "scientificName": "B b", "rarityWeight": 30},
+        ]
+        with patch("data.models._load_bird_species_json", return_value=test_birds):
+            base, current = await get_hatch_chances("A a", {"A a": 3})
+            assert base == pytest.approx(0.25)
+            assert current == pytest.approx(0.5)
+            # A multiplier below 1 still gives exact odds
+            base, current = await get_hatch_chances("B b", {"B b": 0.5})
+            assert current == pytest.approx(15 / 25)
+            assert await get_hatch_chances("Nope") == (0.0, 0.0)
+
     @pytest.mark.asyncio
     async def test_includes_manifested_birds(self, mock_db):
         standard = [
@@ -431,8 +467,7 @@ class TestNestBuildingBonus:
             {"common_name": "Plains-wanderer", "scientific_name": "Pedionomus torquatus"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "Your first nest-building action of the day gives +5 bonus twigs"
+        with _patch_bird_effects({b["scientific_name"]: "Your first nest-building action of the day gives +5 bonus twigs" for b in birds}):
             bonus = await get_nest_building_bonus("123", birds)
             assert bonus == 5
 
@@ -444,8 +479,7 @@ class TestNestBuildingBonus:
             {"common_name": "Plains-wanderer", "scientific_name": "Pedionomus torquatus"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "Your first nest-building action of the day gives +5 bonus twigs"
+        with _patch_bird_effects({b["scientific_name"]: "Your first nest-building action of the day gives +5 bonus twigs" for b in birds}):
             bonus = await get_nest_building_bonus("123", birds)
             assert bonus == 0
 
@@ -464,8 +498,7 @@ class TestNestBuildingBonus:
             "Casuarius casuarius": "Your first nest-building action of the day gives +3 bonus twigs",
         }
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.side_effect = lambda sn: effects.get(sn, "")
+        with _patch_bird_effects(effects):
             bonus = await get_nest_building_bonus("123", birds)
             assert bonus == 13  # 5 + 3 + 5
 
@@ -475,7 +508,7 @@ class TestNestBuildingBonus:
         birds = [
             {"common_name": "Australian White Ibis", "scientific_name": "Threskiornis molucca"},
         ]
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock, return_value=""):
+        with _patch_bird_effects({b["scientific_name"]: "" for b in birds}):
             bonus = await get_nest_building_bonus("123", birds)
             assert bonus == 0
 
@@ -493,8 +526,7 @@ class TestSingingBonus:
             "Pezoporus occidentalis": "All your songs give +10 bonus actions to the target",
         }
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.side_effect = lambda sn: effects.get(sn, "")
+        with _patch_bird_effects(effects):
             bonus = await get_singing_bonus(birds)
             assert bonus == 13
 
@@ -505,8 +537,7 @@ class TestSingingBonus:
             {"common_name": "Orange-bellied Parrot", "scientific_name": "Neophema chrysogaster"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "All your songs give +3 bonus actions to the target"
+        with _patch_bird_effects({b["scientific_name"]: "All your songs give +3 bonus actions to the target" for b in birds}):
             bonus = await get_singing_bonus(birds)
             assert bonus == 6
 
@@ -515,7 +546,7 @@ class TestSingingBonus:
         birds = [
             {"common_name": "Australian White Ibis", "scientific_name": "Threskiornis molucca"},
         ]
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock, return_value=""):
+        with _patch_bird_effects({b["scientific_name"]: "" for b in birds}):
             bonus = await get_singing_bonus(birds)
             assert bonus == 0
 
@@ -530,8 +561,7 @@ class TestSeedGatheringBonus:
             {"common_name": "Major Mitchell's Cockatoo", "scientific_name": "Lophochroa leadbeateri"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "Your first seed gathering action of the day also gives +1 garden size"
+        with _patch_bird_effects({b["scientific_name"]: "Your first seed gathering action of the day also gives +1 garden size" for b in birds}):
             bonus = await get_seed_gathering_bonus("123", birds)
             assert bonus == 2
 
@@ -543,8 +573,7 @@ class TestSeedGatheringBonus:
             {"common_name": "Gang-gang Cockatoo", "scientific_name": "Callocephalon fimbriatum"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "Your first seed gathering action of the day also gives +1 garden size"
+        with _patch_bird_effects({b["scientific_name"]: "Your first seed gathering action of the day also gives +1 garden size" for b in birds}):
             bonus = await get_seed_gathering_bonus("123", birds)
             assert bonus == 0
 
@@ -559,8 +588,7 @@ class TestSingingInspirationChance:
             {"common_name": "Gouldian Finch", "scientific_name": "Erythrura gouldiae"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "has a 50% chance to give you +1 inspiration"
+        with _patch_bird_effects({b["scientific_name"]: "has a 50% chance to give you +1 inspiration" for b in birds}):
             # Force random to always succeed
             with patch("data.models.random.random", return_value=0.1):
                 bonus = await get_singing_inspiration_chance("123", birds)
@@ -574,8 +602,7 @@ class TestSingingInspirationChance:
             {"common_name": "Black-throated Finch", "scientific_name": "Poephila cincta"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "has a 50% chance to give you +1 inspiration"
+        with _patch_bird_effects({b["scientific_name"]: "has a 50% chance to give you +1 inspiration" for b in birds}):
             bonus = await get_singing_inspiration_chance("123", birds)
             assert bonus == 0
 
@@ -587,14 +614,46 @@ class TestSingingInspirationChance:
             {"common_name": "Black-throated Finch", "scientific_name": "Poephila cincta"},
         ]
 
-        with patch("data.models.get_bird_effect", new_callable=AsyncMock) as mock_effect:
-            mock_effect.return_value = "has a 50% chance to give you +1 inspiration"
+        with _patch_bird_effects({b["scientific_name"]: "has a 50% chance to give you +1 inspiration" for b in birds}):
             # Force random to fail
             with patch("data.models.random.random", return_value=0.9):
                 bonus = await get_singing_inspiration_chance("123", birds)
                 assert bonus == 0
 
 
+class TestBirdRegistry:
+    def test_parse_bird_effect(self):
+        assert parse_bird_effect("Your first nest-building action of the day gives +5 twigs.")["build"] == 5
+        assert parse_bird_effect("All your songs give +10 actions.")["song"] == 10
+        assert parse_bird_effect("Your first seed gathering action of the day also gives +1 garden size")["seed_garden"] == 1
+        assert parse_bird_effect("Your first swoop of the day is +7 points more effective.")["swoop"] == 7
+        assert parse_bird_effect(
+            "Your first singing action of the day has a 90% chance to give you +1 inspiration"
+        )["inspiration_chances"] == (0.9,)
+        assert parse_bird_effect("Just looks amazing.") == parse_bird_effect("")
+
+    @pytest.mark.asyncio
+    async def test_swooping_bonus_from_registry(self, mock_db):
+        birds = [
+            {"common_name": "Powerful Owl", "scientific_name": "Ninox strenua"},
+            {"common_name": "Powerful Owl", "scientific_name": "Ninox strenua"},
+            {"common_name": "Unknown", "scientific_name": "Not a species"},
+        ]
+        with _patch_bird_effects({"Ninox strenua": "Your first swoop of the day is +3 points more effective."}):
+            assert await get_swooping_bonus("123", birds) == 6
+
+    @pytest.mark.asyncio
+    async def test_registry_built_once_per_cache_generation(self, mock_db):
+        with _patch_bird_effects({"Ninox strenua": "All your songs give +2 actions."}) as mock_json:
+            assert await get_bird_effect("Ninox strenua") == "All your songs give +2 actions."
+            assert await get_bird_effect("Missing species") == ""
+            await get_singing_bonus([{"scientific_name": "Ninox strenua"}] * 5)
+            assert mock_json.call_count == 1
+            clear_bird_species_cache()
+            await get_bird_effect("Ninox strenua")
+            assert mock_json.call_count == 2
+
+
 # ===================================================================
 # Plant effect bonuses (async - they load plant species from DB)
 # ===================================================================
@@ -741,3 +800,73 @@ class TestExtraBirdChance:
         with patch("data.models._load_plant_species_json", return_value=plant_species):
             chance = await get_extra_bird_chance(plants)
             assert chance == 7
+
+
+class TestPlantSpeciesCache:
+    @pytest.mark.asyncio
+    async def test_cached_until_generation_changes(self, mock_db):
+        plant_species = [
+            {"commonName": "Waratah", "scientificName": "Telopea speciosissima", "effect": ""},
+        ]
+        manifested = {
+            "common_name": "Manifested Fern",
+            "scientific_name": "M f",
+            "effect": "+5% chance of your eggs needing one less brood",
+            "fully_manifested": True,
+        }
+
+        with patch("data.models._load_plant_species_json", return_value=plant_species) as mock_json:
+            assert len(await load_plant_species()) == 1
+            await get_less_brood_chance([{"common_name": "Waratah"}])
+            assert mock_json.call_count == 1
+            assert mock_db.load_manifested_plants.await_count == 1
+
+            # A plant becoming fully manifested bumps the generation and triggers a rebuild
+            mock_db.load_manifested_plants.return_value = [manifested]
+            mock_db.manifested_plants_generation.return_value = 1
+            assert len(await load_plant_species()) == 2
+            assert await get_less_brood_chance([{"common_name": "Manifested Fern"}]) == 5
+            assert mock_db.load_manifested_plants.await_count == 2
+
+
+class TestMilestoneSnapshot:
+    @pytest.mark.asyncio
+    async def test_bonuses_from_one_snapshot(self, mock_db):
+        mock_db.load_all_research_entities = MagicMock(return_value=[
+            {"author": "Gardener", "milestone": "+1 Max Garden Size"},
+            {"author": "Keeper", "milestone": "+1 Bird Limit"},
+            {"author": "Priest", "milestone": "Prayers are 1% more effective. Compounding!"},
+            {"author": "Nobody", "milestone": ""},
+        ])
+        # 750 reaches the first two thresholds, 299 reaches none
+        mock_db.load_research_progress = AsyncMock(return_value={"Gardener": 750, "Keeper": 299, "Priest": 1500})
+        mock_db.load_research_progress_sync = MagicMock(return_value={"Gardener": 750, "Keeper": 300, "Priest": 1500})
+
+        assert await get_extra_garden_space() == 2
+        assert await get_prayer_effectiveness_bonus() == pytest.approx(1.03)
+        assert get_extra_bird_space_sync() == 0  # shares the async snapshot
+        assert mock_db.load_research_progress.await_count == 1
+        mock_db.load_research_progress_sync.assert_not_called()
+
+        # Research moving forward invalidates the snapshot
+        mock_db.research_progress_generation.return_value = 1
+        assert get_extra_bird_space_sync() == 1
+        mock_db.load_research_progress_sync.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upsert_fully_manifested_plant_bumps_generation():
+    import data.storage as storage
+
+    client = MagicMock()
+    client.table.return_value.upsert.return_value.execute = AsyncMock()
+
+    async def fake_client():
+        return client
+
+    with patch("data.storage._client", fake_client):
+        before = storage.manifested_plants_generation()
+        await storage.upsert_manifested_plant({"scientific_name": "M f", "fully_manifested": False})
+        assert storage.manifested_plants_generation() == before
+        await storage.upsert_manifested_plant({"scientific_name": "M f", "fully_manifested": True})
+        assert storage.manifested_plants_generation() == before + 1
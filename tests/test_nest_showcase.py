@@ -15,6 +15,13 @@ def _write_image(path, color, size=(200, 200), mode="RGB"):
     image.save(path)
 
 
+@pytest.fixture(autouse=True)
+def clear_layer_cache():
+    nest_showcase.clear_layer_cache()
+    yield
+    nest_showcase.clear_layer_cache()
+
+
 @pytest.mark.asyncio
 async def test_build_showcase_payload_falls_back_when_featured_missing(tmp_path, monkeypatch):
     species_dir = tmp_path / "species_images"
@@ -178,3 +185,50 @@ async def test_render_showcase_png_returns_nonempty_bytes(tmp_path, monkeypatch)
 
     assert isinstance(png, bytes)
     assert len(png) > 0
+
+
+def _render_fixture(tmp_path, monkeypatch):
+    papyrus_path = tmp_path / "papyrus.jpg"
+    featured_path = tmp_path / "featured.jpg"
+    nest_overlay_path = tmp_path / "nest.png"
+    sticker_path = tmp_path / "sticker.png"
+
+    _write_image(str(papyrus_path), (255, 255, 255))
+    _write_image(str(featured_path), (30, 30, 200))
+    _write_image(str(nest_overlay_path), (0, 0, 0, 0), mode="RGBA")
+    _write_image(str(sticker_path), (255, 0, 0, 255), mode="RGBA")
+
+    monkeypatch.setattr(nest_showcase, "PAPYRUS_PATH", str(papyrus_path))
+    monkeypatch.setattr(nest_showcase, "NEST_OVERLAY_PATH", str(nest_overlay_path))
+
+    return {
+        "featured_image_path": str(featured_path),
+        "decorations": [
+            {"image_path": str(sticker_path), "x": 50, "y": 50, "size": 20, "rotation": 30, "z_index": 1},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_render_showcase_png_reuses_cached_layers(tmp_path, monkeypatch):
+    payload = _render_fixture(tmp_path, monkeypatch)
+    first = await nest_showcase.render_showcase_png(payload)
+
+    # Same sticker at a rotation in the same bucket
+    payload["decorations"][0]["rotation"] = 30.4
+    with patch("PIL.Image.open", side_effect=AssertionError("layer decoded again")):
+        second = await nest_showcase.render_showcase_png(payload)
+
+    assert second == first
+    assert len(nest_showcase._layer_cache) == 4
+
+
+@pytest.mark.asyncio
+async def test_layer_cache_stays_within_memory_budget(tmp_path, monkeypatch):
+    payload = _render_fixture(tmp_path, monkeypatch)
+    monkeypatch.setattr(nest_showcase, "SHOWCASE_LAYER_CACHE_BYTES", 1)
+
+    png = await nest_showcase.render_showcase_png(payload)
+
+    assert len(png) > 0
+    assert len(nest_showcase._layer_cache) == 1
@@ -0,0 +1,46 @@
+"""
+Tests for the concurrent page query fan-out in web.fetch.
+"""
+
+import threading
+import time
+
+import pytest
+
+from web.fetch import fetch_concurrently, get_page_timings
+
+
+def test_queries_run_concurrently_and_are_timed():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def query(value):
+        def run():
+            # Only passes if all three queries are in flight at once
+            barrier.wait()
+            return value
+        return run
+
+    start = time.perf_counter()
+    results = fetch_concurrently("test_page", {"a": query(1), "b": query(2), "c": query(3)})
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert time.perf_counter() - start < 2
+
+    timings = get_page_timings()["test_page"]
+    assert set(timings["queries"]) == {"a", "b", "c"}
+    assert timings["total_ms"] >= 0
+
+
+def test_failure_is_raised_after_all_queries_finish():
+    finished = []
+
+    def slow_ok():
+        time.sleep(0.05)
+        finished.append("ok")
+        return "ok"
+
+    def broken():
+        raise RuntimeError("query failed")
+
+    with pytest.raises(RuntimeError, match="query failed"):
+        fetch_concurrently("test_failure", {"broken": broken, "slow": slow_ok})
+    assert finished == ["ok"]
@@ -0,0 +1,73 @@
+"""
+Tests for the shared sync Supabase connection pool in data.db.
+
+create_client is patched so we can drive the pooled httpx client against a local server.
+"""
+
+import http.server
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import data.db as db_module
+
+
+class _OkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+@pytest.fixture
+def pooled_http():
+    """Build the shared client, returning the httpx client it was given."""
+    captured = {}
+
+    def fake_create_client(url, key, options=None):
+        captured["http"] = options.httpx_client
+        return MagicMock()
+
+    db_module._sync_client = None
+    with patch("data.db.create_client", side_effect=fake_create_client), \
+         patch("data.db.SUPABASE_KEY", "test-key"), \
+         patch.dict(db_module._pool_stats, {"requests": 0, "connections_created": 0}):
+        yield captured
+        if "http" in captured:
+            captured["http"].close()
+    db_module._sync_client = None
+
+
+def test_all_threads_share_one_client(pooled_http):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        clients = list(pool.map(lambda _: db_module.get_sync_client(), range(8)))
+    assert all(c is clients[0] for c in clients)
+
+
+def test_connections_are_reused(pooled_http, local_server):
+    db_module.get_sync_client()
+    http = pooled_http["http"]
+    for _ in range(5):
+        assert http.get(local_server).text == "ok"
+
+    stats = db_module.get_sync_pool_stats()
+    assert stats["requests"] == 5
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 4
@@ -0,0 +1,92 @@
+"""
+Tests for the per-interaction read memo in data.storage.
+
+The Supabase client is replaced with a MagicMock chain so we can count round-trips.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import data.storage as db
+
+
+def _make_client(select_data):
+    client = MagicMock()
+    response = MagicMock()
+    response.data = select_data
+
+    chain = MagicMock()
+    chain.execute = AsyncMock(return_value=response)
+    for method in ("select", "eq", "insert", "update", "upsert", "delete", "lt"):
+        getattr(chain, method).return_value = chain
+
+    client.table.return_value = chain
+    client.rpc.return_value = chain
+    return client, chain
+
+
+@pytest.fixture
+def fake_client():
+    client, chain = _make_client([{"user_id": "123", "twigs": 5, "seeds": 1}])
+
+    async def fake():
+        return client
+
+    with patch("data.storage._client", fake):
+        yield client, chain
+
+
+@pytest.mark.asyncio
+async def test_reads_not_memoized_outside_unit_of_work(fake_client):
+    _, chain = fake_client
+    await db.load_player("123")
+    await db.load_player("123")
+    assert chain.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_share_one_query(fake_client):
+    _, chain = fake_client
+    with db.unit_of_work():
+        first = await db.load_player("123")
+        second = await db.load_player(123)
+        await db.get_player("123")
+    assert chain.execute.call_count == 1
+    assert first == second
+    # Callers get their own copy, so mutation does not leak into the memo
+    first["twigs"] = 999
+    assert second["twigs"] == 5
+
+
+@pytest.mark.asyncio
+async def test_increment_invalidates_player(fake_client):
+    _, chain = fake_client
+    with db.unit_of_work():
+        await db.load_player("123")
+        await db.increment_player_field("123", "twigs", 1)
+        await db.load_player("123")
+    # select, rpc, select again
+    assert chain.execute.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_upsert_daily_actions_refreshes_memo(fake_client):
+    _, chain = fake_client
+    with db.unit_of_work():
+        await db.get_daily_actions("123", "2026-01-01")
+        await db.upsert_daily_actions("123", "2026-01-01", 3, ["build"])
+        actions = await db.get_daily_actions("123", "2026-01-01")
+    assert chain.execute.call_count == 2
+    assert actions["used"] == 3
+    assert actions["action_history"] == ["build"]
+
+
+@pytest.mark.asyncio
+async def test_add_bird_invalidates_bird_list(fake_client):
+    _, chain = fake_client
+    with db.unit_of_work():
+        await db.get_player_birds("123")
+        await db.get_player_birds("123")
+        await db.add_bird("123", "Magpie", "Gymnorhina tibicen")
+        await db.get_player_birds("123")
+    assert chain.execute.call_count == 3
@@ -0,0 +1,87 @@
+"""
+Tests for the diff-based Discord username refresh in commands.admin_utils.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import data.storage as db
+from commands.admin_utils import update_discord_usernames
+from utils.discord_resolver import clear_resolver_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_resolver():
+    clear_resolver_cache()
+    yield
+    clear_resolver_cache()
+
+
+def _players(rows):
+    async def gen(*args, **kwargs):
+        for row in rows:
+            yield row
+    return gen
+
+
+def _bot(names):
+    bot = MagicMock()
+    users = {}
+    for uid, name in names.items():
+        user = MagicMock(id=uid)
+        user.name = name
+        users[uid] = user
+    bot.get_user = MagicMock(side_effect=users.get)
+    bot.fetch_user = AsyncMock()
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_only_changed_names_are_written_in_one_update():
+    players = [
+        {"user_id": "1", "discord_username": "same"},
+        {"user_id": "2", "discord_username": "old"},
+        {"user_id": "3", "discord_username": None},
+    ]
+    bot = _bot({1: "same", 2: "new", 3: "first"})
+    mock_set = AsyncMock(return_value=2)
+
+    with patch("commands.admin_utils.db.iter_all_players", side_effect=_players(players)), \
+         patch("commands.admin_utils.db.set_discord_usernames", new=mock_set), \
+         patch("commands.admin_utils.db.update_player", new=AsyncMock()) as mock_update:
+        result = await update_discord_usernames(bot)
+
+    assert result == (2, 0, [])
+    mock_set.assert_awaited_once_with({"2": "new", "3": "first"})
+    mock_update.assert_not_called()
+    bot.fetch_user.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_invalid_ids_are_reported():
+    players = [{"user_id": "5", "discord_username": "x"}, {"user_id": "abc", "discord_username": None}]
+    bot = _bot({})
+    bot.fetch_user = AsyncMock(return_value=None)
+
+    with patch("commands.admin_utils.db.iter_all_players", side_effect=_players(players)), \
+         patch("commands.admin_utils.db.set_discord_usernames", new=AsyncMock(return_value=0)) as mock_set:
+        result = await update_discord_usernames(bot)
+
+    assert result == (0, 2, ["5"])
+    mock_set.assert_awaited_once_with({})
+
+
+@pytest.mark.asyncio
+async def test_set_discord_usernames_updates_existing_rows_through_rpc():
+    sb = MagicMock()
+    sb.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data=1))
+
+    async def fake_client():
+        return sb
+
+    with patch("data.storage._client", fake_client):
+        assert await db.set_discord_usernames({2: "new", "deleted": "gone"}) == 1
+        assert await db.set_discord_usernames({}) == 0
+
+    sb.rpc.assert_called_once_with("set_discord_usernames", {"p_names": {"2": "new", "deleted": "gone"}})
+    sb.table.assert_not_called()  # no upsert that could recreate a deleted player
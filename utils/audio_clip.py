@@ -0,0 +1,123 @@
+"""
+Shrink birdsong clips before they are cached and attached to /sing followups.
+
+When ffmpeg is available (FFMPEG_PATH) a clip is cut to BIRDSONG_CLIP_SECONDS and
+re-encoded as mono Opus in an Ogg container at BIRDSONG_OPUS_BITRATE. Without it,
+the MP3 is trimmed to the same length on frame boundaries in pure Python, which
+needs no encoder but keeps the original bitrate.
+"""
+
+import asyncio
+
+from config.config import FFMPEG_PATH, BIRDSONG_CLIP_SECONDS, BIRDSONG_OPUS_BITRATE
+from utils.logging import log_debug
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and for MPEG-2/2.5
+_MPEG1_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MPEG2_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+# How far past the ID3 tag to look for the first frame before giving up on the file
+_MAX_SYNC_SEARCH_BYTES = 16 * 1024
+
+
+def _frame_info(data: bytes, pos: int) -> tuple[int, float] | None:
+    """Return (frame length in bytes, duration in seconds) for a Layer III frame header at pos."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 0x3
+    layer = (data[pos + 1] >> 1) & 0x3
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x3
+    padding = (data[pos + 2] >> 1) & 0x1
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        bitrate = _MPEG1_BITRATES[bitrate_index] * 1000
+        return 144 * bitrate // sample_rate + padding, 1152 / sample_rate
+    bitrate = _MPEG2_BITRATES[bitrate_index] * 1000
+    return 72 * bitrate // sample_rate + padding, 576 / sample_rate
+
+
+def _audio_start(data: bytes) -> int:
+    """Offset just past a leading ID3v2 tag, if any."""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def trim_mp3(data: bytes, seconds: float) -> bytes:
+    """Cut an MP3 to about `seconds` on frame boundaries, dropping ID3 and Xing/Info headers.
+
+    Returns the input unchanged if no complete frames can be found within
+    _MAX_SYNC_SEARCH_BYTES of the start of the audio.
+    """
+    pos = _audio_start(data)
+    search_end = min(len(data) - 4, pos + _MAX_SYNC_SEARCH_BYTES)
+    while pos < search_end and _frame_info(data, pos) is None:
+        pos += 1  # skip junk before the first frame
+
+    frames = []
+    duration = 0.0
+    while duration < seconds:
+        info = _frame_info(data, pos)
+        if info is None or pos + info[0] > len(data):
+            break
+        length, frame_seconds = info
+        frame = data[pos:pos + length]
+        # A VBR header frame holds no audio and would advertise the untrimmed length
+        if frames or (b"Xing" not in frame[:64] and b"Info" not in frame[:64]):
+            frames.append(frame)
+            duration += frame_seconds
+        pos += length
+
+    if not frames:
+        return data
+    return b"".join(frames)
+
+
+async def transcode_to_opus(data: bytes, seconds: float) -> bytes | None:
+    """Re-encode a clip as trimmed mono Ogg/Opus with ffmpeg. Returns None if that fails."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            FFMPEG_PATH, "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0", "-t", str(seconds), "-ac", "1",
+            "-c:a", "libopus", "-b:a", BIRDSONG_OPUS_BITRATE, "-f", "ogg", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        log_debug(f"Could not start ffmpeg at {FFMPEG_PATH}: {e}")
+        return None
+
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(data), timeout=30)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        log_debug("ffmpeg timed out transcoding a birdsong clip")
+        return None
+
+    if proc.returncode != 0 or not out:
+        log_debug(f"ffmpeg failed transcoding a birdsong clip: {err.decode(errors='replace').strip()}")
+        return None
+    return out
+
+
+async def compact_clip(data: bytes) -> bytes:
+    """Return the smallest clip we can make: Opus if ffmpeg works, else a trimmed MP3."""
+    if FFMPEG_PATH:
+        opus = await transcode_to_opus(data, BIRDSONG_CLIP_SECONDS)
+        if opus:
+            return opus
+    return await asyncio.to_thread(trim_mp3, data, BIRDSONG_CLIP_SECONDS)
+
+
+def clip_filename(data: bytes, stem: str = "birdsong") -> str:
+    """Attachment filename with the extension matching the clip's container."""
+    return f"{stem}.ogg" if data[:4] == b"OggS" else f"{stem}.mp3"
@@ -1,18 +1,61 @@
+import asyncio
+import json
 import os
 import random
+import re
+import threading
+import time
 from collections import OrderedDict
 
 import aiohttp
 
-from config.config import XENO_CANTO_API_KEY
+from config.config import (
+    XENO_CANTO_API_KEY,
+    BIRDSONG_CACHE_DIR,
+    BIRDSONG_MEMORY_CACHE_BYTES,
+    BIRDSONG_DISK_CACHE_BYTES,
+    BIRDSONG_CACHE_TTL_SECONDS,
+    BIRDSONG_METADATA_TTL_SECONDS,
+    BIRDSONG_INDEX_FLUSH_SECONDS,
+    BIRDSONG_PREFETCH_HOURS,
+    BIRDSONG_PREFETCH_DELAY_SECONDS,
+    BIRDSONG_CLIP_SECONDS,
+    BIRDSONG_FALLBACK_RELOAD_SECONDS,
+)
 from utils.logging import log_debug
+from utils.http import get_http_session
+from utils.audio_clip import compact_clip, clip_filename, trim_mp3
 
 XENO_CANTO_API_URL = "https://xeno-canto.org/api/3/recordings"
 FALLBACK_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "audio", "birdsongs")
 
-# In-memory LRU cache: scientific_name -> mp3 bytes
+# In-memory LRU cache: scientific_name -> mp3 bytes, bounded by BIRDSONG_MEMORY_CACHE_BYTES
 _cache = OrderedDict()
-_CACHE_MAX = 50
+
+# Clips are trimmed and re-encoded by utils.audio_clip before either tier sees them.
+# On-disk cache: one <recording id>.ogg/.mp3 per species in BIRDSONG_CACHE_DIR, described by
+# index.json as scientific_name -> {"recording_id", "file", "size", "fetched_at", "last_used", "compact"}.
+# recordings.json keeps each species' xeno-canto search results as
+# scientific_name -> {"fetched_at", "recordings": [{"id", "file"}]}, refreshed after
+# BIRDSONG_METADATA_TTL_SECONDS, so a miss or refresh only needs the clip download.
+# Both are loaded lazily and guarded by _disk_lock because they are used from worker threads.
+# Cache hits only bump last_used in memory; those are written back with the next clip
+# write, or by flush_disk_index once BIRDSONG_INDEX_FLUSH_SECONDS have passed.
+_disk_index = None
+_recordings_index = None
+_disk_lock = threading.Lock()
+_disk_index_dirty = False
+_disk_index_saved_at = 0.0
+_refresh_tasks = {}  # scientific_name -> background refresh task
+
+# Fallback songs, preloaded (and trimmed) from FALLBACK_DIR as (mp3 bytes, display name).
+# The directory's mtime is re-checked at most every BIRDSONG_FALLBACK_RELOAD_SECONDS, so
+# adding, removing or renaming files is picked up without touching disk on every call.
+# Checks and reloads run in worker threads, never on the event loop.
+_fallback_pool = ()
+_fallback_dir = None
+_fallback_mtime = None
+_fallback_checked_at = 0.0
 
 
 def _cache_get(key: str) -> bytes | None:
@@ -25,97 +68,390 @@ def _cache_get(key: str) -> bytes | None:
 def _cache_put(key: str, data: bytes):
     _cache[key] = data
     _cache.move_to_end(key)
-    while len(_cache) > _CACHE_MAX:
+    # Clips are at most 1MB, so summing a few dozen lengths is cheaper than keeping a
+    # running total in sync with every direct _cache mutation
+    while len(_cache) > 1 and sum(len(v) for v in _cache.values()) > BIRDSONG_MEMORY_CACHE_BYTES:
         _cache.popitem(last=False)
 
 
+def clear_disk_index():
+    """Forget the loaded disk indexes so the next lookup re-reads them."""
+    global _disk_index, _recordings_index, _disk_index_dirty
+    with _disk_lock:
+        _disk_index = None
+        _recordings_index = None
+        _disk_index_dirty = False
+
+
+def _load_json(filename: str) -> dict:
+    try:
+        with open(os.path.join(BIRDSONG_CACHE_DIR, filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log_debug(f"Birdsong cache file {filename} unreadable, starting empty: {e}")
+        return {}
+
+
+def _save_json(filename: str, data: dict):
+    os.makedirs(BIRDSONG_CACHE_DIR, exist_ok=True)
+    path = os.path.join(BIRDSONG_CACHE_DIR, filename)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def _load_disk_index() -> dict:
+    global _disk_index
+    if _disk_index is None:
+        _disk_index = _load_json("index.json")
+    return _disk_index
+
+
+def _save_disk_index(index: dict):
+    global _disk_index_dirty, _disk_index_saved_at
+    _save_json("index.json", index)
+    _disk_index_dirty = False
+    _disk_index_saved_at = time.monotonic()
+
+
+def flush_disk_index(force: bool = False):
+    """Write last_used updates from cache hits back to index.json.
+
+    Only writes if there are any, and (unless force) only once BIRDSONG_INDEX_FLUSH_SECONDS
+    have passed since the last write. Does blocking I/O; call it from a worker thread.
+    """
+    with _disk_lock:
+        if not _disk_index_dirty or _disk_index is None:
+            return
+        if not force and time.monotonic() - _disk_index_saved_at < BIRDSONG_INDEX_FLUSH_SECONDS:
+            return
+        _save_disk_index(_disk_index)
+
+
+def _load_recordings_index() -> dict:
+    global _recordings_index
+    if _recordings_index is None:
+        _recordings_index = _load_json("recordings.json")
+    return _recordings_index
+
+
+def _recordings_get(scientific_name: str) -> dict | None:
+    with _disk_lock:
+        return _load_recordings_index().get(scientific_name)
+
+
+def _recordings_put(scientific_name: str, recordings: list[dict]):
+    with _disk_lock:
+        index = _load_recordings_index()
+        index[scientific_name] = {"fetched_at": time.time(), "recordings": recordings}
+        _save_json("recordings.json", index)
+
+
+def _disk_entry(scientific_name: str) -> dict | None:
+    with _disk_lock:
+        return _load_disk_index().get(scientific_name)
+
+
+def _is_stale(entry: dict) -> bool:
+    # Clips cached before compaction existed are refreshed like expired ones
+    return not entry.get("compact") or time.time() - entry.get("fetched_at", 0) > BIRDSONG_CACHE_TTL_SECONDS
+
+
+def _disk_get(scientific_name: str) -> tuple[bytes | None, bool]:
+    """Read a species' clip from disk. Returns (mp3 bytes or None, is_stale)."""
+    global _disk_index_dirty
+    with _disk_lock:
+        index = _load_disk_index()
+        entry = index.get(scientific_name)
+        if entry is None:
+            return None, False
+        try:
+            with open(os.path.join(BIRDSONG_CACHE_DIR, entry["file"]), "rb") as f:
+                data = f.read()
+        except OSError:
+            # File removed behind our back; drop the entry so the clip is fetched again
+            del index[scientific_name]
+            _save_disk_index(index)
+            return None, False
+        entry["last_used"] = time.time()
+        _disk_index_dirty = True
+        stale = _is_stale(entry)
+    flush_disk_index()
+    return data, stale
+
+
+def _disk_put(scientific_name: str, recording_id: str, data: bytes):
+    """Store a species' clip on disk, replacing any older recording, then evict to budget."""
+    filename = clip_filename(data, stem=re.sub(r"[^A-Za-z0-9_-]", "_", str(recording_id)))
+    with _disk_lock:
+        index = _load_disk_index()
+        os.makedirs(BIRDSONG_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(BIRDSONG_CACHE_DIR, filename), "wb") as f:
+            f.write(data)
+
+        old = index.get(scientific_name)
+        if old and old["file"] != filename:
+            _remove_clip(old["file"])
+        now = time.time()
+        index[scientific_name] = {
+            "recording_id": str(recording_id),
+            "file": filename,
+            "size": len(data),
+            "fetched_at": now,
+            "last_used": now,
+            "compact": True,
+        }
+
+        total = sum(entry["size"] for entry in index.values())
+        for name in sorted(index, key=lambda n: index[n]["last_used"]):
+            if total <= BIRDSONG_DISK_CACHE_BYTES or name == scientific_name:
+                continue
+            evicted = index.pop(name)
+            _remove_clip(evicted["file"])
+            total -= evicted["size"]
+            log_debug(f"Evicted cached birdsong for {name}")
+
+        _save_disk_index(index)
+
+
+def _remove_clip(filename: str):
+    try:
+        os.remove(os.path.join(BIRDSONG_CACHE_DIR, filename))
+    except FileNotFoundError:
+        pass
+
+
+def _touch_disk_entry(scientific_name: str) -> bool:
+    """Note a memory-tier hit in the loaded disk index. Returns True if the clip is stale.
+
+    The new last_used is persisted with the next index write rather than on every hit.
+    """
+    global _disk_index_dirty
+    with _disk_lock:
+        entry = (_disk_index or {}).get(scientific_name)
+        if entry is None:
+            return False
+        entry["last_used"] = time.time()
+        _disk_index_dirty = True
+        return _is_stale(entry)
+
+
+def _schedule_refresh(scientific_name: str):
+    """Re-download a stale clip in the background, at most once at a time per species."""
+    if scientific_name in _refresh_tasks:
+        return
+    task = asyncio.create_task(_download_birdsong(scientific_name))
+    _refresh_tasks[scientific_name] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(scientific_name, None))
+
+
 async def fetch_birdsong_audio(scientific_name: str) -> bytes | None:
-    """Fetch a short bird song MP3 from xeno-canto. Returns bytes or None."""
+    """Fetch a short bird song clip from xeno-canto. Returns bytes or None.
+
+    Clips are served from memory, then from the disk cache, and only downloaded
+    on a miss, then compacted to a few seconds of Opus (or trimmed MP3) by
+    utils.audio_clip. Clips older than BIRDSONG_CACHE_TTL_SECONDS are still served but
+    refreshed in the background. Species owned by active players are prefetched
+    during quiet hours (see prefetch_birdsongs), so /sing normally only reads a cache.
+    """
     if not XENO_CANTO_API_KEY or not scientific_name:
         return None
 
     cached = _cache_get(scientific_name)
     if cached is not None:
+        if _touch_disk_entry(scientific_name):
+            _schedule_refresh(scientific_name)
         return cached
 
-    parts = scientific_name.split()
-    if len(parts) < 2:
-        return None
+    try:
+        cached, stale = await asyncio.to_thread(_disk_get, scientific_name)
+    except OSError as e:
+        log_debug(f"Error reading cached birdsong for {scientific_name}: {e}")
+        cached, stale = None, False
+    if cached is not None:
+        _cache_put(scientific_name, cached)
+        if stale:
+            _schedule_refresh(scientific_name)
+        return cached
+
+    return await _download_birdsong(scientific_name)
+
+
+async def _search_recordings(session, scientific_name: str) -> list[dict] | None:
+    """Return a species' xeno-canto recordings, from recordings.json while it is fresh.
+
+    Returns None if the search failed, so a transient error isn't cached as "no recordings".
+    """
+    entry = await asyncio.to_thread(_recordings_get, scientific_name)
+    if entry is not None and time.time() - entry["fetched_at"] <= BIRDSONG_METADATA_TTL_SECONDS:
+        return entry["recordings"]
+
+    genus, species = scientific_name.split()[:2]
+    searched = False
+    recordings = []
+    # Try quality A first, fall back to B
+    for quality in ("A", "B"):
+        params = {
+            "query": f'gen:{genus} sp:{species} len:"0-20" q:{quality}',
+            "key": XENO_CANTO_API_KEY,
+        }
 
-    genus, species = parts[0], parts[1]
+        async with session.get(XENO_CANTO_API_URL, params=params, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+            if resp.status != 200:
+                continue
+            searched = True
+            data = await resp.json()
+            recordings = data.get("recordings", [])
+            if recordings:
+                break
+
+    if not searched:
+        # Keep using an expired list rather than nothing while xeno-canto is unhappy
+        return entry["recordings"] if entry is not None else None
+
+    recordings = [{"id": r.get("id"), "file": r.get("file")} for r in recordings[:10]]
+    await asyncio.to_thread(_recordings_put, scientific_name, recordings)
+    return recordings
+
+
+async def _download_birdsong(scientific_name: str, keep_in_memory: bool = True) -> bytes | None:
+    """Download a clip for a species and write it to disk (and memory, unless prefetching)."""
+    if len(scientific_name.split()) < 2:
+        return None
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # Try quality A first, fall back to B
-            for quality in ("A", "B"):
-                params = {
-                    "query": f'gen:{genus} sp:{species} len:"0-20" q:{quality}',
-                    "key": XENO_CANTO_API_KEY,
-                }
-
-                async with session.get(XENO_CANTO_API_URL, params=params, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                    if resp.status != 200:
-                        continue
-                    data = await resp.json()
-                    recordings = data.get("recordings", [])
-                    if recordings:
-                        break
-            else:
-                return None
+        session = get_http_session()
+        recordings = await _search_recordings(session, scientific_name)
+        if not recordings:
+            return None
 
-            if not recordings:
-                return None
+        recording = random.choice(recordings)
+        file_url = recording.get("file")
+        if not file_url:
+            return None
 
-            recording = random.choice(recordings[:10])
-            file_url = recording.get("file")
-            if not file_url:
+        # Ensure https
+        if file_url.startswith("//"):
+            file_url = "https:" + file_url
+
+        async with session.get(file_url, timeout=aiohttp.ClientTimeout(total=10)) as dl_resp:
+            if dl_resp.status != 200:
+                return None
+            # Safety: max 1MB
+            content_length = dl_resp.headers.get("Content-Length")
+            if content_length and int(content_length) > 1_000_000:
+                return None
+            mp3_data = await dl_resp.read()
+            if len(mp3_data) > 1_000_000:
                 return None
 
-            # Ensure https
-            if file_url.startswith("//"):
-                file_url = "https:" + file_url
-
-            async with session.get(file_url, timeout=aiohttp.ClientTimeout(total=10)) as dl_resp:
-                if dl_resp.status != 200:
-                    return None
-                # Safety: max 1MB
-                content_length = dl_resp.headers.get("Content-Length")
-                if content_length and int(content_length) > 1_000_000:
-                    return None
-                mp3_data = await dl_resp.read()
-                if len(mp3_data) > 1_000_000:
-                    return None
-
-            _cache_put(scientific_name, mp3_data)
-            log_debug(f"Fetched birdsong for {scientific_name} ({len(mp3_data)} bytes)")
-            return mp3_data
+        clip = await compact_clip(mp3_data)
+        if keep_in_memory:
+            _cache_put(scientific_name, clip)
+        recording_id = recording.get("id") or os.path.splitext(os.path.basename(file_url))[0]
+        try:
+            await asyncio.to_thread(_disk_put, scientific_name, recording_id, clip)
+        except OSError as e:
+            log_debug(f"Error caching birdsong for {scientific_name} on disk: {e}")
+        log_debug(f"Fetched birdsong for {scientific_name} ({len(mp3_data)} bytes, {len(clip)} after compaction)")
+        return clip
 
     except Exception as e:
         log_debug(f"Error fetching birdsong for {scientific_name}: {e}")
         return None
 
 
-def get_fallback_audio() -> tuple[bytes, str] | None:
-    """Pick a random fallback MP3 from the local directory."""
+def in_prefetch_hours(hour: int) -> bool:
+    """Whether an (Australian time) hour falls in BIRDSONG_PREFETCH_HOURS; the range may wrap midnight."""
+    start, end = BIRDSONG_PREFETCH_HOURS
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+async def prefetch_birdsongs(scientific_names) -> int:
+    """Download clips for species that have no fresh clip on disk. Returns how many were fetched.
+
+    Prefetched clips go to disk only, so a night's prefetch doesn't flush the memory tier.
+    """
+    if not XENO_CANTO_API_KEY:
+        return 0
+
+    fetched = 0
+    for scientific_name in scientific_names:
+        entry = await asyncio.to_thread(_disk_entry, scientific_name)
+        if entry is not None and not _is_stale(entry):
+            continue
+        if await _download_birdsong(scientific_name, keep_in_memory=False):
+            fetched += 1
+        await asyncio.sleep(BIRDSONG_PREFETCH_DELAY_SECONDS)
+    return fetched
+
+
+def load_fallback_pool():
+    """(Re)load every fallback MP3 in FALLBACK_DIR into memory."""
+    global _fallback_pool, _fallback_dir, _fallback_mtime, _fallback_checked_at
+    directory = FALLBACK_DIR
+    pool = []
     try:
-        files = [f for f in os.listdir(FALLBACK_DIR) if f.endswith(".mp3")]
-        if not files:
-            return None
-        chosen = random.choice(files)
-        path = os.path.join(FALLBACK_DIR, chosen)
-        with open(path, "rb") as f:
-            data = f.read()
-        name = os.path.splitext(chosen)[0].replace("_", " ").title()
-        return data, name
-    except Exception as e:
-        log_debug(f"Error loading fallback birdsong: {e}")
+        mtime = os.stat(directory).st_mtime_ns
+        for filename in sorted(f for f in os.listdir(directory) if f.endswith(".mp3")):
+            with open(os.path.join(directory, filename), "rb") as f:
+                data = trim_mp3(f.read(), BIRDSONG_CLIP_SECONDS)
+            name = os.path.splitext(filename)[0].replace("_", " ").title()
+            pool.append((data, name))
+    except OSError as e:
+        log_debug(f"Error loading fallback birdsongs: {e}")
+        mtime = None
+
+    _fallback_pool = tuple(pool)
+    _fallback_dir = directory
+    _fallback_mtime = mtime
+    _fallback_checked_at = time.monotonic()
+    log_debug(f"Loaded {len(pool)} fallback birdsongs from {directory}")
+
+
+def clear_fallback_pool():
+    global _fallback_pool, _fallback_dir
+    _fallback_pool = ()
+    _fallback_dir = None
+
+
+def _fallback_dir_mtime() -> int | None:
+    try:
+        return os.stat(FALLBACK_DIR).st_mtime_ns
+    except OSError:
+        return None
+
+
+async def _refresh_fallback_pool():
+    """Reload the pool in a worker thread if FALLBACK_DIR changed; callers keep the old pool meanwhile."""
+    global _fallback_checked_at
+    now = time.monotonic()
+    if _fallback_dir == FALLBACK_DIR:
+        if now - _fallback_checked_at < BIRDSONG_FALLBACK_RELOAD_SECONDS:
+            return
+        _fallback_checked_at = now  # claimed before awaiting, so concurrent calls don't re-check
+        if await asyncio.to_thread(_fallback_dir_mtime) == _fallback_mtime:
+            return
+    # load_fallback_pool swaps in the new pool in one assignment once it's fully read
+    await asyncio.to_thread(load_fallback_pool)
+
+
+async def get_fallback_audio() -> tuple[bytes, str] | None:
+    """Pick a random fallback song from the preloaded pool."""
+    await _refresh_fallback_pool()
+    if not _fallback_pool:
         return None
+    return random.choice(_fallback_pool)
 
 
 async def get_birdsong_for_bird(bird: dict) -> tuple[bytes | None, str, bool]:
     """Main entry point: try xeno-canto, fall back to local files.
 
-    Returns (mp3_bytes_or_None, display_name, is_default).
+    Returns (audio_bytes_or_None, display_name, is_default).
     is_default is True when the song is a fallback rather than the actual bird's song.
     """
     common_name = bird.get("common_name", "A bird")
@@ -127,7 +463,7 @@ async def get_birdsong_for_bird(bird: dict) -> tuple[bytes | None, str, bool]:
         return mp3_data, common_name, False
 
     # Fall back to local files
-    fallback = get_fallback_audio()
+    fallback = await get_fallback_audio()
     if fallback:
         return fallback[0], common_name, True
 
@@ -1,6 +1,15 @@
-from config.config import MAX_GARDEN_SIZE
 import data.storage as db
 
+# Blessing type -> the player field it grows. Caps (nest space for seeds,
+# MAX_GARDEN_SIZE for gardens) are applied by the bulk update itself.
+BLESSING_FIELDS = {
+    "individual_seeds": "seeds",
+    "inspiration": "inspiration",
+    "garden_growth": "garden_size",
+    "bonus_actions": "bonus_actions",
+    "individual_nest_growth": "twigs",
+}
+
 
 def get_blessing_amount(max_resilience):
     """Calculate blessing amount based on human difficulty"""
@@ -13,29 +22,8 @@ def get_blessing_amount(max_resilience):
 
 
 async def apply_blessing(blessing_type, amount):
-    """Apply a blessing to all players via DB operations"""
-    players = await db.load_all_players()
-
-    if blessing_type == "individual_seeds":
-        for player in players:
-            user_id = player["user_id"]
-            space_left = player.get("twigs", 0) - player.get("seeds", 0)
-            add_amount = min(amount, max(0, space_left))
-            if add_amount > 0:
-                await db.increment_player_field(user_id, "seeds", add_amount)
-    elif blessing_type == "inspiration":
-        for player in players:
-            await db.increment_player_field(player["user_id"], "inspiration", amount)
-    elif blessing_type == "garden_growth":
-        for player in players:
-            user_id = player["user_id"]
-            current_size = player.get("garden_size", 0)
-            increase = min(amount, MAX_GARDEN_SIZE - current_size)
-            if increase > 0:
-                await db.increment_player_field(user_id, "garden_size", increase)
-    elif blessing_type == "bonus_actions":
-        for player in players:
-            await db.increment_player_field(player["user_id"], "bonus_actions", amount)
-    elif blessing_type == "individual_nest_growth":
-        for player in players:
-            await db.increment_player_field(player["user_id"], "twigs", amount)
+    """Apply a blessing to all players in a single set-based update. Returns players changed."""
+    field = BLESSING_FIELDS.get(blessing_type)
+    if field is None:
+        return 0
+    return await db.increment_all_players_field(field, amount)
@@ -0,0 +1,55 @@
+"""
+Sync the slash command tree only when its schema changes.
+
+tree.sync() is a slow global REST call with strict rate limits, so we hash the
+payload it would upload and keep the hash of the last successful sync in
+COMMAND_TREE_HASH_FILE. Restarts and reconnects with an unchanged tree skip the sync.
+"""
+
+import hashlib
+import json
+import os
+
+from config.config import COMMAND_TREE_HASH_FILE
+from utils.logging import log_debug
+
+
+def command_tree_hash(tree):
+    """Stable hash of the global app commands registered on the tree."""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda c: (c.get("type", 1), c["name"]),
+    )
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _read_synced_hash():
+    try:
+        with open(COMMAND_TREE_HASH_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_synced_hash(tree_hash):
+    tmp_path = f"{COMMAND_TREE_HASH_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(tree_hash)
+    os.replace(tmp_path, COMMAND_TREE_HASH_FILE)
+
+
+async def sync_command_tree(tree, force=False):
+    """Sync the tree if its schema changed since the last sync, or if force is set.
+
+    Returns (synced, command_count). The hash is only stored after a successful sync.
+    """
+    tree_hash = command_tree_hash(tree)
+    if not force and tree_hash == _read_synced_hash():
+        log_debug(f"Command tree unchanged ({tree_hash[:12]}), skipping sync")
+        return False, 0
+
+    synced = await tree.sync()
+    _write_synced_hash(tree_hash)
+    log_debug(f"Synced {len(synced)} commands, tree hash {tree_hash[:12]}")
+    return True, len(synced)
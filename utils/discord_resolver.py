@@ -0,0 +1,177 @@
+"""
+Bot-wide Discord user/member resolution.
+
+Lookups try the gateway cache first (bot.get_user / guild.get_member), then REST
+results cached for DISCORD_RESOLVE_TTL_SECONDS, and only then the REST API. A batch
+of IDs is fetched concurrently under one shared limiter; when Discord answers with
+a rate limit, every pending lookup backs off together before retrying.
+
+For guilds listed in MEMBER_CHUNK_GUILD_IDS, start_member_warmup chunks the member
+list in the background after login so later lookups never need fetch_member.
+"""
+
+import asyncio
+import time
+
+import discord
+
+from config.config import DISCORD_RESOLVE_CONCURRENCY, DISCORD_RESOLVE_TTL_SECONDS
+from utils.logging import log_debug
+
+# (kind, guild_id or None, user_id) -> (expires_at, user/member, or None when Discord said not found)
+_cache = {}
+_limiter = None
+_limiter_loop = None
+_paused_until = 0.0
+_warmup_task = None
+
+
+def clear_resolver_cache():
+    _cache.clear()
+
+
+def remember_member(member):
+    """Cache a member seen elsewhere (e.g. guild chunking) so later lookups skip REST."""
+    expires_at = time.monotonic() + DISCORD_RESOLVE_TTL_SECONDS
+    _cache[("member", member.guild.id, member.id)] = (expires_at, member)
+    _cache[("user", None, member.id)] = (expires_at, member)
+
+
+def parse_user_id(raw):
+    """Turn a mention or ID string into an int user ID, or None if it isn't one."""
+    try:
+        return int(str(raw).strip("<@!>"))
+    except ValueError:
+        return None
+
+
+def _get_limiter():
+    global _limiter, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = asyncio.Semaphore(DISCORD_RESOLVE_CONCURRENCY)
+        _limiter_loop = loop
+    return _limiter
+
+
+def _cached(key):
+    """Return (hit, value) for a cache key, expiring stale entries."""
+    entry = _cache.get(key)
+    if entry is None:
+        return False, None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _cache[key]
+        return False, None
+    return True, value
+
+
+async def _fetch(key, fetch, user_id):
+    global _paused_until
+    async with _get_limiter():
+        for attempt in range(2):
+            wait = _paused_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                value = await fetch(user_id)
+                break
+            except discord.NotFound:
+                value = None
+                break
+            except discord.RateLimited as e:
+                log_debug(f"Rate limited resolving {key[0]} {user_id}, backing off {e.retry_after:.1f}s")
+                _paused_until = max(_paused_until, time.monotonic() + e.retry_after)
+            except discord.HTTPException as e:
+                log_debug(f"Error resolving {key[0]} {user_id}: {e}")
+                return None
+        else:
+            return None
+
+    _cache[key] = (time.monotonic() + DISCORD_RESOLVE_TTL_SECONDS, value)
+    return value
+
+
+async def _resolve(kind, scope_id, raw_ids, lookup, fetch):
+    resolved = {}
+    pending = {}  # user_id -> raw ids waiting on it
+    for raw in raw_ids:
+        user_id = parse_user_id(raw)
+        if user_id is None:
+            continue
+        found = lookup(user_id)
+        if found is None:
+            hit, found = _cached((kind, scope_id, user_id))
+            if not hit:
+                pending.setdefault(user_id, []).append(raw)
+                continue
+        if found is not None:
+            resolved[raw] = found
+
+    if pending:
+        fetched = await asyncio.gather(*(
+            _fetch((kind, scope_id, user_id), fetch, user_id) for user_id in pending
+        ))
+        for (user_id, raws), found in zip(pending.items(), fetched):
+            if found is not None:
+                for raw in raws:
+                    resolved[raw] = found
+    return resolved
+
+
+async def resolve_users(bot, user_ids):
+    """Resolve IDs or mentions to Users. Returns {raw id: user} for the ones that exist."""
+    return await _resolve("user", None, user_ids, bot.get_user, bot.fetch_user)
+
+
+async def resolve_members(guild, user_ids):
+    """Resolve IDs or mentions to guild Members. Returns {raw id: member} for the ones found."""
+    if guild is None:
+        return {}
+    return await _resolve("member", guild.id, user_ids, guild.get_member, guild.fetch_member)
+
+
+async def warm_member_cache(bot, guild_ids):
+    """Chunk each guild's member list into the gateway cache and this cache. Returns members seen."""
+    start = time.perf_counter()
+    total = 0
+    for i, guild_id in enumerate(guild_ids, 1):
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            log_debug(f"Member warm-up {i}/{len(guild_ids)}: guild {guild_id} not found")
+            continue
+
+        guild_start = time.perf_counter()
+        try:
+            members = guild.members if guild.chunked else await guild.chunk()
+        except (discord.ClientException, discord.HTTPException, asyncio.TimeoutError) as e:
+            log_debug(f"Member warm-up {i}/{len(guild_ids)}: failed to chunk {guild.name}: {e}")
+            continue
+
+        for member in members:
+            remember_member(member)
+        total += len(members)
+        log_debug(f"Member warm-up {i}/{len(guild_ids)}: {len(members)} members from {guild.name} "
+                  f"in {time.perf_counter() - guild_start:.1f}s")
+
+    log_debug(f"Member warm-up complete: {total} members from {len(guild_ids)} guilds "
+              f"in {time.perf_counter() - start:.1f}s")
+    return total
+
+
+def start_member_warmup(bot, guild_ids):
+    """Start warm_member_cache as a background task, once (on_ready fires again on reconnects).
+
+    Returns the new task, or None if there is nothing to do or it already started.
+    """
+    global _warmup_task
+    if not guild_ids or _warmup_task is not None:
+        return None
+    _warmup_task = asyncio.create_task(warm_member_cache(bot, guild_ids))
+    return _warmup_task
+
+
+async def wait_for_member_warmup():
+    """Wait for a running warm-up, if any, so a large batch lookup can use the chunked members."""
+    if _warmup_task is not None:
+        await _warmup_task
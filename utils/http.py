@@ -0,0 +1,70 @@
+"""
+Bot-lifetime aiohttp sessions for outbound HTTP.
+
+Opening a ClientSession per call pays DNS, TCP and TLS setup every time. Instead,
+get_http_session() hands out long-lived sessions (one per name, so callers can keep
+their own default headers) that all share a single keep-alive connector with a
+per-host connection limit, a DNS cache and a default timeout. bot.main closes them
+with close_http_sessions() on shutdown.
+"""
+
+import asyncio
+
+import aiohttp
+
+from config.config import HTTP_KEEPALIVE_SECONDS, HTTP_LIMIT_PER_HOST, HTTP_TIMEOUT_SECONDS
+from utils.logging import log_debug
+
+_connector = None
+_sessions = {}  # name -> ClientSession
+_loop = None    # sessions are bound to the loop they were created on
+
+
+def _reset_if_loop_changed(loop):
+    global _connector, _loop
+    if _loop is not loop:
+        _connector = None
+        _sessions.clear()
+        _loop = loop
+
+
+def get_http_session(name="default", headers=None):
+    """Return the shared session for name, creating it (and the connector) on first use.
+
+    headers only apply when the session is created; use a distinct name for
+    callers that need different default headers.
+    """
+    global _connector
+    _reset_if_loop_changed(asyncio.get_running_loop())
+
+    session = _sessions.get(name)
+    if session is not None and not session.closed:
+        return session
+
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            ttl_dns_cache=300,
+        )
+    session = aiohttp.ClientSession(
+        connector=_connector,
+        connector_owner=False,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+    )
+    _sessions[name] = session
+    log_debug(f"Opened shared HTTP session '{name}'")
+    return session
+
+
+async def close_http_sessions():
+    """Close every shared session and the connector behind them."""
+    global _connector
+    for session in list(_sessions.values()):
+        if not session.closed:
+            await session.close()
+    _sessions.clear()
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
+    _connector = None
@@ -3,16 +3,19 @@
 import asyncio
 import io
 import os
+import threading
 import urllib.parse
-from typing import Any
-
-from PIL import Image, ImageOps
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
 
 import data.storage as db
-from config.config import SPECIES_IMAGES_DIR
+from config.config import SHOWCASE_LAYER_CACHE_BYTES, SPECIES_IMAGES_DIR
 from data.models import load_bird_species, load_treasures
 from utils.logging import log_debug
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 
 CANVAS_WIDTH = 1000
 CANVAS_HEIGHT = 1400
@@ -34,6 +37,15 @@ NEST_OVERLAY_PATH = os.path.join(STATIC_IMAGES_DIR, "ui", "nest.png")
 DECORATIONS_DIR = os.path.join(STATIC_IMAGES_DIR, "decorations")
 SPECIAL_BIRDS_DIR = os.path.join(STATIC_IMAGES_DIR, "special-birds")
 
+# Sticker rotations are snapped to this many degrees so rotated layers can be reused
+ROTATION_BUCKET_DEGREES = 2
+
+# Decoded, pre-scaled layers keyed by (builder, path, mtime, *params), least recently
+# used first, bounded by SHOWCASE_LAYER_CACHE_BYTES. Renders run in worker threads.
+_layer_cache = OrderedDict()
+_layer_cache_bytes = 0
+_layer_lock = threading.Lock()
+
 
 class NestShowcaseError(Exception):
     """Raised when a nest cannot be rendered for showcase."""
@@ -57,7 +69,9 @@ def _int_value(value: Any, default: int) -> int:
         return default
 
 
-def _cover_crop(image: Image.Image, target_width: int, target_height: int) -> Image.Image:
+def _cover_crop(image: "Image.Image", target_width: int, target_height: int) -> "Image.Image":
+    from PIL import Image
+
     scale = max(target_width / image.width, target_height / image.height)
     resized = image.resize(
         (max(1, int(image.width * scale)), max(1, int(image.height * scale))),
@@ -68,6 +82,88 @@ def _cover_crop(image: Image.Image, target_width: int, target_height: int) -> Im
     return resized.crop((left, top, left + target_width, top + target_height))
 
 
+def _layer_bytes(layer: "Image.Image") -> int:
+    return layer.width * layer.height * len(layer.getbands())
+
+
+def clear_layer_cache():
+    global _layer_cache_bytes
+    with _layer_lock:
+        _layer_cache.clear()
+        _layer_cache_bytes = 0
+
+
+def _cached_layer(path: str, build, *params) -> "Image.Image | None":
+    """Return build(image, *params) for the image file at path, or None if it is missing.
+
+    Results are cached until the file changes; callers must not modify them.
+    """
+    global _layer_cache_bytes
+    # PIL is only needed once someone renders a showcase, so keep it out of bot startup
+    from PIL import Image
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    key = (build.__name__, path, mtime, *params)
+    with _layer_lock:
+        layer = _layer_cache.get(key)
+        if layer is not None:
+            _layer_cache.move_to_end(key)
+            return layer
+
+    with Image.open(path) as source:
+        layer = build(source, *params)
+
+    with _layer_lock:
+        if key not in _layer_cache:
+            _layer_cache[key] = layer
+            _layer_cache_bytes += _layer_bytes(layer)
+        while _layer_cache_bytes > SHOWCASE_LAYER_CACHE_BYTES and len(_layer_cache) > 1:
+            _, evicted = _layer_cache.popitem(last=False)
+            _layer_cache_bytes -= _layer_bytes(evicted)
+    return layer
+
+
+def _build_background(papyrus: "Image.Image | None") -> "Image.Image":
+    """The papyrus backdrop with the translucent card already composited onto it."""
+    from PIL import Image, ImageOps
+
+    canvas = Image.new("RGBA", (CANVAS_WIDTH, CANVAS_HEIGHT), (249, 239, 214, 255))
+    if papyrus is not None:
+        papyrus = _cover_crop(papyrus.convert("RGB"), CANVAS_WIDTH, CANVAS_HEIGHT).convert("RGBA")
+        canvas.paste(papyrus, (0, 0))
+
+    card = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), (255, 255, 255, 215))
+    card = ImageOps.expand(card, border=4, fill=(120, 75, 30, 240))
+    canvas.paste(card, (CARD_X, CARD_Y), card)
+    return canvas
+
+
+def _build_featured(image: "Image.Image") -> "Image.Image":
+    return _cover_crop(image.convert("RGB"), FEATURED_WIDTH, FEATURED_HEIGHT).convert("RGBA")
+
+
+def _build_sticker(image: "Image.Image", target_width: int, rotation: int) -> "Image.Image":
+    from PIL import Image
+
+    sticker = image.convert("RGBA")
+    target_height = max(1, int(sticker.height * (target_width / sticker.width)))
+    sticker = sticker.resize((target_width, target_height), Image.Resampling.LANCZOS)
+    return sticker.rotate(-rotation, expand=True, resample=Image.Resampling.BICUBIC)
+
+
+def _build_nest_overlay(image: "Image.Image") -> "Image.Image":
+    from PIL import Image
+
+    nest_overlay = image.convert("RGBA")
+    target_width = int(FEATURED_WIDTH * 1.15)
+    target_height = max(1, int(nest_overlay.height * (target_width / nest_overlay.width)))
+    return nest_overlay.resize((target_width, target_height), Image.Resampling.LANCZOS)
+
+
 def _compute_bird_image_paths(scientific_name: str, rarity: str) -> list[str]:
     if rarity == "Special":
         return [os.path.join(SPECIAL_BIRDS_DIR, f"{scientific_name}.png")]
@@ -181,46 +277,34 @@ async def build_showcase_payload(user_id: str, allow_fallback_image: bool = Fals
 
 
 def _render_showcase_png(payload: dict) -> bytes:
-    canvas = Image.new("RGBA", (CANVAS_WIDTH, CANVAS_HEIGHT), (249, 239, 214, 255))
+    background = _cached_layer(PAPYRUS_PATH, _build_background) or _build_background(None)
+    canvas = background.copy()
 
-    if os.path.exists(PAPYRUS_PATH):
-        papyrus = Image.open(PAPYRUS_PATH).convert("RGB")
-        papyrus = _cover_crop(papyrus, CANVAS_WIDTH, CANVAS_HEIGHT).convert("RGBA")
-        canvas.paste(papyrus, (0, 0))
-
-    card = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), (255, 255, 255, 215))
-    card = ImageOps.expand(card, border=4, fill=(120, 75, 30, 240))
-    canvas.paste(card, (CARD_X, CARD_Y), card)
-
-    featured = Image.open(payload["featured_image_path"]).convert("RGB")
-    featured = _cover_crop(featured, FEATURED_WIDTH, FEATURED_HEIGHT).convert("RGBA")
+    featured_path = payload["featured_image_path"]
+    featured = _cached_layer(featured_path, _build_featured)
+    if featured is None:
+        raise FileNotFoundError(featured_path)
     canvas.paste(featured, (FEATURED_X, FEATURED_Y))
 
     decorations = sorted(payload.get("decorations", []), key=lambda item: _int_value(item.get("z_index"), 0))
     for decoration in decorations:
         image_path = decoration["image_path"]
-        if not os.path.exists(image_path):
+        target_width = max(1, int(FEATURED_WIDTH * (decoration["size"] / 100.0)))
+        rotation = round(decoration["rotation"] / ROTATION_BUCKET_DEGREES) * ROTATION_BUCKET_DEGREES % 360
+        sticker = _cached_layer(image_path, _build_sticker, target_width, rotation)
+        if sticker is None:
             log_debug(f"Showcase sticker missing: {image_path}")
             continue
 
-        sticker = Image.open(image_path).convert("RGBA")
-        target_width = max(1, int(FEATURED_WIDTH * (decoration["size"] / 100.0)))
-        target_height = max(1, int(sticker.height * (target_width / sticker.width)))
-        sticker = sticker.resize((target_width, target_height), Image.Resampling.LANCZOS)
-        sticker = sticker.rotate(-decoration["rotation"], expand=True, resample=Image.Resampling.BICUBIC)
-
         center_x = FEATURED_X + int(FEATURED_WIDTH * (decoration["x"] / 100.0))
         center_y = FEATURED_Y + int(FEATURED_HEIGHT * (decoration["y"] / 100.0))
         paste_x = center_x - (sticker.width // 2)
         paste_y = center_y - (sticker.height // 2)
         canvas.paste(sticker, (paste_x, paste_y), sticker)
 
-    if os.path.exists(NEST_OVERLAY_PATH):
-        nest_overlay = Image.open(NEST_OVERLAY_PATH).convert("RGBA")
-        target_width = int(FEATURED_WIDTH * 1.15)
-        target_height = max(1, int(nest_overlay.height * (target_width / nest_overlay.width)))
-        nest_overlay = nest_overlay.resize((target_width, target_height), Image.Resampling.LANCZOS)
-        overlay_x = FEATURED_X + ((FEATURED_WIDTH - target_width) // 2)
+    nest_overlay = _cached_layer(NEST_OVERLAY_PATH, _build_nest_overlay)
+    if nest_overlay is not None:
+        overlay_x = FEATURED_X + ((FEATURED_WIDTH - nest_overlay.width) // 2)
         overlay_y = FEATURED_Y + int(FEATURED_HEIGHT * 0.84)
         canvas.paste(nest_overlay, (overlay_x, overlay_y), nest_overlay)
 
@@ -1,6 +1,5 @@
 from flask import render_template, request, redirect, url_for, send_file, session, flash
 from config.config import ADMIN_PASSWORD, SPECIES_IMAGES_DIR, MAX_GARDEN_SIZE
-import requests
 from threading import Thread
 import os
 import json
@@ -102,46 +101,43 @@ def admin_routes(app):
                 flash("Please provide a user ID or select 'Apply to all players'", 'error')
                 return redirect(url_for('admin'))
 
+            boon_names = {
+                "bonus_actions": "Bonus Actions",
+                "seeds": "Seeds",
+                "twigs": "Twigs (Nest Capacity)",
+                "inspiration": "Inspiration",
+                "garden_size": "Garden Size"
+            }
+
+            if boon_type not in boon_names:
+                flash(f"Unknown boon type: {boon_type}", 'error')
+                return redirect(url_for('admin'))
+
             if apply_to_all:
-                all_players = db.load_all_players_sync()
-                players_by_id = {p["user_id"]: p for p in all_players}
-                user_ids = list(players_by_id.keys())
+                # One set-based update; seeds and garden size are capped per player in SQL
+                updated_count = db.increment_all_players_field_sync(boon_type, amount)
             else:
-                player = db.load_player_sync(user_id)
-                players_by_id = {user_id: player}
-                user_ids = [user_id]
-
-            for uid in user_ids:
+                p = db.load_player_sync(user_id)
                 if boon_type == "bonus_actions":
-                    db.increment_player_field_sync(uid, "bonus_actions", amount)
+                    db.increment_player_field_sync(user_id, "bonus_actions", amount)
                 elif boon_type == "seeds":
-                    p = players_by_id[uid]
                     space_left = p["twigs"] - p.get("seeds", 0)
                     actual = min(amount, space_left)
                     if actual > 0:
-                        db.increment_player_field_sync(uid, "seeds", actual)
+                        db.increment_player_field_sync(user_id, "seeds", actual)
                 elif boon_type == "twigs":
-                    db.increment_player_field_sync(uid, "twigs", amount)
+                    db.increment_player_field_sync(user_id, "twigs", amount)
                 elif boon_type == "inspiration":
-                    db.increment_player_field_sync(uid, "inspiration", amount)
+                    db.increment_player_field_sync(user_id, "inspiration", amount)
                 elif boon_type == "garden_size":
-                    p = players_by_id[uid]
                     current_size = p.get("garden_size", 0)
                     new_size = min(current_size + amount, MAX_GARDEN_SIZE)
                     increase = new_size - current_size
                     if increase > 0:
-                        db.increment_player_field_sync(uid, "garden_size", increase)
-
-            boon_names = {
-                "bonus_actions": "Bonus Actions",
-                "seeds": "Seeds",
-                "twigs": "Twigs (Nest Capacity)",
-                "inspiration": "Inspiration",
-                "garden_size": "Garden Size"
-            }
+                        db.increment_player_field_sync(user_id, "garden_size", increase)
 
             if apply_to_all:
-                flash(f"Granted {amount} {boon_names.get(boon_type, boon_type)} to all {len(user_ids)} players!", 'success')
+                flash(f"Granted {amount} {boon_names.get(boon_type, boon_type)} to all players ({updated_count} updated)!", 'success')
             else:
                 flash(f"Granted {amount} {boon_names.get(boon_type, boon_type)} to user {user_id}!", 'success')
 
@@ -156,6 +152,8 @@ def admin_routes(app):
 
 def download_species_images_thread():
     """Background thread to download species images"""
+    import requests  # Deferred: only the admin image download needs it
+
     try:
         bird_species = []
         plant_species = []
@@ -237,6 +235,8 @@ def download_species_images_thread():
 
 def fetch_image_url(scientific_name):
     """Fetches the image URL from iNaturalist."""
+    import requests
+
     api_url = f"https://api.inaturalist.org/v1/taxa?q={scientific_name}&limit=1"
     try:
         response = requests.get(api_url)
@@ -39,15 +39,13 @@ def get_awards_page():
     cutoff = (now - timedelta(days=30)).strftime('%Y-%m-%d')
 
     # Load player names
-    all_players = db.load_all_players_sync()
-    names = {p["user_id"]: p.get("nest_name", "Unknown") for p in all_players}
+    names = {p["user_id"]: p.get("nest_name", "Unknown") for p in db.iter_all_players_sync("user_id, nest_name")}
 
     # Tallies per award key per user
     tallies = defaultdict(lambda: defaultdict(int))
 
     # Daily actions
-    actions = db.get_all_daily_actions_sync(since_date=cutoff)
-    for row in actions:
+    for row in db.iter_all_daily_actions_sync(since_date=cutoff, columns="id, user_id, action_history"):
         history = row.get("action_history") or []
         for entry in history:
             award_key = ACTION_AWARDS.get(entry)
@@ -55,23 +53,21 @@ def get_awards_page():
                 tallies[award_key][row["user_id"]] += 1
 
     # Songs (count of recipients sung to in last 30 days)
-    songs = db.get_all_songs_sync(since_date=cutoff)
-    for song in songs:
+    for song in db.iter_all_songs_sync(since_date=cutoff, columns="id, singer_user_id"):
         tallies["bard"][song["singer_user_id"]] += 1
 
     # Birdwatch sightings
-    sightings = db.get_all_birdwatch_sightings_unpaginated_sync()
-    for s in sightings:
+    sightings_count = 0
+    for s in db.iter_all_birdwatch_sightings_sync():
+        sightings_count += 1
         created = (s.get("created_at") or "")[:10]
         if created >= cutoff:
             tallies["observer"][s["user_id"]] += 1
 
     # Plants
-    all_plants = db.get_all_player_plants_sync()
-    for user_id, plants in all_plants.items():
-        count = sum(1 for p in plants if (p.get("planted_date") or "") >= cutoff)
-        if count > 0:
-            tallies["gardener"][user_id] += count
+    recent_plants = db.iter_all_plants_sync("id, user_id, planted_date", filters=[("gte", "planted_date", cutoff)])
+    for plant in recent_plants:
+        tallies["gardener"][str(plant["user_id"])] += 1
 
     # Memoirs
     memoirs = db.load_memoirs_sync()
@@ -85,7 +81,7 @@ def get_awards_page():
     defeated_humans = db.get_defeated_humans_sync()
     collective = [
         {"name": "Manifested species", "emoji": "📖", "count": len(manifested_birds) + len(manifested_plants)},
-        {"name": "Sightings", "emoji": "📷", "count": len(sightings)},
+        {"name": "Sightings", "emoji": "📷", "count": sightings_count},
         {"name": "Defeated humans", "emoji": "🦅", "count": len(defeated_humans)},
     ]
 
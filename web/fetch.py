@@ -0,0 +1,57 @@
+"""
+Concurrent fan-out for the independent sync Supabase queries behind a page.
+
+The workers share the sync client's keep-alive connection pool (see data.db.get_sync_client),
+so the queries run side by side and a page waits roughly as long as its slowest query.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import PAGE_FETCH_WORKERS
+from utils.logging import log_debug
+
+_executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS, thread_name_prefix="page-fetch")
+
+# page -> {"total_ms": float, "queries": {name: ms}} for the latest fetch of that page
+_page_timings = {}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def fetch_concurrently(page, queries):
+    """Run {name: zero-arg callable} on the shared pool and return {name: result}.
+
+    The first query to fail re-raises its exception once all of them have finished.
+    """
+    start = time.perf_counter()
+    futures = {name: _executor.submit(_timed, fn) for name, fn in queries.items()}
+
+    results, timings, error = {}, {}, None
+    for name, future in futures.items():
+        try:
+            results[name], timings[name] = future.result()
+        except Exception as e:
+            error = error or e
+
+    total_ms = (time.perf_counter() - start) * 1000
+    _page_timings[page] = {
+        "total_ms": round(total_ms, 1),
+        "queries": {name: round(ms, 1) for name, ms in timings.items()},
+    }
+    slowest = max(timings, key=timings.get) if timings else None
+    if slowest:
+        log_debug(f"{page}: {len(queries)} queries in {total_ms:.0f}ms (slowest {slowest} {timings[slowest]:.0f}ms)")
+
+    if error:
+        raise error
+    return results
+
+
+def get_page_timings():
+    """Latest per-query timings for each page, for diagnostics."""
+    return dict(_page_timings)
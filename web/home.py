@@ -1,5 +1,7 @@
 from flask import render_template
 from datetime import datetime, timedelta
+from threading import Lock, Thread
+import time
 import data.storage as db
 from data.models import (
     load_bird_species_sync,
@@ -8,11 +10,23 @@ from data.models import (
     load_treasures,
     get_extra_bird_space_sync,
 )
-from config.config import MAX_BIRDS_PER_NEST
+from config.config import MAX_BIRDS_PER_NEST, HOMEPAGE_REFRESH_SECONDS
+from utils.logging import log_debug
 from utils.time_utils import get_time_until_reset, get_australian_time
 from utils.human_spawner import HumanSpawner
+from web.fetch import fetch_concurrently
 
-def get_home_page():
+def _count_songs_given(since_date):
+    """Songs given per singer since since_date, streamed so only the tallies stay in memory."""
+    songs_count = {}
+    for song in db.iter_all_songs_sync(since_date, columns="id, singer_user_id"):
+        uid = song["singer_user_id"]
+        songs_count[uid] = songs_count.get(uid, 0) + 1
+    return songs_count
+
+
+def build_home_model():
+    """Query and assemble everything the homepage shows from the database."""
     # Load treasures data (cached)
     treasures_data = load_treasures()
 
@@ -21,31 +35,37 @@ def get_home_page():
         for treasure in category:
             all_treasures[treasure['id']] = treasure
 
-    # Get common nest data
-    common_nest = db.load_common_nest_sync()
-
-    # Get time until reset
-    time_until_reset = get_time_until_reset()
-
-    # Load bird species data for reference (one call, reused everywhere)
-    bird_species_list = load_bird_species_sync()
-    bird_species_data = {bird["scientificName"]: bird for bird in bird_species_list}
-
-    # ---- BULK FETCH (one query each) ----
-    all_players = db.load_all_players_sync()
     now = get_australian_time()
     songs_cutoff = (now - timedelta(days=30)).strftime('%Y-%m-%d')
-    all_songs = db.get_all_songs_sync(since_date=songs_cutoff)
-    all_eggs = db.get_all_eggs_sync()
-    all_birds_by_user = db.get_all_player_birds_sync()
-    all_plants_by_user = db.get_all_player_plants_sync()
-    all_nest_treasures = db.get_all_nest_treasures_sync()
 
-    # Pre-compute songs_given per user (last 30 days)
-    songs_count = {}
-    for s in all_songs:
-        uid = s["singer_user_id"]
-        songs_count[uid] = songs_count.get(uid, 0) + 1
+    # ---- BULK FETCH (one query each, run side by side) ----
+    fetched = fetch_concurrently("home", {
+        "common_nest": db.load_common_nest_sync,
+        "bird_species": load_bird_species_sync,
+        "players": db.load_all_players_sync,
+        "songs_count": lambda: _count_songs_given(songs_cutoff),
+        "eggs": db.get_all_eggs_sync,
+        "birds": db.get_all_player_birds_sync,
+        "plants": db.get_all_player_plants_sync,
+        "nest_treasures": db.get_all_nest_treasures_sync,
+        # get_discovered_species_sync does 2 DB queries (all_birds + released_birds)
+        "discovered": get_discovered_species_sync,
+        "discovered_plant_count": get_discovered_plant_species_count_sync,
+        "exploration": db.get_exploration_data_sync,
+        "defeated_humans": lambda: db.get_defeated_humans_sync(limit=5),
+        "extra_bird_space": get_extra_bird_space_sync,
+    })
+    common_nest = fetched["common_nest"]
+    all_players = fetched["players"]
+    songs_count = fetched["songs_count"]
+    all_eggs = fetched["eggs"]
+    all_birds_by_user = fetched["birds"]
+    all_plants_by_user = fetched["plants"]
+    all_nest_treasures = fetched["nest_treasures"]
+
+    # Bird species data for reference (one call, reused everywhere)
+    bird_species_list = fetched["bird_species"]
+    bird_species_data = {bird["scientificName"]: bird for bird in bird_species_list}
 
     # Get all personal nests with singing data
     personal_nests = []
@@ -125,11 +145,10 @@ def get_home_page():
     # Get discovered species tally
     total_bird_species = len(bird_species_list)
 
-    # get_discovered_species_sync does 2 DB queries (all_birds + released_birds)
-    # Reuse the result for both count and species list
-    discovered = get_discovered_species_sync()
+    # Reuse the discovered set for both count and species list
+    discovered = fetched["discovered"]
     discovered_species_count = len(discovered)
-    discovered_plant_species_count = get_discovered_plant_species_count_sync()
+    discovered_plant_species_count = fetched["discovered_plant_count"]
 
     # Build discovered species list using the bird_species_data dict (no extra queries)
     discovered_species = []
@@ -143,29 +162,92 @@ def get_home_page():
                 "effect": bird.get("effect", ""),
             })
 
-    exploration = db.get_exploration_data_sync()
+    exploration = fetched["exploration"]
+    defeated_humans = fetched["defeated_humans"]
 
-    # Get current human
-    spawner = HumanSpawner()
-    current_human = spawner.spawn_human()
+    # Bird capacity per nest
+    max_birds = MAX_BIRDS_PER_NEST + fetched["extra_bird_space"]
+
+    return {
+        "common_nest": common_nest,
+        "max_birds": max_birds,
+        "personal_nests": personal_nests,
+        "total_bird_species": total_bird_species,
+        "discovered_species_count": discovered_species_count,
+        "discovered_plant_species_count": discovered_plant_species_count,
+        "discovered_species": discovered_species,
+        "exploration": exploration,
+        "defeated_humans": defeated_humans,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Homepage snapshot (served from memory, rebuilt in the background)
+# ---------------------------------------------------------------------------
+
+_home_model = None
+_home_model_built_at = 0.0
+_home_refresh_lock = Lock()
+
+
+def _rebuild_home_model():
+    global _home_model, _home_model_built_at
+    start = time.time()
+    model = build_home_model()
+    _home_model, _home_model_built_at = model, time.time()
+    log_debug(f"Homepage model rebuilt in {(time.time() - start) * 1000:.0f}ms")
+
+
+def refresh_home_model():
+    """Rebuild the homepage snapshot unless a rebuild is already running. Failures keep the old one."""
+    if not _home_refresh_lock.acquire(blocking=False):
+        return
+    try:
+        _rebuild_home_model()
+    except Exception as e:
+        print(f"Error refreshing homepage: {e}")
+    finally:
+        _home_refresh_lock.release()
+
+
+def get_home_model():
+    """Return the homepage snapshot, stale-while-revalidate.
+
+    Only the very first request waits for a build. After that a stale snapshot is
+    served as-is while a background thread rebuilds it.
+    """
+    if _home_model is None:
+        with _home_refresh_lock:
+            if _home_model is None:
+                _rebuild_home_model()
+    elif time.time() - _home_model_built_at > HOMEPAGE_REFRESH_SECONDS and not _home_refresh_lock.locked():
+        Thread(target=refresh_home_model, daemon=True).start()
+    return _home_model
+
+
+def _home_refresh_loop():
+    while True:
+        refresh_home_model()
+        time.sleep(HOMEPAGE_REFRESH_SECONDS)
+
+
+def start_home_refresher():
+    """Keep the homepage snapshot warm, so requests never pay for the bulk queries."""
+    thread = Thread(target=_home_refresh_loop, daemon=True)
+    thread.start()
+    return thread
 
-    # Get defeated humans data
-    defeated_humans = db.get_defeated_humans_sync(limit=5)
 
-    # Bird capacity per nest
-    max_birds = MAX_BIRDS_PER_NEST + get_extra_bird_space_sync()
+def get_home_page():
+    model = get_home_model()
+
+    # Cheap per-request bits stay live
+    time_until_reset = get_time_until_reset()
+    current_human = HumanSpawner().spawn_human()
 
     return render_template(
         'home.html',
-        common_nest=common_nest,
-        max_birds=max_birds,
-        personal_nests=personal_nests,
         time_until_reset=time_until_reset,
-        total_bird_species=total_bird_species,
-        discovered_species_count=discovered_species_count,
-        discovered_plant_species_count=discovered_plant_species_count,
-        discovered_species=discovered_species,
-        exploration=exploration,
         current_human=current_human,
-        defeated_humans=defeated_humans,
+        **model,
     )
@@ -1,14 +1,15 @@
 from flask import Flask, render_template, send_from_directory, request, redirect, url_for, session, flash, jsonify
 from threading import Thread
 from config.config import PORT, DEBUG, ADMIN_PASSWORD, SPECIES_IMAGES_DIR
-from web.home import get_home_page
+from web.home import get_home_page, start_home_refresher
+from web.fetch import fetch_concurrently, get_page_timings
 from web.admin import admin_routes
 from web.decorator import decorator_routes
 from web.research import get_research_page
 from web.birdwatch import get_birdwatch_page
 from web.awards import get_awards_page
 from data.models import load_bird_species_sync, load_plant_species_sync, get_discovered_species_sync, get_discovered_plants_sync, load_treasures
-from data.db import get_sync_client
+from data.db import get_sync_client, get_sync_pool_stats
 from utils.time_utils import get_time_until_reset, get_current_date, get_australian_time
 from datetime import timedelta
 import os
@@ -29,10 +30,7 @@ decorator_routes(app)
 
 @app.route('/')
 def home():
-    start = time.time()
-    result = get_home_page()
-    print(f"Homepage rendered in {time.time()-start:.1f}s")
-    return result
+    return get_home_page()
 
 @app.route('/help')
 def help_page():
@@ -85,14 +83,35 @@ def _organize_by_group(items):
 
 @app.route('/user/<user_id>')
 def user_page(user_id):
-    player = db.get_player_sync(user_id)
+    today = get_current_date()
+
+    def brooded_today():
+        sb = get_sync_client()
+        return sb.table("daily_brooding").select("target_user_id").eq("brooding_date", today).eq("brooder_user_id", str(user_id)).execute().data or []
+
+    def egg_row():
+        sb = get_sync_client()
+        egg_data = sb.table("eggs").select("*").eq("user_id", str(user_id)).execute().data
+        return egg_data[0] if egg_data else None
+
+    # Everything that only needs the user id, run side by side
+    fetched = fetch_concurrently("user", {
+        "player": lambda: db.get_player_sync(user_id),
+        "birds": lambda: db.get_player_birds_sync(user_id),
+        "plants": lambda: db.get_player_plants_sync(user_id),
+        "bird_species": load_bird_species_sync,
+        "songs": db.get_all_songs_sync,
+        "brooding_today": brooded_today,
+        "player_treasures": lambda: db.get_player_treasures_sync(user_id),
+        "egg": egg_row,
+    })
+    player = fetched["player"]
     if player is None:
         return "Player not found", 404
-    birds = db.get_player_birds_sync(user_id)
-    plants = db.get_player_plants_sync(user_id)
-    nest_treasures = db.get_nest_treasures_sync(user_id)
+    birds = fetched["birds"]
+    plants = fetched["plants"]
 
-    bird_species_data = {species["scientificName"]: species for species in load_bird_species_sync()}
+    bird_species_data = {species["scientificName"]: species for species in fetched["bird_species"]}
 
     # Load treasures data (cached)
     treasures_data = load_treasures()
@@ -102,9 +121,30 @@ def user_page(user_id):
         for treasure in category:
             all_treasures[treasure['id']] = treasure
 
-    # Bulk-fetch bird treasures for all birds at once (instead of per-bird query)
+    # Count songs given (all time)
+    all_songs = fetched["songs"]
+    songs_given = sum(1 for s in all_songs if s["singer_user_id"] == str(user_id))
+
+    # Get today's songs given to
+    today_songs = [s for s in all_songs if s["song_date"] == today and s["singer_user_id"] == str(user_id)]
+
+    # Get today's brooded nests
+    brooding_today = fetched["brooding_today"]
+
+    target_user_ids = set()
+    for song in today_songs:
+        target_user_ids.add(song["target_user_id"])
+    for row in brooding_today:
+        target_user_ids.add(row["target_user_id"])
+
+    # Bird treasures for all birds at once (instead of per-bird query), plus the
+    # referenced target players, again side by side
     bird_ids = [bird["id"] for bird in birds]
-    all_bird_treasures = db.get_bird_treasures_for_birds_sync(bird_ids)
+    second_queries = {"bird_treasures": lambda: db.get_bird_treasures_for_birds_sync(bird_ids)}
+    if target_user_ids:
+        second_queries["players"] = db.load_all_players_sync
+    fetched_more = fetch_concurrently("user_details", second_queries)
+    all_bird_treasures = fetched_more["bird_treasures"]
 
     # Enrich chicks data with species info
     enriched_chicks = []
@@ -135,30 +175,9 @@ def user_page(user_id):
             "groupName": bird.get("group_name"),
         })
 
-    today = get_current_date()
-
-    # Count songs given (all time)
-    all_songs = db.get_all_songs_sync()
-    songs_given = sum(1 for s in all_songs if s["singer_user_id"] == str(user_id))
-
-    # Get today's songs given to
-    today_songs = [s for s in all_songs if s["song_date"] == today and s["singer_user_id"] == str(user_id)]
-
-    # Get today's brooded nests
-    sb = get_sync_client()
-    brooding_today = sb.table("daily_brooding").select("target_user_id").eq("brooding_date", today).eq("brooder_user_id", str(user_id)).execute().data or []
-
-    # Batch-load all referenced target players in one go
-    target_user_ids = set()
-    for song in today_songs:
-        target_user_ids.add(song["target_user_id"])
-    for row in brooding_today:
-        target_user_ids.add(row["target_user_id"])
-
     target_players = {}
     if target_user_ids:
-        all_players = db.load_all_players_sync()
-        target_players = {p["user_id"]: p for p in all_players if p["user_id"] in target_user_ids}
+        target_players = {p["user_id"]: p for p in fetched_more["players"] if p["user_id"] in target_user_ids}
 
     songs_given_to = []
     for song in today_songs:
@@ -201,15 +220,12 @@ def user_page(user_id):
 
     # Enrich inventory treasures
     enriched_treasures = []
-    player_inv = sb.table("player_treasures").select("treasure_id").eq("user_id", str(user_id)).execute().data or []
-    for row in player_inv:
+    for row in fetched["player_treasures"]:
         tid = row["treasure_id"]
         if tid in all_treasures:
             enriched_treasures.append(all_treasures[tid])
 
-    # Get egg data
-    egg_data = sb.table("eggs").select("*").eq("user_id", str(user_id)).execute().data
-    egg = egg_data[0] if egg_data else None
+    egg = fetched["egg"]
 
     chick_groups, ungrouped_chicks = _organize_by_group(enriched_chicks)
     plant_groups, ungrouped_plants = _organize_by_group(enriched_plants)
@@ -306,7 +322,12 @@ def health():
         sb = get_sync_client()
         sb.table("common_nest").select("id").limit(1).execute()
         elapsed = time.time() - start
-        return jsonify({"status": "ok", "supabase_latency_ms": round(elapsed * 1000, 1)})
+        return jsonify({
+            "status": "ok",
+            "supabase_latency_ms": round(elapsed * 1000, 1),
+            "page_timings": get_page_timings(),
+            "sync_pool": get_sync_pool_stats(),
+        })
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)}), 500
 
@@ -321,6 +342,8 @@ def run_server():
     except Exception as e:
         print(f"Sync Supabase connection FAILED: {e}")
 
+    start_home_refresher()
+
     app.jinja_env.auto_reload = DEBUG
     app.config['TEMPLATES_AUTO_RELOAD'] = DEBUG
     app.run(host='0.0.0.0', port=PORT)